@@ -1,19 +1,49 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from functools import partial
+import os
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 import logging
-from backend.models import BacktestRequest
-from backend.run import run_backtest
+from backend.models import BacktestRequest, BatchBacktestRequest
+from backend.executor import BacktestExecutor, ExecutorBusy
+from backend.jobs import JobManager, COMPLETED, FAILED
+from backend.run import (load_market_data, load_price_frame, run_loaded_backtest,
+                         run_backtest_on_frame, run_backtest_job, load_batch_data,
+                         load_batch_frames, run_loaded_batch, run_batch_on_frames,
+                         run_loaded_backtest_for_stream, run_backtest_for_stream_on_frame,
+                         run_loaded_backtest_encoded, run_backtest_encoded_on_frame)
+from backend.serialization import (negotiate_format, media_type, accepts_brotli,
+                                   compress_brotli, UnsupportedFormat)
+from backend.stream import stream_events, STREAM_FORMATS, MEDIA_TYPES
 from backend.strategy_config import available_strategies
 
 
 app = FastAPI()
 
+# Backtests run off the event loop so one slow request can't stall the rest.
+# BACKTEST_COMPUTE_MODE=process moves the pandas work out of this process.
+compute_mode = os.environ.get('BACKTEST_COMPUTE_MODE', 'thread')
+backtest_executor = BacktestExecutor(
+    io_workers=int(os.environ.get('BACKTEST_IO_WORKERS', 8)),
+    compute_workers=int(os.environ.get('BACKTEST_COMPUTE_WORKERS', 4)),
+    max_queued=int(os.environ.get('BACKTEST_MAX_QUEUED', 32)),
+    compute_mode=compute_mode)
+
+# Responses at least this big are compressed when the client accepts it
+compress_min_bytes = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', 1024))
+
+# Long-running backtests go through the job queue instead of holding a request open
+job_manager = JobManager(workers=int(os.environ.get('JOB_WORKERS', 2)))
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+app.add_middleware(GZipMiddleware, minimum_size=compress_min_bytes)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=['*'],
@@ -23,18 +53,134 @@ app.add_middleware(
 )
 
 
+async def _encoded_response(body: BacktestRequest, request: Request, response_format: str):
+    if compute_mode == 'process':
+        compute = partial(run_backtest_encoded_on_frame, response_format=response_format)
+        payload = await backtest_executor.run(load_price_frame, compute, body)
+    else:
+        compute = partial(run_loaded_backtest_encoded, response_format=response_format)
+        payload = await backtest_executor.run(load_market_data, compute, body)
+
+    # gzip is handled by the middleware; it leaves already-encoded bodies alone
+    headers = {'Vary': 'Accept, Accept-Encoding'}
+    if len(payload) >= compress_min_bytes and accepts_brotli(request.headers.get('accept-encoding')):
+        payload = await run_in_threadpool(compress_brotli, payload)
+        headers['Content-Encoding'] = 'br'
+
+    return Response(content=payload, media_type=media_type(response_format), headers=headers)
+
+
 @app.post("/backtest")
-async def root(body: BacktestRequest):
+async def root(body: BacktestRequest, request: Request):
     logger.info(
         f"Running backtest for {body.ticker} with {body.strategies} strategies")
 
+    # Accept picks plain JSON (default), columnar JSON or Arrow IPC
+    try:
+        response_format = negotiate_format(request.headers.get('accept'))
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
     try:
-        results = run_backtest(body)
+        if response_format != 'json':
+            return await _encoded_response(body, request, response_format)
+        if compute_mode == 'process':
+            results = await backtest_executor.run(load_price_frame, run_backtest_on_frame, body)
+        else:
+            results = await backtest_executor.run(load_market_data, run_loaded_backtest, body)
         return results
+    except ExecutorBusy as e:
+        logger.warning(f"Rejecting backtest: {e}")
+        raise HTTPException(
+            status_code=503, detail="Too many backtests in progress, try again shortly")
+    except Exception as e:
+        logger.error(f"Error running backtest: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/backtest/stream")
+async def stream_backtest(body: BacktestRequest, format: str = 'ndjson', chunk_size: int = 500):
+    """Metrics as soon as they're ready, then the trades a chunk at a time"""
+    if format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {STREAM_FORMATS}")
+    if chunk_size <= 0:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+
+    logger.info(f"Streaming backtest for {body.ticker} as {format}")
+
+    try:
+        if compute_mode == 'process':
+            metrics, trades = await backtest_executor.run(
+                load_price_frame, run_backtest_for_stream_on_frame, body)
+        else:
+            metrics, trades = await backtest_executor.run(
+                load_market_data, run_loaded_backtest_for_stream, body)
+    except ExecutorBusy as e:
+        logger.warning(f"Rejecting backtest: {e}")
+        raise HTTPException(
+            status_code=503, detail="Too many backtests in progress, try again shortly")
     except Exception as e:
         logger.error(f"Error running backtest: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    return StreamingResponse(stream_events(metrics, trades, format, chunk_size),
+                             media_type=MEDIA_TYPES[format])
+
+
+@app.post("/backtest/batch")
+async def run_batch(body: BatchBacktestRequest):
+    logger.info(f"Running batch of {len(body.requests)} backtests")
+
+    try:
+        if compute_mode == 'process':
+            results = await backtest_executor.run(load_batch_frames, run_batch_on_frames, body)
+        else:
+            results = await backtest_executor.run(load_batch_data, run_loaded_batch, body)
+        return {'results': results}
+    except ExecutorBusy as e:
+        logger.warning(f"Rejecting backtest batch: {e}")
+        raise HTTPException(
+            status_code=503, detail="Too many backtests in progress, try again shortly")
+    except Exception as e:
+        logger.error(f"Error running backtest batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(body: BacktestRequest):
+    job = job_manager.submit(run_backtest_job, body)
+    logger.info(f"Queued backtest job {job.id} for {body.ticker}")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.status != COMPLETED:
+        raise HTTPException(
+            status_code=409, detail=f"Job is {job.status}, no result available")
+    return job.result
+
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
 
 @app.get("/strategies")
 async def get_strategies():
@@ -1,5 +1,5 @@
 from src.strategies import CustomStrategy, MovingAverageCross, RSICross, RSIExtremes, Strategy, MACDCross
-from typing import List, Literal
+from typing import List, Optional
 from backend.models import StrategyConfig
 
 strategy_mapping = {
@@ -10,8 +10,10 @@ strategy_mapping = {
 }
 
 
-def create_strategy(strategies: List[StrategyConfig], mode: Literal["any", "all"]):
-    custom_strategy = CustomStrategy(mode=mode)
+def create_strategy(strategies: List[StrategyConfig], mode: str,
+                    threshold: Optional[float] = None, k: Optional[int] = None):
+    custom_strategy = CustomStrategy.generate_from_params(
+        {'mode': mode, 'threshold': threshold, 'k': k})
     try:
 
         for strategy_config in strategies:
@@ -23,7 +25,7 @@ def create_strategy(strategies: List[StrategyConfig], mode: Literal["any", "all"
             strategy_object = strategy_builder.generate_from_params(
                 strategy_config.params)
 
-            custom_strategy.add_strategy(strategy_object)
+            custom_strategy.add_strategy(strategy_object, strategy_config.weight)
 
         return custom_strategy
     except Exception as e:
@@ -0,0 +1,64 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+
+
+class ExecutorBusy(Exception):
+    """Raised when a backtest is submitted while the queue is already full"""
+    pass
+
+
+class BacktestExecutor:
+    """Runs blocking backtest work off the event loop with bounded concurrency.
+
+    Data loading (network / disk) goes to a thread pool. The compute step
+    goes to either the same kind of thread pool or a process pool, which
+    keeps CPU-heavy pandas work from competing with the server for the GIL.
+    At most `io_workers` loads and `compute_workers` computations run at
+    once; up to `max_queued` more requests wait, and anything beyond that is
+    rejected with ExecutorBusy instead of piling up.
+    """
+
+    def __init__(self, io_workers: int = 8, compute_workers: int = 4,
+                 max_queued: int = 32, compute_mode: str = 'thread'):
+        if io_workers <= 0 or compute_workers <= 0:
+            raise ValueError("Worker counts must be positive")
+        if max_queued < 0:
+            raise ValueError("max_queued can't be negative")
+        if compute_mode not in ['thread', 'process']:
+            raise ValueError("Compute mode must be either 'thread' or 'process'")
+
+        self.compute_mode = compute_mode
+        self.max_in_flight = max(io_workers, compute_workers) + max_queued
+        self._in_flight = 0
+
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=io_workers, thread_name_prefix='backtest-io')
+        self._compute_executor: Executor = (
+            ProcessPoolExecutor(max_workers=compute_workers)
+            if compute_mode == 'process'
+            else ThreadPoolExecutor(max_workers=compute_workers,
+                                    thread_name_prefix='backtest-compute'))
+
+    async def run(self, load: Callable, compute: Callable, *args):
+        """Run load(*args) on the I/O pool, then compute(*args, loaded) on the compute pool"""
+        # Only touched from the event loop thread, so a plain counter is enough
+        if self._in_flight >= self.max_in_flight:
+            raise ExecutorBusy(
+                f"{self._in_flight} backtests already running or queued")
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            loaded = await loop.run_in_executor(self._io_executor, load, *args)
+            return await loop.run_in_executor(self._compute_executor, compute, *args, loaded)
+        finally:
+            self._in_flight -= 1
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def shutdown(self):
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
+        self._compute_executor.shutdown(wait=False, cancel_futures=True)
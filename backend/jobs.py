@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when its job has been cancelled"""
+    pass
+
+
+class Job:
+    def __init__(self, fn: Callable, args: tuple):
+        self.id = uuid.uuid4().hex
+        self.fn = fn
+        self.args = args
+        self.status = QUEUED
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel_requested = threading.Event()
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class JobContext:
+    """Handed to every job function so it can report progress and notice cancellation"""
+
+    def __init__(self, job: Job):
+        self._job = job
+
+    def report(self, progress: float):
+        self._job.progress = min(max(float(progress), 0.0), 1.0)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._job._cancel_requested.is_set()
+
+    def check_cancelled(self):
+        """Call between steps of a long job; raises JobCancelled if it should stop"""
+        if self.cancelled:
+            raise JobCancelled()
+
+
+class JobManager:
+    """In-memory background job queue served by a fixed set of worker threads.
+
+    Job functions are called as fn(context, *args). Queued jobs can be
+    cancelled outright; running ones stop the next time they call
+    context.check_cancelled(). Only the newest `max_finished` finished jobs
+    are kept, so results don't accumulate forever.
+    """
+
+    def __init__(self, workers: int = 2, max_finished: int = 1000):
+        if workers <= 0:
+            raise ValueError("Worker count must be positive")
+        if max_finished <= 0:
+            raise ValueError("max_finished must be positive")
+
+        self.max_finished = max_finished
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._queue: 'queue.Queue[Optional[Job]]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers = [threading.Thread(target=self._work, daemon=True,
+                                          name=f'backtest-job-{i}')
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, fn: Callable, *args) -> Job:
+        job = Job(fn, args)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            job._cancel_requested.set()
+            # A job nobody has picked up yet can be finished right here
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED)
+        return job
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            with self._lock:
+                if job.status != QUEUED:
+                    continue
+                job.status = RUNNING
+                job.started_at = time.time()
+
+            try:
+                result = job.fn(JobContext(job), *job.args)
+            except JobCancelled:
+                with self._lock:
+                    self._finish(job, CANCELLED)
+            except Exception as e:
+                with self._lock:
+                    job.error = str(e)
+                    self._finish(job, FAILED)
+            else:
+                with self._lock:
+                    job.result = result
+                    job.progress = 1.0
+                    self._finish(job, COMPLETED)
+
+    def _finish(self, job: Job, status: str):
+        job.status = status
+        job.finished_at = time.time()
+        job.fn, job.args = None, ()
+
+        finished = [job_id for job_id, other in self._jobs.items()
+                    if other.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        for _ in self._workers:
+            self._queue.put(None)
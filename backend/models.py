@@ -1,11 +1,13 @@
-from pydantic import BaseModel
-from typing import List, Literal
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 
 class StrategyConfig(BaseModel):
     type: Literal["moving_average_cross",
                   "rsi_extremes", "rsi_cross", "macd_cross"]
     params: dict
+    # Only used by the 'weighted' mode
+    weight: float = 1.0
 
 
 class BacktestRequest(BaseModel):
@@ -14,3 +16,11 @@ class BacktestRequest(BaseModel):
     initial_capital: str
     strategies: List[StrategyConfig]
     mode: str
+    # 'weighted' mode: share of the total weight that has to agree
+    threshold: Optional[float] = None
+    # 'k_of_n' mode: how many strategies have to agree
+    k: Optional[int] = None
+
+
+class BatchBacktestRequest(BaseModel):
+    requests: List[BacktestRequest] = Field(min_length=1)
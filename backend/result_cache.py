@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from backend.models import BacktestRequest
+
+
+def _normalize_value(value):
+    """'20' and 20 build the same strategy, so they should hash the same"""
+    if isinstance(value, str):
+        stripped = value.strip()
+        try:
+            number = float(stripped)
+        except ValueError:
+            return stripped.upper()
+        return int(number) if number.is_integer() else number
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def canonical_request(request: BacktestRequest) -> Dict:
+    """Normalized form of a request; equal for requests that give the same result"""
+    strategies = [
+        {
+            'type': strategy.type,
+            'weight': _normalize_value(strategy.weight),
+            'params': {name: _normalize_value(value)
+                       for name, value in sorted(strategy.params.items())}
+        }
+        for strategy in request.strategies
+    ]
+    # Combining signals doesn't depend on the order strategies were added in
+    strategies.sort(key=lambda strategy: json.dumps(strategy, sort_keys=True))
+
+    return {
+        'ticker': request.ticker.strip().upper(),
+        'period': request.period.strip().lower(),
+        'initial_capital': _normalize_value(request.initial_capital),
+        'mode': request.mode,
+        'threshold': _normalize_value(request.threshold),
+        'k': _normalize_value(request.k),
+        'strategies': strategies
+    }
+
+
+def request_key(request: BacktestRequest, data_version: str) -> str:
+    payload = {'request': canonical_request(request), 'data_version': data_version}
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResultCache:
+    """LRU cache of backtest results keyed by request_key().
+
+    With a `directory`, results are also pickled to disk so they survive
+    restarts and are shared between worker processes; a disk hit is promoted
+    back into memory. Keys include the price data version, so entries for
+    old data are never asked for again once new bars arrive. Those are
+    dropped by bounding the directory: after each write the least recently
+    used files (by mtime, which reads refresh) are deleted until at most
+    `max_disk_entries` files and, if set, `max_disk_bytes` bytes remain.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Optional[str] = None,
+                 max_disk_entries: int = 4096, max_disk_bytes: Optional[int] = None):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_disk_entries <= 0:
+            raise ValueError("max_disk_entries must be positive")
+        if max_disk_bytes is not None and max_disk_bytes <= 0:
+            raise ValueError("max_disk_bytes must be positive")
+
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: Any):
+        with self._lock:
+            self._remember(key, result)
+        self._write_disk(key, result)
+
+    def _remember(self, key: str, result: Any):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        if not self.directory or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                result = pickle.load(f)
+            # Marks the file as recently used for _prune_disk
+            os.utime(self._path(key))
+            return result
+        except Exception:
+            # A corrupt or half-copied file is just a miss
+            return None
+
+    def _write_disk(self, key: str, result: Any):
+        if not self.directory:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._prune_disk()
+
+    def _prune_disk(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.pkl'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        files.sort()
+        count = len(files)
+        total_bytes = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if count <= self.max_disk_entries and (
+                    self.max_disk_bytes is None or total_bytes <= self.max_disk_bytes):
+                break
+            try:
+                os.remove(path)
+                with self._lock:
+                    self.disk_evictions += 1
+            except FileNotFoundError:
+                # Another worker pruned it first
+                pass
+            count -= 1
+            total_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'disk_evictions': self.disk_evictions,
+                'misses': self.misses
+            }
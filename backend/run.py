@@ -1,16 +1,202 @@
+import os
+import pandas as pd
+from typing import Dict, List
 from backend.create_strategy import create_strategy
 from src.back_testing import BackTest
 from src.main import MarketData
-from backend.models import BacktestRequest
+from src.pool import MarketDataPool
+from src.optimization import prime_indicators
+from src.arena import ArenaStore
+from src.storage import ParquetStore
+from backend.models import BacktestRequest, BatchBacktestRequest
+from backend.result_cache import ResultCache, request_key
+from backend.serialization import encode_results
 from backend.create_strategy import create_strategy
 
 
-def run_backtest(request: BacktestRequest):
-    stock_object = MarketData(request.ticker, request.period)
+# Set PRICE_STORE_DIR to keep downloaded history on disk between requests,
+# and PRICE_STORE_OFFLINE=1 to serve only from that directory. With
+# PRICE_STORE_FORMAT=arena the files are memory-mapped instead of parsed,
+# so every worker on the machine shares one copy of each ticker.
+STORE_FORMATS = {'parquet': ParquetStore, 'arena': ArenaStore}
+store_format = os.environ.get('PRICE_STORE_FORMAT', 'parquet')
+if store_format not in STORE_FORMATS:
+    raise ValueError(f"PRICE_STORE_FORMAT must be one of {list(STORE_FORMATS)}")
+price_store = STORE_FORMATS[store_format](
+    os.environ['PRICE_STORE_DIR']) if os.environ.get('PRICE_STORE_DIR') else None
+offline = os.environ.get('PRICE_STORE_OFFLINE', '') == '1'
+
+# Shared across requests so the same ticker is only loaded (and its
+# indicators only computed) once per MARKET_DATA_TTL seconds
+market_data_pool = MarketDataPool(
+    ttl=float(os.environ.get('MARKET_DATA_TTL', 15 * 60)),
+    max_bytes=int(os.environ.get('MARKET_DATA_MAX_BYTES', 512 * 1024 * 1024)),
+    store=price_store, offline=offline)
+
+# Identical requests on unchanged data return the stored result. Set
+# RESULT_CACHE_DIR to share results between workers and restarts; the
+# directory keeps at most RESULT_CACHE_DISK_ENTRIES files (and
+# RESULT_CACHE_DISK_BYTES bytes, if set).
+result_cache = ResultCache(
+    max_entries=int(os.environ.get('RESULT_CACHE_ENTRIES', 256)),
+    directory=os.environ.get('RESULT_CACHE_DIR') or None,
+    max_disk_entries=int(os.environ.get('RESULT_CACHE_DISK_ENTRIES', 4096)),
+    max_disk_bytes=int(os.environ['RESULT_CACHE_DISK_BYTES'])
+    if os.environ.get('RESULT_CACHE_DISK_BYTES') else None)
+
+
+def load_market_data(request: BacktestRequest) -> MarketData:
+    return market_data_pool.get(request.ticker, request.period)
+
 
-    custom_strategy = create_strategy(request.strategies, request.mode)
+def load_price_frame(request: BacktestRequest) -> pd.DataFrame:
+    """Raw prices only, for handing the compute step to another process"""
+    return load_market_data(request).get_raw_data()
+
+
+def run_loaded_backtest(request: BacktestRequest, stock_object: MarketData):
+    key = request_key(request, stock_object.data_version())
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached
+
+    custom_strategy = create_strategy(request.strategies, request.mode, request.threshold, request.k)
 
     backtest_object = BackTest(initial_capital=int(request.initial_capital))
 
     results = backtest_object.run_backtest(stock_object, custom_strategy)
+    result_cache.put(key, results['metrics'])
     return results['metrics']
+
+
+def run_backtest_on_frame(request: BacktestRequest, raw_data: pd.DataFrame):
+    stock_object = MarketData(request.ticker, request.period, raw_data=raw_data)
+    return run_loaded_backtest(request, stock_object)
+
+
+def run_loaded_backtest_for_stream(request: BacktestRequest, stock_object: MarketData):
+    """(metrics, trades) with the trades as a frame for the encoders.
+
+    A cached result already has its trades as records, so those are reused.
+    On a miss the result is cached the same way run_loaded_backtest caches
+    it, so the JSON and streamed endpoints share entries.
+    """
+    key = request_key(request, stock_object.data_version())
+    cached = result_cache.get(key)
+    if cached is not None:
+        return cached, cached['trades']
+
+    custom_strategy = create_strategy(request.strategies, request.mode, request.threshold, request.k)
+
+    backtest_object = BackTest(initial_capital=int(request.initial_capital))
+
+    results = backtest_object.run_backtest(stock_object, custom_strategy, include_trades=False)
+    trades = results['trades']
+    result_cache.put(key, {**results['metrics'],
+                           'trades': trades.to_dict(orient='records') if not trades.empty else []})
+    return results['metrics'], trades
+
+
+def run_backtest_for_stream_on_frame(request: BacktestRequest, raw_data: pd.DataFrame):
+    stock_object = MarketData(request.ticker, request.period, raw_data=raw_data)
+    return run_loaded_backtest_for_stream(request, stock_object)
+
+
+def run_loaded_backtest_encoded(request: BacktestRequest, stock_object: MarketData,
+                                response_format: str) -> bytes:
+    """Results already serialized as 'columnar' or 'arrow', so encoding happens off the event loop"""
+    metrics, trades = run_loaded_backtest_for_stream(request, stock_object)
+    return encode_results(metrics, trades, response_format)
+
+
+def run_backtest_encoded_on_frame(request: BacktestRequest, raw_data: pd.DataFrame,
+                                  response_format: str) -> bytes:
+    stock_object = MarketData(request.ticker, request.period, raw_data=raw_data)
+    return run_loaded_backtest_encoded(request, stock_object, response_format)
+
+
+def run_backtest(request: BacktestRequest):
+    return run_loaded_backtest(request, load_market_data(request))
+
+
+def run_backtest_job(context, request: BacktestRequest):
+    """Background job version of run_backtest, reporting progress per step"""
+    context.report(0.0)
+    stock_object = load_market_data(request)
+    context.check_cancelled()
+    context.report(0.5)
+    return run_loaded_backtest(request, stock_object)
+
+
+def _dataset_key(request: BacktestRequest):
+    return (request.ticker.strip().upper(), request.period)
+
+
+def load_batch_data(batch: BatchBacktestRequest) -> Dict:
+    """Load each distinct (ticker, period) once; failures are kept per dataset"""
+    loaded = {}
+    for request in batch.requests:
+        key = _dataset_key(request)
+        if key not in loaded:
+            try:
+                loaded[key] = load_market_data(request)
+            except Exception as e:
+                loaded[key] = e
+    return loaded
+
+
+def load_batch_frames(batch: BatchBacktestRequest) -> Dict:
+    return {key: value if isinstance(value, Exception) else value.get_raw_data()
+            for key, value in load_batch_data(batch).items()}
+
+
+def run_loaded_batch(batch: BatchBacktestRequest, loaded: Dict) -> List[Dict]:
+    """Backtest every config against its shared dataset, in request order.
+
+    Indicators needed by any config of a dataset are batch-computed into
+    that dataset's cache first, so overlapping configs share them. The
+    datasets are the pooled ones, so later single requests read those
+    entries too; that only works because compute_batch matches compute()
+    bit for bit.
+    """
+    strategies_by_key = {}
+    for request in batch.requests:
+        try:
+            strategy = create_strategy(request.strategies, request.mode, request.threshold, request.k)
+        except Exception:
+            continue
+        strategies_by_key.setdefault(_dataset_key(request), []).append(strategy)
+
+    for key, strategies in strategies_by_key.items():
+        if not isinstance(loaded[key], Exception):
+            try:
+                prime_indicators(loaded[key], strategies)
+            except ValueError:
+                # Configs that can't be computed report it individually below
+                pass
+
+    results = []
+    for index, request in enumerate(batch.requests):
+        stock_object = loaded[_dataset_key(request)]
+        entry = {'index': index, 'ticker': request.ticker, 'period': request.period}
+        try:
+            if isinstance(stock_object, Exception):
+                raise stock_object
+            entry['metrics'] = run_loaded_backtest(request, stock_object)
+            entry['error'] = None
+        except Exception as e:
+            entry['metrics'] = None
+            entry['error'] = str(e)
+        results.append(entry)
+    return results
+
+
+def run_batch_on_frames(batch: BatchBacktestRequest, frames: Dict) -> List[Dict]:
+    loaded = {key: frame if isinstance(frame, Exception)
+              else MarketData(key[0], key[1], raw_data=frame)
+              for key, frame in frames.items()}
+    return run_loaded_batch(batch, loaded)
+
+
+def run_backtest_batch(batch: BatchBacktestRequest) -> List[Dict]:
+    return run_loaded_batch(batch, load_batch_data(batch))
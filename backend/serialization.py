@@ -0,0 +1,150 @@
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Union
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+JSON = 'application/json'
+COLUMNAR_JSON = 'application/vnd.backtest.columnar+json'
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+
+FORMATS = {
+    JSON: 'json',
+    COLUMNAR_JSON: 'columnar',
+    ARROW_STREAM: 'arrow'
+}
+
+
+class UnsupportedFormat(Exception):
+    """Raised when the client asks for a format this server can't produce"""
+    pass
+
+
+def _accepted(header: str) -> List[str]:
+    """Media types from an Accept header, most preferred first"""
+    weighted = []
+    for position, part in enumerate(header.split(',')):
+        media_type, *params = [piece.strip() for piece in part.split(';')]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            weighted.append((-quality, position, media_type.lower()))
+    return [media_type for _, _, media_type in sorted(weighted)]
+
+
+def negotiate_format(accept: Optional[str]) -> str:
+    """'json', 'columnar' or 'arrow' for an Accept header; plain JSON unless asked otherwise"""
+    for media_type in _accepted(accept or ''):
+        if media_type in FORMATS:
+            response_format = FORMATS[media_type]
+            if response_format == 'arrow' and pa is None:
+                raise UnsupportedFormat("Arrow output needs pyarrow installed")
+            return response_format
+        if media_type in ('*/*', 'application/*'):
+            return 'json'
+    return 'json'
+
+
+def _trades_frame(trades: Union[pd.DataFrame, List[Dict]]) -> pd.DataFrame:
+    # Cached results keep their trades as records
+    return trades if isinstance(trades, pd.DataFrame) else pd.DataFrame(trades)
+
+
+def _summary(metrics: Dict) -> Dict:
+    return {key: value.item() if isinstance(value, np.generic) else value
+            for key, value in metrics.items() if key != 'trades'}
+
+
+def _iso_strings(column: pd.Series) -> list:
+    """Same strings as Timestamp.isoformat(), built with array ops instead of per value"""
+    tz = getattr(column.dtype, 'tz', None)
+    wall = column.dt.tz_localize(None) if tz is not None else column
+    wall_values = wall.to_numpy(dtype='datetime64[ns]')
+    has_fraction = (wall_values.astype('int64') % 1_000_000_000 != 0) & ~np.isnat(wall_values)
+    strings = np.datetime_as_string(wall_values, unit='s').astype(object)
+    if has_fraction.any():
+        strings[has_fraction] = np.datetime_as_string(wall_values[has_fraction], unit='us')
+
+    if tz is not None:
+        # Offsets change with DST, but there are only ever a handful of them
+        utc_values = column.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
+        offsets = (wall_values - utc_values).astype('timedelta64[m]').astype('int64')
+        suffixes = {offset: f"{'-' if offset < 0 else '+'}{abs(offset) // 60:02d}:{abs(offset) % 60:02d}"
+                    for offset in np.unique(offsets[~np.isnat(wall_values)]).tolist()}
+        strings = [string + suffixes.get(offset, '') for string, offset in zip(strings, offsets.tolist())]
+
+    return [None if missing else string
+            for string, missing in zip(strings, np.isnat(wall_values).tolist())]
+
+
+def _column_values(column: pd.Series) -> list:
+    if isinstance(column.dtype, pd.DatetimeTZDtype) or column.dtype.kind == 'M':
+        return _iso_strings(column)
+    return column.tolist()
+
+
+def encode_columnar(metrics: Dict, trades: Union[pd.DataFrame, List[Dict]]) -> bytes:
+    """{"metrics": {...}, "trades": {"column": [values, ...], ...}}
+
+    One array per trade field instead of one object per trade, so the
+    field names aren't repeated and no per-trade dicts are built.
+    """
+    frame = _trades_frame(trades)
+    payload = {
+        'metrics': _summary(metrics),
+        'trades': {str(name): _column_values(frame[name]) for name in frame.columns}
+    }
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+def encode_arrow(metrics: Dict, trades: Union[pd.DataFrame, List[Dict]]) -> bytes:
+    """Trades as an Arrow IPC stream, with the summary metrics as JSON in the schema metadata"""
+    if pa is None:
+        raise UnsupportedFormat("Arrow output needs pyarrow installed")
+
+    table = pa.Table.from_pandas(_trades_frame(trades), preserve_index=False)
+    table = table.replace_schema_metadata(
+        {b'metrics': json.dumps(_summary(metrics)).encode()})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_results(metrics: Dict, trades: Union[pd.DataFrame, List[Dict]],
+                   response_format: str) -> bytes:
+    if response_format == 'columnar':
+        return encode_columnar(metrics, trades)
+    if response_format == 'arrow':
+        return encode_arrow(metrics, trades)
+    raise ValueError(f"Can't encode results as {response_format!r}")
+
+
+def media_type(response_format: str) -> str:
+    return {value: key for key, value in FORMATS.items()}[response_format]
+
+
+def accepts_brotli(accept_encoding: Optional[str]) -> bool:
+    """gzip is left to the middleware; brotli only when the package is installed"""
+    return brotli is not None and 'br' in _accepted(accept_encoding or '')
+
+
+def compress_brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=5)
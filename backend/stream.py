@@ -0,0 +1,64 @@
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Union
+
+
+STREAM_FORMATS = ['ndjson', 'sse']
+
+MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+
+def _json_default(value):
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=_json_default, separators=(',', ':'))
+
+
+def trade_chunks(trades: Union[pd.DataFrame, List[Dict]], chunk_size: int) -> Iterator[List[Dict]]:
+    """Trades as lists of at most chunk_size records.
+
+    Only one chunk is turned into Python dicts at a time, so memory stays
+    flat however many trades the backtest produced.
+    """
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+
+    for start in range(0, len(trades), chunk_size):
+        chunk = trades[start:start + chunk_size]
+        if isinstance(chunk, pd.DataFrame):
+            chunk = chunk.to_dict(orient='records')
+        yield chunk
+
+
+def stream_events(metrics: Dict, trades: Union[pd.DataFrame, List[Dict]],
+                  fmt: str = 'ndjson', chunk_size: int = 500) -> Iterator[str]:
+    """Summary metrics first, then the trades in chunks, then an 'end' event.
+
+    ndjson gives one {"event": ..., "data": ...} object per line; sse gives
+    the same events as Server-Sent Events.
+    """
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Stream format must be one of {STREAM_FORMATS}")
+
+    def encode(event: str, data) -> str:
+        if fmt == 'sse':
+            return f"event: {event}\ndata: {_dumps(data)}\n\n"
+        return _dumps({'event': event, 'data': data}) + '\n'
+
+    summary = {key: value for key, value in metrics.items() if key != 'trades'}
+    yield encode('metrics', summary)
+
+    for chunk in trade_chunks(trades, chunk_size):
+        yield encode('trades', chunk)
+
+    yield encode('end', {})
@@ -11,7 +11,7 @@ import FormInput from "../components/FormInput";
 export default function Home() {
   const [ticker, setTicker] = useState<string>("");
   const [strategies, setStrategies] = useState<StrategyConfig[]>([]);
-  const [mode, setMode] = useState<"any" | "all">("any");
+  const [mode, setMode] = useState<"any" | "all" | "majority">("any");
 
   const [strategyIdSet, setStrategyIdSet] = useState<Set<string>>(new Set());
 
@@ -132,7 +132,7 @@ export default function Home() {
 
       <FormInput
         form="select"
-        options={["any", "all"]}
+        options={["any", "all", "majority"]}
         label="Mode"
         onChange={(e) => setMode(e.target.value)}
         value={mode}
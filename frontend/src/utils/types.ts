@@ -112,6 +112,10 @@ export type BacktestResult = {
   avg_losing_trade: number;
   max_drawdown: number;
   sharpe_ratio: number;
+  sortino_ratio: number;
+  calmar_ratio: number;
+  annualized_return: number;
+  exposure: number;
   final_capital: number;
   trades: Trade[];
 };
@@ -0,0 +1,178 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.storage import PriceStore
+
+
+_MAGIC = b'PXARENA1'
+# magic, number of rows, number of columns, length of the JSON header
+_HEADER = struct.Struct('<8sQQQ')
+# Data starts on a cache-line boundary so the mapped arrays are aligned
+_ALIGN = 64
+# mmap keeps a duplicate of the file descriptor open for as long as the
+# mapping lives unless told not to (Python 3.13+)
+_MMAP_OPTIONS = {'trackfd': False} if sys.version_info >= (3, 13) else {}
+
+
+def _data_offset(header_length: int) -> int:
+    return -(-(_HEADER.size + header_length) // _ALIGN) * _ALIGN
+
+
+def write_arena(path: str, data: pd.DataFrame, metadata: Optional[Dict] = None):
+    """Write data as a fixed-layout price arena file.
+
+    Layout: the fixed header, a JSON header (columns, timezone, metadata),
+    padding to 64 bytes, n_rows int64 UTC nanosecond timestamps, then each
+    column as n_rows contiguous float64 values. Only numeric columns are
+    kept. The file is written under a temporary name and renamed into
+    place, so readers that already mapped the old version keep it intact.
+    """
+    if not isinstance(data.index, pd.DatetimeIndex):
+        raise ValueError("Arena data needs a DatetimeIndex")
+
+    columns = [str(name) for name in data.columns
+               if pd.api.types.is_numeric_dtype(data[name])]
+    header = json.dumps({
+        'columns': columns,
+        'tz': str(data.index.tz) if data.index.tz is not None else None,
+        'metadata': metadata or {}
+    }).encode()
+
+    timestamps = np.ascontiguousarray(data.index.as_unit('ns').asi8)
+    values = np.ascontiguousarray(data[columns].to_numpy(dtype=np.float64).T)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, len(data), len(columns), len(header)))
+            f.write(header)
+            f.write(b'\0' * (_data_offset(len(header)) - _HEADER.size - len(header)))
+            f.write(memoryview(timestamps))
+            f.write(memoryview(values))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise ValueError(f"Error writing {path}: {e}")
+
+
+def read_arena_header(path: str) -> Tuple[int, int, Dict, int]:
+    """(n_rows, n_columns, JSON header, data offset) without mapping the data"""
+    with open(path, 'rb') as f:
+        fixed = f.read(_HEADER.size)
+        if len(fixed) < _HEADER.size:
+            raise ValueError(f"{path} is not a price arena file")
+        magic, n_rows, n_columns, header_length = _HEADER.unpack(fixed)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a price arena file")
+        header = json.loads(f.read(header_length))
+    return n_rows, n_columns, header, _data_offset(header_length)
+
+
+def map_arena(path: str) -> Tuple[pd.DataFrame, Dict]:
+    """Map an arena file read-only and wrap it as a frame without copying.
+
+    The price values are views of the mapping, so every process mapping
+    the same file shares one copy in the page cache and only the pages
+    actually read get loaded. A tz-aware index is the exception: pandas
+    can't wrap UTC nanoseconds in a timezone without converting, so that
+    one int64 array is copied. The mapping is released once nothing
+    references the frame's arrays any more.
+    """
+    n_rows, n_columns, header, offset = read_arena_header(path)
+    expected = offset + 8 * n_rows * (1 + n_columns)
+    if os.path.getsize(path) < expected:
+        raise ValueError(f"{path} is truncated")
+
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ, **_MMAP_OPTIONS)
+    timestamps = np.frombuffer(mapping, dtype=np.int64, count=n_rows, offset=offset)
+    values = np.frombuffer(mapping, dtype=np.float64, count=n_rows * n_columns,
+                           offset=offset + 8 * n_rows).reshape(n_columns, n_rows)
+
+    index = pd.DatetimeIndex(timestamps.view('M8[ns]'), copy=False)
+    if header['tz'] is not None:
+        index = index.tz_localize('UTC').tz_convert(header['tz'])
+
+    # (columns x rows) is the layout pandas keeps a float block in, so the
+    # transpose goes straight in as a single block with no copy
+    data = pd.DataFrame(values.T, index=index, columns=header['columns'], copy=False)
+    return data, header['metadata']
+
+
+class ArenaStore(PriceStore):
+    """Directory of <TICKER>.arena files, mapped read-only on load.
+
+    Meant for several server workers on one machine: each maps the same
+    files instead of parsing or downloading its own copy. Mapped frames are
+    kept per process and remapped when the file is replaced, so repeated
+    loads of an unchanged ticker cost a stat() call. At most `max_mapped`
+    tickers are kept, least recently loaded dropped first; a dropped
+    mapping (and, before Python 3.13, the file descriptor it holds) is
+    closed once no frame still uses it. The frames are read-only; anything
+    that modifies prices has to copy them first.
+    """
+
+    def __init__(self, directory: str, max_mapped: int = 64):
+        if not directory or not isinstance(directory, str):
+            raise ValueError("Store directory must be a non-empty string")
+        if max_mapped <= 0:
+            raise ValueError("max_mapped must be positive")
+        self.directory = directory
+        self.max_mapped = max_mapped
+        os.makedirs(directory, exist_ok=True)
+
+        self._mapped: 'OrderedDict[str, Tuple[Tuple, pd.DataFrame, Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.directory, f"{ticker.upper()}.arena")
+
+    def _map(self, ticker: str) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        path = self._path(ticker)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        # A replaced file is a new inode, even within the same mtime tick
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            mapped = self._mapped.get(ticker.upper())
+            if mapped is not None and mapped[0] == identity:
+                self._mapped.move_to_end(ticker.upper())
+                return mapped[1], mapped[2]
+
+        try:
+            data, metadata = map_arena(path)
+        except OSError as e:
+            raise ValueError(f"Error reading stored data for {ticker}: {e}")
+
+        with self._lock:
+            self._mapped[ticker.upper()] = (identity, data, metadata)
+            self._mapped.move_to_end(ticker.upper())
+            while len(self._mapped) > self.max_mapped:
+                self._mapped.popitem(last=False)
+        return data, metadata
+
+    def load(self, ticker: str) -> Optional[pd.DataFrame]:
+        mapped = self._map(ticker)
+        return mapped[0] if mapped is not None else None
+
+    def save(self, ticker: str, data: pd.DataFrame, metadata: Dict):
+        write_arena(self._path(ticker), data, metadata)
+
+    def load_metadata(self, ticker: str) -> Dict:
+        mapped = self._map(ticker)
+        return dict(mapped[1]) if mapped is not None else {}
@@ -1,15 +1,21 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, Tuple
+from src.main import aligned_signal
 
 
 class BackTest:
-    def __init__(self, initial_capital: float = 10000):
+    def __init__(self, initial_capital: float = 10000, engine: str = 'vectorized'):
         if initial_capital <= 0:
             raise ValueError("Initial capital must be positive")
+        if engine not in ['loop', 'vectorized']:
+            raise ValueError("Engine must be either 'loop' or 'vectorized'")
         self.initial_capital = initial_capital
+        self.engine = engine
 
-    def run_backtest(self, market_data, strategy) -> Dict:
+    def run_backtest(self, market_data, strategy, include_trades: bool = True) -> Dict:
+        """include_trades=False leaves metrics['trades'] empty; the trades
+        frame is still returned under 'trades' for callers that stream it"""
         # Check for all required columns and whatnot
         strategy.validate_data(market_data)
 
@@ -19,15 +25,56 @@ class BackTest:
 
         trades = self._generate_trades(signals, price_data)
 
-        metrics = self._calculate_metrics(trades, price_data)
+        equity = self.equity_curve(trades, price_data)
+
+        metrics = self._calculate_metrics(trades, price_data, include_trades, equity=equity)
 
         return {
             'trades': trades,
             'metrics': metrics,
-            'signals': signals
+            'signals': signals,
+            'equity_curve': equity
         }
 
+    def equity_curve(self, trades: pd.DataFrame, prices: pd.Series) -> pd.Series:
+        """Capital marked to market on every bar, fully invested while in a trade"""
+        entries, exits = _trade_bars(trades, prices)
+        bar_returns, _ = position_bar_returns(prices.to_numpy(dtype=float), entries, exits)
+        equity = self.initial_capital * np.cumprod(np.concatenate(([1.0], 1 + bar_returns)))
+        return pd.Series(equity[:len(prices)], index=prices.index, name='equity')
+
     def _generate_trades(self, signals: Dict[str, pd.Series], prices: pd.Series) -> pd.DataFrame:
+        if self.engine == 'vectorized':
+            return self._generate_trades_vectorized(signals, prices)
+        return self._generate_trades_loop(signals, prices)
+
+    def _generate_trades_vectorized(self, signals: Dict[str, pd.Series], prices: pd.Series) -> pd.DataFrame:
+        """Same trades as the loop engine, found from signal positions instead
+        of per bar (see trade_positions)"""
+        buy = aligned_signal(signals['buy'], prices.index)
+        sell = aligned_signal(signals['sell'], prices.index)
+
+        entries, exits = trade_positions(buy, sell)
+
+        if len(entries) == 0:
+            return pd.DataFrame([])
+
+        entry_dates = prices.index[entries]
+        exit_dates = prices.index[exits]
+        values = prices.to_numpy(dtype=float)
+        entry_prices = values[entries]
+        exit_prices = values[exits]
+
+        return pd.DataFrame({
+            'entry_date': entry_dates,
+            'exit_date': exit_dates,
+            'entry_price': entry_prices,
+            'exit_price': exit_prices,
+            'return': (exit_prices - entry_prices) / entry_prices,
+            'duration': (exit_dates - entry_dates).days
+        })
+
+    def _generate_trades_loop(self, signals: Dict[str, pd.Series], prices: pd.Series) -> pd.DataFrame:
         buy_signals = signals['buy']
         sell_signals = signals['sell']
 
@@ -72,8 +119,44 @@ class BackTest:
 
         return pd.DataFrame(trades)
 
-    def _calculate_metrics(self, trades: pd.DataFrame, prices: pd.Series) -> Dict:
-        if trades.empty:
+    def _calculate_metrics(self, trades: pd.DataFrame, prices: pd.Series,
+                           include_trades: bool = True,
+                           equity: pd.Series = None) -> Dict:
+        """Trade statistics, plus bar-level risk metrics when prices are given.
+
+        With prices, max_drawdown and sharpe_ratio come from the bar-by-bar
+        equity curve (so drawdowns inside a trade count, and Sharpe uses
+        daily returns), alongside sortino_ratio, calmar_ratio,
+        annualized_return and exposure. Without them only the per-trade
+        versions are available.
+        """
+        # Plain arrays from here on; boolean-indexing the trades frame for
+        # every statistic dominated runtime in parameter sweeps
+        returns = trades['return'].to_numpy(dtype=float) if not trades.empty else np.empty(0)
+        metrics = self._returns_metrics(returns)
+
+        if prices is not None:
+            entries, exits = _trade_bars(trades, prices)
+            if equity is None:
+                metrics.update(self._array_metrics(prices.to_numpy(dtype=float), entries, exits))
+            else:
+                exposure = float((exits - entries).sum() / max(len(prices) - 1, 1))
+                metrics.update(equity_metrics(equity.to_numpy(dtype=float)), exposure=exposure)
+
+        metrics['trades'] = trades.to_dict(orient='records') if include_trades and not trades.empty else []
+        return metrics
+
+    def _array_metrics(self, prices: np.ndarray, entries: np.ndarray, exits: np.ndarray) -> Dict:
+        """Every metric _calculate_metrics gives with prices, from bar positions alone"""
+        metrics = self._returns_metrics((prices[exits] - prices[entries]) / prices[entries])
+        bar_returns, held = position_bar_returns(prices, entries, exits)
+        equity = self.initial_capital * np.cumprod(np.concatenate(([1.0], 1 + bar_returns)))
+        metrics.update(equity_metrics(equity), exposure=float(held.mean()) if len(held) else 0.0)
+        return metrics
+
+    def _returns_metrics(self, returns: np.ndarray) -> Dict:
+        """Summary metrics from per-trade returns alone (no 'trades' key)"""
+        if len(returns) == 0:
             return {
                 'total_return': 0.0,
                 'total_trades': 0,
@@ -85,40 +168,38 @@ class BackTest:
                 'avg_losing_trade': 0.0,
                 'max_drawdown': 0.0,
                 'sharpe_ratio': 0.0,
-                'final_capital': self.initial_capital,
-                'trades': []
+                'final_capital': self.initial_capital
             }
 
-        total_trades = len(trades)
-        winning_trades = len(trades[trades['return'] > 0])
-        losing_trades = len(trades[trades['return'] < 0])
+        winners = returns[returns > 0]
+        losers = returns[returns < 0]
+
+        total_trades = len(returns)
+        winning_trades = len(winners)
+        losing_trades = len(losers)
         win_rate = winning_trades / total_trades if total_trades > 0 else 0
 
-        avg_return_per_trade = trades['return'].mean()
-        avg_winning_trade = trades[trades['return'] >
-                                   0]['return'].mean() if winning_trades > 0 else 0
-        avg_losing_trade = trades[trades['return'] <
-                                  0]['return'].mean() if losing_trades > 0 else 0
+        avg_return_per_trade = returns.mean()
+        avg_winning_trade = winners.mean() if winning_trades > 0 else 0
+        avg_losing_trade = losers.mean() if losing_trades > 0 else 0
 
         # Calculate cumulative returns
-        cumulative_return = (1 + trades['return']).prod() - 1
+        cumulative_returns = np.cumprod(1 + returns)
+        cumulative_return = cumulative_returns[-1] - 1
         final_capital = self.initial_capital * (1 + cumulative_return)
 
         # Calculate maximum drawdown
-        cumulative_returns = (1 + trades['return']).cumprod()
-        running_max = cumulative_returns.expanding().max()
+        running_max = np.maximum.accumulate(cumulative_returns)
         drawdown = (cumulative_returns - running_max) / running_max
         max_drawdown = drawdown.min()
 
         # Calculate Sharpe ratio (simplified - assumes daily returns)
-        if trades['return'].std() > 0:
-            sharpe_ratio = trades['return'].mean(
-            ) / trades['return'].std() * np.sqrt(252)  # Annualized
+        std = returns.std(ddof=1) if total_trades > 1 else 0.0
+        if std > 0:
+            sharpe_ratio = returns.mean() / std * np.sqrt(252)  # Annualized
         else:
             sharpe_ratio = 0.0
 
-        trades_arr = trades.to_dict(orient='records')
-
         return {
             'total_return': cumulative_return,
             'total_trades': total_trades,
@@ -130,8 +211,7 @@ class BackTest:
             'avg_losing_trade': avg_losing_trade,
             'max_drawdown': max_drawdown,
             'sharpe_ratio': sharpe_ratio,
-            'final_capital': final_capital,
-            'trades': trades_arr
+            'final_capital': final_capital
         }
 
     def print_results(self, results: Dict):
@@ -158,6 +238,10 @@ class BackTest:
         print()
         print(f"Maximum Drawdown: {metrics['max_drawdown']:.2%}")
         print(f"Sharpe Ratio: {metrics['sharpe_ratio']:.2f}")
+        if 'sortino_ratio' in metrics:
+            print(f"Sortino Ratio: {metrics['sortino_ratio']:.2f}")
+            print(f"Calmar Ratio: {metrics['calmar_ratio']:.2f}")
+            print(f"Exposure: {metrics['exposure']:.2%}")
         print("=" * 50)
 
         if not trades.empty:
@@ -165,3 +249,96 @@ class BackTest:
             print(trades.head().to_string(index=False))
             print("\nLast 5 Trades:")
             print(trades.tail().to_string(index=False))
+
+
+def trade_positions(buy: np.ndarray, sell: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Entry and exit bar positions for aligned boolean buy/sell arrays.
+
+    Each entry is the first buy after the previous exit and each exit is the
+    first sell strictly after its entry, so the work is a few array lookups
+    per trade rather than per bar. A position still open at the end is
+    dropped.
+    """
+    buy_positions = np.flatnonzero(buy)
+    sell_positions = np.flatnonzero(sell)
+
+    # For every buy bar, the sell that would close a trade opened there
+    next_sell = np.searchsorted(sell_positions, buy_positions, side='right')
+    buy_list, next_sell_list = buy_positions.tolist(), next_sell.tolist()
+
+    entries, exits = [], []
+    b = 0
+    while b < len(buy_list) and next_sell_list[b] < len(sell_positions):
+        entry = buy_list[b]
+        exit_ = int(sell_positions[next_sell_list[b]])
+        entries.append(entry)
+        exits.append(exit_)
+        # The exit bar itself can't open a new position
+        b = int(np.searchsorted(buy_positions, exit_, side='right'))
+
+    return np.array(entries, dtype=np.int64), np.array(exits, dtype=np.int64)
+
+
+def _trade_bars(trades: pd.DataFrame, prices: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    if trades.empty:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return (prices.index.get_indexer(trades['entry_date']),
+            prices.index.get_indexer(trades['exit_date']))
+
+
+def position_bar_returns(prices: np.ndarray, entries: np.ndarray,
+                         exits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Strategy return over each bar (len(prices) - 1 of them) and whether it was held.
+
+    A trade is in the market from its entry close to its exit close, so it
+    earns the price change of bars entry+1 through exit. Built with one
+    cumulative sum rather than a loop over bars.
+    """
+    n = len(prices)
+    if n < 2:
+        return np.empty(0), np.empty(0, dtype=bool)
+
+    # +1 on the first held bar of each trade, -1 after its last
+    changes = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(changes, entries + 1, 1)
+    np.add.at(changes, exits + 1, -1)
+    held = np.cumsum(changes)[1:n] > 0
+
+    price_changes = prices[1:] / prices[:-1] - 1
+    bar_returns = np.where(held & np.isfinite(price_changes), price_changes, 0.0)
+    return bar_returns, held
+
+
+def equity_metrics(equity: np.ndarray, periods_per_year: int = 252) -> Dict:
+    """Risk metrics of a bar-by-bar equity curve (assumed daily bars by default)"""
+    if len(equity) < 2:
+        return {
+            'max_drawdown': 0.0,
+            'sharpe_ratio': 0.0,
+            'sortino_ratio': 0.0,
+            'calmar_ratio': 0.0,
+            'annualized_return': 0.0
+        }
+
+    running_max = np.maximum.accumulate(equity)
+    max_drawdown = float(((equity - running_max) / running_max).min())
+
+    returns = equity[1:] / equity[:-1] - 1
+    mean = returns.mean()
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    sharpe_ratio = mean / std * np.sqrt(periods_per_year) if std > 0 else 0.0
+
+    # Downside deviation counts every bar, with gains as zero
+    downside = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2))
+    sortino_ratio = mean / downside * np.sqrt(periods_per_year) if downside > 0 else 0.0
+
+    annualized_return = (equity[-1] / equity[0]) ** (periods_per_year / len(returns)) - 1
+    calmar_ratio = annualized_return / -max_drawdown if max_drawdown < 0 else 0.0
+
+    return {
+        'max_drawdown': max_drawdown,
+        'sharpe_ratio': float(sharpe_ratio),
+        'sortino_ratio': float(sortino_ratio),
+        'calmar_ratio': float(calmar_ratio),
+        'annualized_return': float(annualized_return)
+    }
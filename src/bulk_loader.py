@@ -0,0 +1,145 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.main import DEFAULT_MAX_AGE, MarketData
+from src.sources import DataSource, SourceUnavailable, YahooDataSource
+from src.storage import PriceStore
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` calls per second on average,
+    with bursts of up to `burst` calls after an idle spell"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        if burst < 1:
+            raise ValueError("Burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ThrottledSource(DataSource):
+    """Wraps a DataSource with a shared rate limit and retries.
+
+    Every attempt (retries included) takes a token from `rate_limiter`.
+    Transient failures are retried up to `retries` times, waiting
+    backoff * 2**attempt seconds (with jitter, capped at max_backoff) or
+    whatever Retry-After the source passed on. ValueErrors mean the request
+    itself is bad and are raised straight away.
+    """
+
+    def __init__(self, source: DataSource, rate_limiter: Optional[RateLimiter] = None,
+                 retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0):
+        if retries < 0:
+            raise ValueError("Retries must not be negative")
+        if backoff < 0 or max_backoff < 0:
+            raise ValueError("Backoff must not be negative")
+
+        self.source = source
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def history(self, ticker: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        for attempt in range(self.retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return self.source.history(ticker, period=period, start=start)
+            except ValueError:
+                raise
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self._delay(attempt, e))
+
+    def _delay(self, attempt: int, error: Exception) -> float:
+        if isinstance(error, SourceUnavailable) and error.retry_after is not None:
+            return min(error.retry_after, self.max_backoff)
+        # Jitter keeps workers that failed together from retrying together
+        return min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.0)
+
+
+class BulkLoader:
+    """Loads many tickers concurrently, filling a price store in one pass.
+
+    Each ticker is loaded as its own MarketData on a pool of `max_workers`
+    threads, so stored history is reused, stale history only has its tail
+    fetched and new downloads are written through, exactly as for a single
+    ticker. All downloads go through one ThrottledSource, so `rate_limit`
+    (requests per second) holds across the whole pool and the source's
+    connections are shared.
+    """
+
+    def __init__(self, source: Optional[DataSource] = None, store: Optional[PriceStore] = None,
+                 max_workers: int = 8, rate_limit: Optional[float] = None, burst: int = 1,
+                 retries: int = 3, backoff: float = 0.5,
+                 max_age: pd.Timedelta = DEFAULT_MAX_AGE):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+
+        rate_limiter = RateLimiter(rate_limit, burst) if rate_limit is not None else None
+        self.source = ThrottledSource(source if source is not None else YahooDataSource(),
+                                      rate_limiter, retries, backoff)
+        self.store = store
+        self.max_workers = max_workers
+        self.max_age = max_age
+
+    def _load_one(self, ticker: str, period: str, keep_data: bool) -> Optional[MarketData]:
+        market_data = MarketData(ticker, period, store=self.store, max_age=self.max_age,
+                                 source=self.source)
+        # Dropped here rather than after the pool finishes, so finished
+        # tickers don't pile up in memory
+        return market_data if keep_data else None
+
+    def load(self, tickers: List[str], period: str, keep_data: bool = True) -> Dict:
+        """Load every ticker; failures are collected instead of raised.
+
+        Returns {'data': {ticker: MarketData}, 'errors': {ticker: message}}.
+        With keep_data=False only the store is filled and 'data' stays
+        empty, which keeps memory flat for large universes.
+        """
+        tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        data: Dict[str, MarketData] = {}
+        errors: Dict[str, str] = {}
+        if not tickers:
+            return {'data': data, 'errors': errors}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tickers))) as executor:
+            futures = {ticker: executor.submit(self._load_one, ticker, period, keep_data)
+                       for ticker in tickers}
+            for ticker, future in futures.items():
+                try:
+                    market_data = future.result()
+                except Exception as e:
+                    errors[ticker] = str(e)
+                    continue
+                if keep_data:
+                    data[ticker] = market_data
+
+        return {'data': data, 'errors': errors}
@@ -0,0 +1,130 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class IndicatorCache:
+    """Byte-bounded cache of computed indicator Series.
+
+    Entries are sized by their values only, since every cached Series shares
+    the price frame's index. Once the budget is exceeded entries are evicted
+    by recency ('lru') or by how often they have been read ('lfu', ties going
+    to the least recently used). Hit, miss and eviction counters are kept so
+    the budget can be tuned from `stats()`.
+
+    With a `dtype` (e.g. np.float32 for MarketData's compact mode), float
+    entries are stored converted to it, so the same budget holds more of them.
+    Given the price `index`, entries on an equal index are re-pointed at it.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES, policy: str = 'lru',
+                 dtype: Optional[np.dtype] = None, index: Optional[pd.Index] = None):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if policy not in ['lru', 'lfu']:
+            raise ValueError("Cache policy must be either 'lru' or 'lfu'")
+
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.dtype = np.dtype(dtype) if dtype is not None else None
+        self.index = index
+
+        self._entries: 'OrderedDict[str, pd.Series]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._frequencies: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_held = 0
+
+    def get(self, key: str) -> Optional[pd.Series]:
+        with self._lock:
+            values = self._entries.get(key)
+            if values is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            self._frequencies[key] += 1
+            return values
+
+    def put(self, key: str, values: pd.Series) -> pd.Series:
+        """Store values under key and return them as stored"""
+        dtype = values.dtype
+        if self.dtype is not None and pd.api.types.is_float_dtype(values):
+            dtype = self.dtype
+        # Results built by arithmetic on other Series (MACD and the like)
+        # come back with an equal but separate index, so swap in the shared one
+        index = values.index
+        if self.index is not None and index is not self.index and index.equals(self.index):
+            index = self.index
+        if dtype != values.dtype or index is not values.index:
+            values = pd.Series(values.to_numpy(dtype=dtype), index=index, name=values.name)
+        size = int(values.memory_usage(index=False, deep=True))
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            # Something bigger than the whole budget would just flush the cache
+            if size > self.max_bytes:
+                return values
+
+            self._entries[key] = values
+            self._sizes[key] = size
+            self._frequencies[key] = 1
+            self.bytes_held += size
+
+            while self.bytes_held > self.max_bytes:
+                self._remove(self._victim(exclude=key))
+                self.evictions += 1
+
+        return values
+
+    def _victim(self, exclude: str) -> str:
+        # The entry just stored is never the victim, or LFU would always
+        # throw away new entries before they get a chance to be read
+        candidates = (key for key in self._entries if key != exclude)
+        if self.policy == 'lru':
+            return next(candidates)
+        # min() keeps the first of equal counts, i.e. the least recently used
+        return min(candidates, key=self._frequencies.__getitem__)
+
+    def _remove(self, key: str):
+        del self._entries[key]
+        del self._frequencies[key]
+        self.bytes_held -= self._sizes.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._frequencies.clear()
+            self.bytes_held = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes_held': self.bytes_held,
+                'max_bytes': self.max_bytes,
+                'dtype': str(self.dtype) if self.dtype is not None else None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+            }
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
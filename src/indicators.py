@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
+from typing import List, Optional
+from src.cache import IndicatorCache
 
 
 class Indicator(ABC):
@@ -14,6 +16,18 @@ class Indicator(ABC):
         # Allows you to cache indicators
         pass
 
+    def get_dependencies(self) -> List['Indicator']:
+        """Indicators whose values this one is built from"""
+        return []
+
+    def validate(self, raw_data: pd.DataFrame):
+        """Raise ValueError if raw_data can't produce this indicator"""
+        pass
+
+    def compute_from(self, raw_data: pd.DataFrame, inputs: List[pd.Series]) -> pd.Series:
+        """Compute from already resolved dependency values, in get_dependencies() order"""
+        return self.compute(raw_data)
+
     def __eq__(self, other):
         return str(self) == str(other)
 
@@ -21,6 +35,117 @@ class Indicator(ABC):
         return hash(str(self))
 
 
+class CompositeIndicator(Indicator):
+    """Indicator derived from other indicators rather than straight from prices.
+
+    Subclasses declare their inputs in get_dependencies() and combine them in
+    compute_from(); resolve_indicator() takes care of computing every input
+    once and sharing it through the cache.
+    """
+
+    @abstractmethod
+    def get_dependencies(self) -> List[Indicator]:
+        pass
+
+    @abstractmethod
+    def compute_from(self, raw_data: pd.DataFrame, inputs: List[pd.Series]) -> pd.Series:
+        pass
+
+    def compute(self, raw_data: pd.DataFrame) -> pd.Series:
+        return resolve_indicator(self, raw_data)
+
+
+def resolve_indicator(indicator: Indicator, raw_data: pd.DataFrame,
+                      cache: Optional[IndicatorCache] = None) -> pd.Series:
+    """Compute indicator by walking its dependency DAG depth first.
+
+    Every node is looked up in (and stored to) the cache by its string key,
+    so sub-results shared between indicators, e.g. the EMAs under both the
+    MACD line and the MACD signal, are only ever computed once.
+    """
+    if cache is None:
+        cache = IndicatorCache()
+
+    key = str(indicator)
+    values = cache.get(key)
+    if values is not None:
+        return values
+
+    indicator.validate(raw_data)
+    inputs = [resolve_indicator(dependency, raw_data, cache)
+              for dependency in indicator.get_dependencies()]
+    values = indicator.compute_from(raw_data, inputs)
+    return cache.put(key, values)
+
+
+def _ewm_alpha(span: float = None, alpha: float = None) -> float:
+    # pandas turns span/alpha into a center of mass and back, and the round
+    # trip can move the last bit, so do it the way get_center_of_mass does
+    com = (span - 1) / 2.0 if span is not None else (1.0 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+def _ewm_batch(values: np.ndarray, alphas: np.ndarray) -> np.ndarray:
+    """adjust=False exponential means of one series for several alphas at once.
+
+    Returns a (len(values), len(alphas)) array. Each step applies the same
+    update pandas' ewm().mean() uses to every alpha in one vector operation,
+    so the results are identical to calling ewm once per alpha. Leading NaNs
+    are passed through; values must have no NaNs after the first observation.
+
+    This is still a Python loop over bars; only the alphas are vectorized,
+    since no closed form reproduces pandas' rounding. With in-place updates
+    it runs about twice as fast as one ewm() call per period (~17ms against
+    ~34ms for 200 periods over 2520 bars), not in a single pass.
+    """
+    out = np.full((len(values), len(alphas)), np.nan)
+    observed = np.flatnonzero(~np.isnan(values))
+    if len(observed) == 0:
+        return out
+
+    first = observed[0]
+    old_weight = 1.0 - alphas
+    total_weight = old_weight + alphas
+    out[first] = values[first]
+
+    # Scratch buffers, so the loop allocates nothing per bar
+    updated = np.empty(len(alphas))
+    new_part = np.empty(len(alphas))
+    changed = np.empty(len(alphas), dtype=bool)
+    for i in range(first + 1, len(values)):
+        current = values[i]
+        previous, row = out[i - 1], out[i]
+        np.multiply(old_weight, previous, out=updated)
+        np.multiply(alphas, current, out=new_part)
+        np.add(updated, new_part, out=updated)
+        np.divide(updated, total_weight, out=updated)
+        # pandas leaves the mean untouched when the new value equals it
+        np.not_equal(previous, current, out=changed)
+        row[:] = previous
+        np.copyto(row, updated, where=changed)
+
+    return out
+
+
+def _batch_frame(cls, raw_data: pd.DataFrame, periods: List[int], values: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame(values, index=raw_data.index,
+                        columns=[str(cls(period)) for period in periods])
+
+
+def _check_batch(name: str, raw_data: pd.DataFrame, periods: List[int], extra_points: int = 0) -> np.ndarray:
+    if not periods:
+        raise ValueError("At least one period is required")
+    if min(periods) <= 0:
+        raise ValueError("Period must be positive")
+    if 'Close' not in raw_data.columns:
+        raise ValueError(f"Close column required for {name}")
+    needed = max(periods) + extra_points
+    if len(raw_data) < needed:
+        raise ValueError(
+            f"Not enough data points. Need at least {needed}, got {len(raw_data)}")
+    return np.array(periods)
+
+
 class SMA(Indicator):
     def __init__(self, period: int):
         if period <= 0:
@@ -39,6 +164,24 @@ class SMA(Indicator):
         except Exception as e:
             raise ValueError(f"Error computing SMA: {e}")
 
+    @classmethod
+    def compute_batch(cls, raw_data: pd.DataFrame, periods: List[int]) -> pd.DataFrame:
+        """SMA for many periods at once (one column per period).
+
+        Each column is pandas' own rolling mean, so it is identical to what
+        compute() returns: batch columns are cached under the single-period
+        keys, and a cumulative-sum shortcut that is off in the last bits
+        moves crossovers on prices with ties. The saving is converting the
+        close once and filling one block instead of concatenating frames.
+        """
+        period_array = _check_batch("SMA", raw_data, periods)
+        close = pd.Series(raw_data['Close'].to_numpy(dtype=float))
+
+        values = np.empty((len(periods), len(close)))
+        for row, period in enumerate(period_array):
+            values[row] = close.rolling(window=period).mean().to_numpy()
+        return _batch_frame(cls, raw_data, periods, values.T)
+
     def __str__(self):
         return f"SMA_{self.period}"
 
@@ -61,6 +204,23 @@ class EMA(Indicator):
         except Exception as e:
             raise ValueError(f"Error computing EMA: {e}")
 
+    @classmethod
+    def compute_batch(cls, raw_data: pd.DataFrame, periods: List[int]) -> pd.DataFrame:
+        """EMA for many periods in one recurrence (one column per period).
+
+        Bit-exact with compute(), but only ~2x faster than computing each
+        period separately; see _ewm_batch.
+        """
+        _check_batch("EMA", raw_data, periods)
+        close = raw_data['Close'].to_numpy(dtype=float)
+
+        if np.isnan(close).any():
+            return pd.concat([cls(period).compute(raw_data) for period in periods],
+                             axis=1, keys=[str(cls(period)) for period in periods])
+
+        alphas = np.array([_ewm_alpha(span=period) for period in periods])
+        return _batch_frame(cls, raw_data, periods, _ewm_batch(close, alphas))
+
     def __str__(self):
         return f"EMA_{self.period}"
 
@@ -102,11 +262,34 @@ class RSI(Indicator):
         except Exception as e:
             raise ValueError(f"Error computing RSI: {e}")
 
+    @classmethod
+    def compute_batch(cls, raw_data: pd.DataFrame, periods: List[int]) -> pd.DataFrame:
+        """RSI for many periods in one recurrence (one column per period)"""
+        period_array = _check_batch("RSI", raw_data, periods, extra_points=1)
+        close = raw_data['Close'].to_numpy(dtype=float)
+
+        if np.isnan(close).any():
+            return pd.concat([cls(period).compute(raw_data) for period in periods],
+                             axis=1, keys=[str(cls(period)) for period in periods])
+
+        differences = np.diff(close, prepend=np.nan)
+        gains = np.clip(differences, 0, None)
+        losses = -np.clip(differences, None, 0)
+
+        alphas = np.array([_ewm_alpha(alpha=1 / period) for period in periods])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = _ewm_batch(gains, alphas) / _ewm_batch(losses, alphas)
+            rs[np.isinf(rs)] = np.nan
+            values = 100 - (100 / (1 + rs))
+
+        values[np.arange(len(close))[:, None] < period_array[None, :]] = np.nan
+        return _batch_frame(cls, raw_data, periods, values)
+
     def __str__(self):
         return f"RSI_{self.period}"
 
 
-class MACDLine(Indicator):
+class MACDLine(CompositeIndicator):
     def __init__(self, short_period: int = 12, long_period: int = 26):
         if short_period <= 0 or long_period <= 0:
             raise ValueError("All periods must be positive")
@@ -116,16 +299,18 @@ class MACDLine(Indicator):
         self.short_period = short_period
         self.long_period = long_period
 
-    def compute(self, raw_data: pd.DataFrame) -> pd.Series:
+    def get_dependencies(self) -> List[Indicator]:
+        return [EMA(self.short_period), EMA(self.long_period)]
+
+    def validate(self, raw_data: pd.DataFrame):
         if 'Close' not in raw_data.columns:
             raise ValueError("Close column required for MACD")
         if len(raw_data) < self.long_period:
             raise ValueError(f"Not enough data points for MACD calculation")
 
+    def compute_from(self, raw_data: pd.DataFrame, inputs: List[pd.Series]) -> pd.Series:
         try:
-            # Calculate EMAs
-            ema_short = EMA(self.short_period).compute(raw_data)
-            ema_long = EMA(self.long_period).compute(raw_data)
+            ema_short, ema_long = inputs
 
             # MACD line = short EMA - long EMA
             macd_line = ema_short - ema_long
@@ -138,7 +323,7 @@ class MACDLine(Indicator):
         return f"MACD_Line_{self.short_period}_{self.long_period}"
 
 
-class MACDSignal(Indicator):
+class MACDSignal(CompositeIndicator):
     def __init__(self, short_period: int = 12, long_period: int = 26, signal_period: int = 9):
         if short_period <= 0 or long_period <= 0 or signal_period <= 0:
             raise ValueError("All periods must be positive")
@@ -150,16 +335,19 @@ class MACDSignal(Indicator):
         self.signal_period = signal_period
         self.macd_line = MACDLine(short_period, long_period)
 
-    def compute(self, raw_data: pd.DataFrame) -> pd.Series:
+    def get_dependencies(self) -> List[Indicator]:
+        return [self.macd_line]
+
+    def validate(self, raw_data: pd.DataFrame):
         if 'Close' not in raw_data.columns:
             raise ValueError("Close column required for MACD Signal")
         if len(raw_data) < self.long_period + self.signal_period:
             raise ValueError(
                 f"Not enough data points for MACD Signal calculation")
 
+    def compute_from(self, raw_data: pd.DataFrame, inputs: List[pd.Series]) -> pd.Series:
         try:
-            # Get MACD line
-            macd_line = self.macd_line.compute(raw_data)
+            macd_line, = inputs
 
             # Signal line = EMA of MACD line
             signal_line = macd_line.ewm(
@@ -173,7 +361,7 @@ class MACDSignal(Indicator):
         return f"MACD_Signal_{self.short_period}_{self.long_period}_{self.signal_period}"
 
 
-class MACDHistogram(Indicator):
+class MACDHistogram(CompositeIndicator):
     def __init__(self, short_period: int = 12, long_period: int = 26, signal_period: int = 9):
         if short_period <= 0 or long_period <= 0 or signal_period <= 0:
             raise ValueError("All periods must be positive")
@@ -186,17 +374,19 @@ class MACDHistogram(Indicator):
         self.macd_line = MACDLine(short_period, long_period)
         self.macd_signal = MACDSignal(short_period, long_period, signal_period)
 
-    def compute(self, raw_data: pd.DataFrame) -> pd.Series:
+    def get_dependencies(self) -> List[Indicator]:
+        return [self.macd_line, self.macd_signal]
+
+    def validate(self, raw_data: pd.DataFrame):
         if 'Close' not in raw_data.columns:
             raise ValueError("Close column required for MACD Histogram")
         if len(raw_data) < self.long_period + self.signal_period:
             raise ValueError(
                 f"Not enough data points for MACD Histogram calculation")
 
+    def compute_from(self, raw_data: pd.DataFrame, inputs: List[pd.Series]) -> pd.Series:
         try:
-            # Get MACD line and signal line
-            macd_line = self.macd_line.compute(raw_data)
-            signal_line = self.macd_signal.compute(raw_data)
+            macd_line, signal_line = inputs
 
             # Histogram = MACD line - signal line
             histogram = macd_line - signal_line
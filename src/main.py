@@ -1,23 +1,250 @@
-import yfinance as yf
+import hashlib
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from src.storage import PriceStore, period_start, slice_period
+from src.cache import IndicatorCache, DEFAULT_CACHE_BYTES
+from src.indicators import resolve_indicator
+from src.sources import DataSource, YahooDataSource
+
+
+# How long stored history is trusted before MarketData goes back to the source
+DEFAULT_MAX_AGE = pd.Timedelta(hours=12)
+
+# Compact mode keeps prices and indicators as float32: half the memory, but
+# only ~7 significant digits (a $1,000 price resolves to ~0.0001, volumes are
+# exact up to 2**24). That's well below price tick sizes, but two indicator
+# values within ~1e-7 of each other can compare differently than in float64,
+# so a crossover can occasionally land a bar earlier or later.
+COMPACT_DTYPE = np.float32
+
+
+class PriceArrays:
+    """Read-only contiguous NumPy view of a price frame.
+
+    `timestamps` are int64 nanoseconds (UTC for tz-aware indexes) and
+    `columns` maps each numeric column (OHLCV etc.) to a float64 array
+    (float32 for compact MarketData). The columns are the rows of one
+    (columns x bars) block, the layout pandas keeps a float frame in, so
+    frame() can wrap them back up as a DataFrame without copying.
+    Positions line up with `index`, the frame's own index object, so
+    anything computed from these arrays can be wrapped back into pandas
+    without aligning.
+    """
+
+    def __init__(self, index: pd.DatetimeIndex, timestamps: np.ndarray, values: np.ndarray,
+                 names: List, owned_bytes: int = 0):
+        self.index = index
+        self.timestamps = timestamps
+        self.values = values
+        self.names = names
+        self.columns = {}
+        for name, row in zip(names, values):
+            row = row.view()
+            row.flags.writeable = False
+            self.columns[str(name)] = row
+        self.owned_bytes = owned_bytes
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, dtype=np.float64) -> 'PriceArrays':
+        """Copies only what has to change: a frame that is already a single
+        block of `dtype` (an arena mapping, or the frame() of another
+        PriceArrays) is used as is"""
+        names = [name for name in data.columns if pd.api.types.is_numeric_dtype(data[name])]
+        numeric = data if len(names) == len(data.columns) else data[names]
+        values = numeric.to_numpy(dtype=dtype).T
+        if not values.flags.c_contiguous:
+            values = np.ascontiguousarray(values)
+
+        index = pd.DatetimeIndex(data.index)
+        timestamps = np.ascontiguousarray(index.as_unit('ns').asi8)
+        timestamps.flags.writeable = False
+        owned = 0 if np.shares_memory(timestamps, index.asi8) else timestamps.nbytes
+        return cls(data.index, timestamps, values, names, owned)
+
+    def frame(self, data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """The arrays as a DataFrame on `index`, sharing their memory.
+
+        Non-numeric columns of `data` (the frame these came from) are put
+        back in their places as they were.
+        """
+        frame = pd.DataFrame(self.values.T, index=self.index, columns=self.names, copy=False)
+        if data is not None:
+            frame.columns.name = data.columns.name
+            for position, name in enumerate(data.columns):
+                if name not in self.names:
+                    frame.insert(position, name, data[name])
+        return frame
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+def aligned_values(series: pd.Series, index: pd.Index, dtype=np.float64) -> np.ndarray:
+    """series' values positioned on index as a float array, NaN where missing.
+
+    Series computed from the same MarketData already share its index, so
+    the reindex (and its index hashing) only happens for foreign series.
+    """
+    if series.index is not index and not series.index.equals(index):
+        series = series.reindex(index)
+    return series.to_numpy(dtype=dtype)
+
+
+def aligned_signal(signal: pd.Series, index: pd.Index) -> np.ndarray:
+    """A buy/sell signal as a bool array on index, False where missing"""
+    if signal.index is not index and not signal.index.equals(index):
+        signal = signal.reindex(index, fill_value=False)
+    if signal.dtype != bool:
+        signal = signal.fillna(False)
+    return signal.to_numpy(dtype=bool)
+
+
+def pack_signals(signals: np.ndarray) -> np.ndarray:
+    """Bool signals (or rows of them) bit-packed along the last axis, 8 bars a byte"""
+    return np.packbits(signals, axis=-1)
+
+
+def unpack_signals(packed: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Bars start:end of packed signals as bools, unpacking only the bytes they span"""
+    first = start // 8
+    bits = np.unpackbits(packed[..., first:-(-end // 8)], axis=-1)
+    offset = start - first * 8
+    return bits[..., offset:offset + end - start].view(bool)
 
 
 class MarketData:
-    def __init__(self, ticker: str, period: str):
+    def __init__(self, ticker: str, period: str, store: Optional[PriceStore] = None,
+                 offline: bool = False, max_age: pd.Timedelta = DEFAULT_MAX_AGE,
+                 cache_max_bytes: int = DEFAULT_CACHE_BYTES, cache_policy: str = 'lru',
+                 raw_data: Optional[pd.DataFrame] = None, compact: bool = False,
+                 source: Optional[DataSource] = None):
         if not ticker or not isinstance(ticker, str):
             raise ValueError("Ticker must be a non-empty string")
         if not period or not isinstance(period, str):
             raise ValueError("Period must be a non-empty string")
+        if offline and store is None:
+            raise ValueError("Offline mode requires a price store")
 
         self.ticker = ticker.upper()
         self.period = period
-        self.raw_data = self._fetch_data()
-        self._indicator_cache: Dict[str, pd.Series] = {}
+        self.store = store
+        self.offline = offline
+        self.max_age = max_age
+        self.source = source if source is not None else YahooDataSource()
+        # See COMPACT_DTYPE for the precision trade-off. The store keeps
+        # full precision; only the in-memory copy is narrowed.
+        self.compact = compact
+        self.dtype = np.dtype(COMPACT_DTYPE if compact else np.float64)
+        # Already loaded prices (e.g. handed over by another process) skip
+        # both the store and the source
+        if raw_data is not None:
+            if raw_data.empty:
+                raise ValueError(f"No data found for ticker {self.ticker}")
+        else:
+            raw_data = self._load_data()
+        # raw_data is a pandas view of the arrays, so indicators, signals and
+        # BackTest all read the same contiguous (and, compact, float32) block
+        self._arrays = PriceArrays.from_frame(raw_data, self.dtype)
+        self.raw_data = self._arrays.frame(raw_data)
+        self._indicator_cache = IndicatorCache(cache_max_bytes, cache_policy,
+                                               dtype=COMPACT_DTYPE if compact else None,
+                                               index=self.raw_data.index)
+        self._data_version: Optional[str] = None
+
+    def _load_data(self) -> pd.DataFrame:
+        # No store configured means we always go straight to the source
+        if self.store is None:
+            return self._fetch_data()
+
+        stored = self.store.load(self.ticker)
+        if stored is not None and not stored.empty:
+            if self.offline:
+                return slice_period(stored, self.period)
+
+            metadata = self.store.load_metadata(self.ticker)
+            now = _now_like(stored.index)
+            if self._covers_period(metadata, now):
+                if not self._is_stale(metadata, now):
+                    return slice_period(stored, self.period)
+                try:
+                    return slice_period(self._refresh_tail(stored, metadata), self.period)
+                except ValueError:
+                    # Stale history beats none while the source is down; it
+                    # stays marked stale, so the next load tries again
+                    return slice_period(stored, self.period)
+
+        if self.offline:
+            raise ValueError(
+                f"No stored data for {self.ticker} and offline mode is enabled")
 
-    def _fetch_data(self) -> pd.DataFrame:
+        data = self._fetch_data()
+        self._write_through(data, stored)
+        return data
+
+    def _covers_period(self, metadata: Dict, now: pd.Timestamp) -> bool:
+        """Stored history is usable if it reaches back as far as the period needs"""
+        if 'covers_from' not in metadata:
+            return False
+        covers_from = metadata['covers_from']
+        if covers_from is None:
+            return True
+        required = period_start(self.period, now)
+        return required is not None and _parse_timestamp(covers_from, now) <= required
+
+    def _is_stale(self, metadata: Dict, now: pd.Timestamp) -> bool:
+        if 'updated_at' not in metadata:
+            return True
+        return now - _parse_timestamp(metadata['updated_at'], now) > self.max_age
+
+    def _refresh_tail(self, stored: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
+        """Download only the bars after the last stored one and append them.
+
+        The last stored bar is fetched again because it may have been saved
+        while its session was still open.
+        """
+        tail = self._fetch_data(start=stored.index[-1])
+        if not tail.empty:
+            merged = pd.concat([stored[stored.index < tail.index[0]], tail])
+            stored = merged[~merged.index.duplicated(keep='last')]
+
+        metadata = dict(metadata)
+        metadata['updated_at'] = _now_like(stored.index).isoformat()
+        self.store.save(self.ticker, stored, metadata)
+        return stored
+
+    def _write_through(self, data: pd.DataFrame, stored: Optional[pd.DataFrame]):
+        now = _now_like(data.index)
+        covers_from = period_start(self.period, now)
+
+        # Only merge with what we had if the two histories overlap, otherwise
+        # the stored frame would end up with a hole in the middle
+        if stored is not None and not stored.empty and data.index[0] <= stored.index[-1]:
+            previous = self.store.load_metadata(self.ticker).get('covers_from', '')
+            if previous is None or covers_from is None:
+                covers_from = None
+            elif previous:
+                covers_from = min(covers_from, _parse_timestamp(previous, now))
+            merged = pd.concat([stored, data])
+            data = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+        metadata = {
+            'covers_from': None if covers_from is None else covers_from.isoformat(),
+            'updated_at': now.isoformat()
+        }
+        self.store.save(self.ticker, data, metadata)
+
+    def _fetch_data(self, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Download the requested period, or everything from `start` onwards"""
         try:
-            data = yf.Ticker(self.ticker).history(period=self.period)
+            if start is not None:
+                # An empty tail just means no new bars since the last refresh
+                return self.source.history(self.ticker, start=start)
+
+            data = self.source.history(self.ticker, period=self.period)
             if data.empty:
                 raise ValueError(f"No data found for ticker {self.ticker}")
             return data
@@ -27,18 +254,56 @@ class MarketData:
     def get_indicator_data(self, indicator) -> pd.Series:
         indicator_key = str(indicator)
 
-        if indicator_key not in self._indicator_cache:
+        # Composite indicators pull their inputs through the same cache, so
+        # shared sub-indicators are computed once per dataset
+        try:
+            return resolve_indicator(indicator, self.raw_data, self._indicator_cache)
+        except Exception as e:
+            raise ValueError(f"Error computing {indicator_key}: {e}")
+
+    def get_indicator_values(self, indicator) -> np.ndarray:
+        """get_indicator_data as an array on the price index positions
+        (float64, or float32 in compact mode)"""
+        return aligned_values(self.get_indicator_data(indicator), self.raw_data.index, self.dtype)
+
+    def get_indicator_batch(self, indicator_cls, periods: List[int]) -> pd.DataFrame:
+        """Values of indicator_cls for every period, one column per period.
+
+        Periods missing from the cache are computed together with the class's
+        compute_batch() and each column is cached like a single indicator, so
+        later get_indicator_data() calls for any of them are cache hits.
+        """
+        indicators = [indicator_cls(period) for period in periods]
+        missing = [indicator.period for indicator in indicators
+                   if str(indicator) not in self._indicator_cache]
+
+        if missing:
             try:
-                self._indicator_cache[indicator_key] = indicator.compute(
-                    self.raw_data)
+                batch = indicator_cls.compute_batch(self.raw_data, missing)
             except Exception as e:
-                raise ValueError(f"Error computing {indicator_key}: {e}")
+                raise ValueError(f"Error computing {indicator_cls.__name__} batch: {e}")
+            for key in batch.columns:
+                self._indicator_cache.put(key, pd.Series(
+                    batch[key].to_numpy(copy=True), index=self.raw_data.index, name='Close'))
 
-        return self._indicator_cache[indicator_key]
+        return pd.DataFrame({str(indicator): self.get_indicator_data(indicator)
+                             for indicator in indicators})
+
+    def data_version(self) -> str:
+        """Identifies this exact price history; changes whenever bars are added or revised"""
+        if self._data_version is None:
+            hashed = pd.util.hash_pandas_object(self.raw_data, index=True)
+            digest = hashlib.sha256(hashed.to_numpy().tobytes()).hexdigest()
+            self._data_version = f"{len(self.raw_data)}-{digest[:16]}"
+        return self._data_version
 
     def get_raw_data(self) -> pd.DataFrame:
         return self.raw_data
 
+    def arrays(self) -> PriceArrays:
+        """The prices as NumPy arrays; get_raw_data() is a view of the same memory"""
+        return self._arrays
+
     def get_ticker(self) -> str:
         return self.ticker
 
@@ -47,3 +312,51 @@ class MarketData:
 
     def clear_cache(self):
         self._indicator_cache.clear()
+
+    def cache_stats(self) -> Dict:
+        return self._indicator_cache.stats()
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the price frame and cached indicators"""
+        return (int(self.raw_data.memory_usage(deep=True).sum()) + self._arrays.owned_bytes
+                + self._indicator_cache.bytes_held)
+
+    def memory_report(self) -> Dict:
+        """Bytes held now, next to what the same data takes at float64"""
+        numeric = [name for name in self.raw_data.columns
+                   if pd.api.types.is_numeric_dtype(self.raw_data[name])]
+        prices = int(self.raw_data.memory_usage(deep=True).sum())
+        full_prices = (prices - sum(self.raw_data[name].nbytes for name in numeric)
+                       + len(self.raw_data) * 8 * len(numeric))
+
+        indicators = self._indicator_cache.bytes_held
+        full_indicators = indicators * 8 // self.dtype.itemsize
+        arrays = self._arrays.owned_bytes
+
+        total = prices + indicators + arrays
+        full_total = full_prices + full_indicators + arrays
+        return {
+            'compact': self.compact,
+            'prices_bytes': prices,
+            'indicator_bytes': indicators,
+            'array_bytes': arrays,
+            'total_bytes': total,
+            'float64_bytes': full_total,
+            'saved_bytes': full_total - total,
+            'saved_ratio': (full_total - total) / full_total if full_total > 0 else 0.0
+        }
+
+
+def _now_like(index: pd.Index) -> pd.Timestamp:
+    """Current time in the same timezone (or lack of one) as a price index"""
+    tz = getattr(index, 'tz', None)
+    return pd.Timestamp.now(tz=tz) if tz is not None else pd.Timestamp.now()
+
+
+def _parse_timestamp(value: str, like: pd.Timestamp) -> pd.Timestamp:
+    timestamp = pd.Timestamp(value)
+    if like.tz is None:
+        return timestamp.tz_localize(None) if timestamp.tz is not None else timestamp
+    if timestamp.tz is None:
+        return timestamp.tz_localize(like.tz)
+    return timestamp.tz_convert(like.tz)
@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+
+METHODS = ['shuffle', 'bootstrap', 'block']
+
+# Rows are simulated in chunks of about this many values to bound memory
+_CHUNK_VALUES = 4_000_000
+
+
+def path_metrics(returns: np.ndarray, step: str = 'trade') -> Dict[str, np.ndarray]:
+    """total_return, max drawdown and Sharpe ratio for every row of a
+    (simulations x steps) return matrix.
+
+    Drawdown and Sharpe are taken over the steps themselves, so they are
+    named after them: with step='trade' they are BackTest's per-trade
+    versions (trade_max_drawdown, trade_sharpe_ratio), not the bar-level
+    max_drawdown and sharpe_ratio run_backtest reports. Sharpe is
+    annualized with sqrt(252) either way.
+    """
+    growth = np.cumprod(1 + returns, axis=1)
+    running_max = np.maximum.accumulate(growth, axis=1)
+    max_drawdown = ((growth - running_max) / running_max).min(axis=1)
+
+    mean = returns.mean(axis=1)
+    if returns.shape[1] > 1:
+        std = returns.std(axis=1, ddof=1)
+    else:
+        std = np.zeros(len(returns))
+    sharpe_ratio = np.divide(mean, std, out=np.zeros_like(mean), where=std > 0) * np.sqrt(252)
+
+    return {
+        'total_return': growth[:, -1] - 1,
+        f'{step}_max_drawdown': max_drawdown,
+        f'{step}_sharpe_ratio': sharpe_ratio
+    }
+
+
+def position_returns(prices: pd.Series, trades: pd.DataFrame) -> np.ndarray:
+    """Bar-to-bar price returns while a trade was open, one per bar held.
+
+    They compound to exactly the trade returns, but keep the day-to-day
+    path, which is what the block bootstrap resamples.
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    entries = prices.index.get_indexer(trades['entry_date'])
+    exits = prices.index.get_indexer(trades['exit_date'])
+    if (entries < 0).any() or (exits < 0).any():
+        raise ValueError("Trade dates are missing from the price series")
+
+    held = np.zeros(len(values), dtype=bool)
+    for entry, exit_ in zip(entries.tolist(), exits.tolist()):
+        held[entry + 1:exit_ + 1] = True
+    held_bars = np.flatnonzero(held)
+    return values[held_bars] / values[held_bars - 1] - 1
+
+
+class MonteCarlo:
+    """Distributions of backtest metrics from resampled trade sequences.
+
+    method='shuffle' reorders the trade returns (same trades in a different
+    order, so only the drawdown distribution changes), 'bootstrap' draws
+    trades with replacement, and 'block' resamples blocks of `block_size`
+    consecutive bar returns from while trades were open, which keeps
+    short-term autocorrelation. The drawdown and Sharpe columns say what
+    they were measured over: trade_max_drawdown and trade_sharpe_ratio for
+    trade returns, held_bar_max_drawdown and held_bar_sharpe_ratio for the
+    block method's bars in a position (flat bars left out, unlike
+    BackTest's bar-level sharpe_ratio). Each batch of simulations is one
+    (simulations x steps) matrix, so there's no Python loop per path.
+    """
+
+    def __init__(self, simulations: int = 10000, method: str = 'bootstrap',
+                 block_size: int = 20, initial_capital: float = 10000,
+                 seed: Optional[int] = None):
+        if simulations <= 0:
+            raise ValueError("Number of simulations must be positive")
+        if method not in METHODS:
+            raise ValueError(f"Method must be one of {METHODS}")
+        if block_size <= 0:
+            raise ValueError("Block size must be positive")
+        if initial_capital <= 0:
+            raise ValueError("Initial capital must be positive")
+
+        self.simulations = simulations
+        self.method = method
+        self.block_size = block_size
+        self.initial_capital = initial_capital
+        self.seed = seed
+
+    def _sample(self, values: np.ndarray, rows: int, rng: np.random.Generator) -> np.ndarray:
+        n = len(values)
+        if self.method == 'shuffle':
+            return rng.permuted(np.broadcast_to(values, (rows, n)), axis=1)
+        if self.method == 'bootstrap':
+            return values[rng.integers(0, n, size=(rows, n))]
+
+        # Circular blocks, so bars near the end are as likely as any other
+        n_blocks = -(-n // self.block_size)
+        starts = rng.integers(0, n, size=(rows, n_blocks, 1))
+        positions = (starts + np.arange(self.block_size)) % n
+        return values[positions.reshape(rows, -1)[:, :n]]
+
+    @property
+    def step(self) -> str:
+        """What one resampled return is, as used in the metric names"""
+        return 'held_bar' if self.method == 'block' else 'trade'
+
+    def simulate(self, values: np.ndarray) -> pd.DataFrame:
+        """One row of metrics per simulated path of `values` (trade or bar returns)"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            raise ValueError("Need at least one return to resample")
+
+        rng = np.random.default_rng(self.seed)
+        chunk = max(1, _CHUNK_VALUES // len(values))
+        columns: Dict[str, List[np.ndarray]] = {}
+        for start in range(0, self.simulations, chunk):
+            rows = min(chunk, self.simulations - start)
+            for name, metric in path_metrics(self._sample(values, rows, rng), self.step).items():
+                columns.setdefault(name, []).append(metric)
+
+        results = pd.DataFrame({name: np.concatenate(parts) for name, parts in columns.items()})
+        results['final_capital'] = self.initial_capital * (1 + results['total_return'])
+        return results
+
+    def run(self, trades: Union[pd.DataFrame, np.ndarray],
+            prices: Optional[pd.Series] = None,
+            percentiles: List[float] = (5, 25, 50, 75, 95)) -> Dict:
+        """Simulate from a backtest's trades and summarize the distributions.
+
+        `trades` is BackTest's trades frame (or just the array of trade
+        returns). The block method needs the frame plus the Close prices it
+        was traded on.
+        """
+        if self.method == 'block':
+            if prices is None or not isinstance(trades, pd.DataFrame):
+                raise ValueError("Block bootstrap needs the trades frame and the price series")
+            values = position_returns(prices, trades) if not trades.empty else np.empty(0)
+        elif isinstance(trades, pd.DataFrame):
+            values = trades['return'].to_numpy(dtype=np.float64) if not trades.empty else np.empty(0)
+        else:
+            values = np.asarray(trades, dtype=np.float64)
+
+        observed = {name: float(metric[0])
+                    for name, metric in path_metrics(values[None, :], self.step).items()} if len(values) else {}
+        simulations = self.simulate(values)
+
+        summary = simulations.quantile([p / 100 for p in percentiles])
+        summary.index = [f'p{p:g}' for p in percentiles]
+        summary.loc['mean'] = simulations.mean()
+
+        return {
+            'simulations': simulations,
+            'summary': summary,
+            'observed': observed
+        }
@@ -0,0 +1,86 @@
+import itertools
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import pandas as pd
+from src.back_testing import BackTest
+from src.main import MarketData
+
+
+class ParameterSweep:
+    """Grid search of one strategy class over a single MarketData.
+
+    Every combination of `param_grid` values is passed to strategy_cls as
+    keyword arguments. Combinations the strategy rejects (e.g. a lower period
+    above the upper one) are skipped. Indicators are shared through the
+    MarketData cache, and SMA/EMA/RSI periods needed anywhere in the grid are
+    computed up front with one batch call per indicator type.
+    """
+
+    def __init__(self, strategy_cls, param_grid: Dict[str, List],
+                 initial_capital: float = 10000, sort_by: str = 'total_return',
+                 ascending: bool = False):
+        if not param_grid:
+            raise ValueError("Parameter grid must not be empty")
+        for name, values in param_grid.items():
+            if not isinstance(values, (list, tuple, range)) or len(values) == 0:
+                raise ValueError(f"Grid values for '{name}' must be a non-empty list")
+
+        self.strategy_cls = strategy_cls
+        self.param_grid = param_grid
+        self.backtest = BackTest(initial_capital=initial_capital)
+        self.sort_by = sort_by
+        self.ascending = ascending
+
+    def combinations(self) -> List[Dict]:
+        names = list(self.param_grid)
+        return [dict(zip(names, values))
+                for values in itertools.product(*(self.param_grid[name] for name in names))]
+
+    def build_strategies(self) -> List[Tuple[Dict, object]]:
+        strategies = []
+        for params in self.combinations():
+            try:
+                strategies.append((params, self.strategy_cls(**params)))
+            except ValueError:
+                continue
+        return strategies
+
+    def run(self, market_data: MarketData) -> pd.DataFrame:
+        """Backtest every valid combination and rank them by `sort_by`"""
+        strategies = self.build_strategies()
+        if not strategies:
+            raise ValueError("No valid parameter combinations in the grid")
+
+        prime_indicators(market_data, [strategy for _, strategy in strategies])
+        prices = market_data.get_raw_data()['Close']
+
+        rows = []
+        for params, strategy in strategies:
+            try:
+                signals = strategy.calculate_signals(market_data)
+            except Exception as e:
+                raise ValueError(f"Error running {self.strategy_cls.__name__}({params}): {e}")
+
+            trades = self.backtest._generate_trades(signals, prices)
+            metrics = self.backtest._calculate_metrics(
+                trades, prices, include_trades=False)
+            metrics.pop('trades')
+            rows.append({**params, **metrics})
+
+        results = pd.DataFrame(rows)
+        if self.sort_by not in results.columns:
+            raise ValueError(f"Cannot sort by unknown metric '{self.sort_by}'")
+        return results.sort_values(self.sort_by, ascending=self.ascending,
+                                   kind='stable').reset_index(drop=True)
+
+
+def prime_indicators(market_data: MarketData, strategies: List) -> None:
+    """Batch-compute every single-period indicator the strategies will ask for"""
+    periods_by_type = defaultdict(set)
+    for strategy in strategies:
+        for indicator in strategy.get_required_indicators():
+            if hasattr(type(indicator), 'compute_batch'):
+                periods_by_type[type(indicator)].add(indicator.period)
+
+    for indicator_cls, periods in periods_by_type.items():
+        market_data.get_indicator_batch(indicator_cls, sorted(periods))
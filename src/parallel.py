@@ -0,0 +1,135 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.back_testing import BackTest
+from src.main import MarketData, PriceArrays
+
+
+class _SharedFrame:
+    """A price frame laid out in one shared memory block.
+
+    The block holds int64 timestamps followed by one float64 row per column,
+    so a worker only needs the block name and shape to rebuild the frame.
+    """
+
+    def __init__(self, ticker: str, data: pd.DataFrame):
+        self.ticker = ticker
+        self.columns = [str(column) for column in data.columns]
+        self.n_rows = len(data)
+        self.tz = str(data.index.tz) if data.index.tz is not None else None
+
+        # Converted before the block exists, so a frame that can't be laid
+        # out (non-numeric column, non-datetime index) leaves nothing behind
+        arrays = PriceArrays.from_frame(data)
+        missing = [column for column in self.columns if column not in arrays.columns]
+        if missing:
+            raise ValueError(f"Non-numeric columns can't be shared: {missing}")
+
+        size = 8 * self.n_rows * (1 + len(self.columns))
+        self.block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            timestamps, values = _views(self.block.buf, self.n_rows, len(self.columns))
+            timestamps[:] = arrays.timestamps
+            for row, column in enumerate(self.columns):
+                values[row] = arrays[column]
+            del timestamps, values
+        except Exception:
+            self.release()
+            raise
+
+    def job(self, strategy, period: str, initial_capital: float) -> Tuple:
+        return (self.ticker, self.block.name, self.n_rows, self.columns, self.tz,
+                strategy, period, initial_capital)
+
+    def release(self):
+        self.block.close()
+        self.block.unlink()
+
+
+def _views(buffer, n_rows: int, n_columns: int) -> Tuple[np.ndarray, np.ndarray]:
+    timestamps = np.ndarray((n_rows,), dtype=np.int64, buffer=buffer)
+    values = np.ndarray((n_columns, n_rows), dtype=np.float64,
+                        buffer=buffer, offset=8 * n_rows)
+    return timestamps, values
+
+
+def _run_job(job: Tuple) -> Dict:
+    """Worker side: rebuild the frame from shared memory and backtest it"""
+    ticker, block_name, n_rows, columns, tz, strategy, period, initial_capital = job
+
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        timestamps, values = _views(block.buf, n_rows, len(columns))
+        # One memcpy out of the block, so it can be closed straight away
+        index = pd.DatetimeIndex(timestamps.view('M8[ns]'), copy=True)
+        data = pd.DataFrame(values.T.copy(), index=index, columns=columns)
+        del timestamps, values
+    finally:
+        block.close()
+
+    if tz is not None:
+        data.index = data.index.tz_localize('UTC').tz_convert(tz)
+
+    try:
+        market_data = MarketData(ticker, period, raw_data=data)
+        backtest = BackTest(initial_capital=initial_capital)
+        signals = strategy.calculate_signals(market_data)
+        trades = backtest._generate_trades(signals, data['Close'])
+        metrics = backtest._calculate_metrics(trades, data['Close'], include_trades=False)
+        metrics.pop('trades')
+        return {'ticker': ticker, **metrics, 'error': None}
+    except Exception as e:
+        return {'ticker': ticker, 'error': str(e)}
+
+
+def backtest_frames(frames: Dict[str, pd.DataFrame], strategy, period: str = 'max',
+                    initial_capital: float = 10000,
+                    max_workers: Optional[int] = None) -> pd.DataFrame:
+    """Backtest one strategy over already loaded price frames on a process pool.
+
+    Prices travel to the workers through shared memory rather than being
+    pickled; only the (small) strategy object is pickled per job. Returns one
+    summary row per ticker, with failures reported in the 'error' column.
+    """
+    if not frames:
+        raise ValueError("No price data to backtest")
+    if initial_capital <= 0:
+        raise ValueError("Initial capital must be positive")
+
+    shared: List[_SharedFrame] = []
+    try:
+        for ticker, data in frames.items():
+            shared.append(_SharedFrame(ticker, data))
+        jobs = [frame.job(strategy, period, initial_capital) for frame in shared]
+
+        max_workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(_run_job, jobs, chunksize=chunksize))
+    finally:
+        for frame in shared:
+            frame.release()
+
+    return pd.DataFrame(rows).set_index('ticker')
+
+
+def backtest_universe(tickers: List[str], strategy, period: str,
+                      initial_capital: float = 10000, max_workers: Optional[int] = None,
+                      **market_data_kwargs) -> pd.DataFrame:
+    """Load every ticker (through the store if one is given) and backtest them in parallel"""
+    frames, errors = {}, {}
+    for ticker in tickers:
+        try:
+            frames[ticker.upper()] = MarketData(
+                ticker, period, **market_data_kwargs).get_raw_data()
+        except ValueError as e:
+            errors[ticker.upper()] = str(e)
+
+    summary = backtest_frames(frames, strategy, period, initial_capital,
+                              max_workers) if frames else pd.DataFrame()
+    for ticker, error in errors.items():
+        summary.loc[ticker, 'error'] = error
+    return summary
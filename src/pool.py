@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Tuple
+from src.main import MarketData
+
+
+DEFAULT_TTL = 15 * 60
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class _PoolEntry:
+    def __init__(self, market_data: MarketData, loaded_at: float):
+        self.market_data = market_data
+        self.loaded_at = loaded_at
+
+
+class MarketDataPool:
+    """Process-wide pool of MarketData objects shared across requests.
+
+    Entries are keyed by (ticker, period) and reused until they are older
+    than `ttl` seconds, so concurrent backtests on the same ticker also share
+    its indicator cache. When the pool holds more than `max_bytes` the least
+    recently used entries are dropped. Concurrent misses on the same key are
+    coalesced: one caller loads the data and the rest wait for its result.
+    Any extra keyword arguments (store, offline, ...) go to MarketData.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES,
+                 **market_data_kwargs):
+        if ttl <= 0:
+            raise ValueError("TTL must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.market_data_kwargs = market_data_kwargs
+
+        self._entries: 'OrderedDict[Tuple[str, str], _PoolEntry]' = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0}
+
+    def get(self, ticker: str, period: str) -> MarketData:
+        if not ticker or not isinstance(ticker, str):
+            raise ValueError("Ticker must be a non-empty string")
+        key = (ticker.upper(), period)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.loaded_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry.market_data
+
+            future = self._in_flight.get(key)
+            if future is None:
+                future = Future()
+                self._in_flight[key] = future
+                self._stats['misses'] += 1
+                is_loader = True
+            else:
+                self._stats['coalesced'] += 1
+                is_loader = False
+
+        if not is_loader:
+            return future.result()
+
+        try:
+            market_data = MarketData(ticker, period, **self.market_data_kwargs)
+        except Exception as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._entries[key] = _PoolEntry(market_data, time.monotonic())
+            self._entries.move_to_end(key)
+            del self._in_flight[key]
+            self._evict()
+
+        future.set_result(market_data)
+        return market_data
+
+    def _evict(self):
+        # Indicator caches keep growing after insertion, so sizes are
+        # measured now rather than remembered from load time
+        total = sum(entry.market_data.memory_usage()
+                    for entry in self._entries.values())
+
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            total -= entry.market_data.memory_usage()
+            self._stats['evictions'] += 1
+
+    def invalidate(self, ticker: str, period: str = None):
+        """Drop one entry, or every period held for ticker"""
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == ticker.upper() and (period is None or key[1] == period):
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = sum(entry.market_data.memory_usage()
+                                 for entry in self._entries.values())
+        return stats
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        ticker, period = key
+        return (ticker.upper(), period) in self._entries
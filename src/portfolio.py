@@ -0,0 +1,217 @@
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from src.back_testing import equity_metrics
+from src.main import MarketData, aligned_signal
+
+
+def _affordable_fraction(value: float, target: np.ndarray, held: np.ndarray,
+                         commission: float) -> float:
+    """Largest s in [0, 1] for which buying s * target out of `held` stays
+    within `value` once commission on the turnover is paid.
+
+    Cash left is value - s * sum(target) - commission * sum|s * target - held|,
+    which is piecewise linear in s with a kink wherever s * target meets held,
+    so checking the kinks in order finds the segment it goes negative on and
+    the root there is exact up to rounding. Reserving value * commission is
+    not enough: a full rotation turns over twice the book.
+    """
+    def cash_left(s):
+        return value - s * target.sum() - commission * np.abs(s * target - held).sum()
+
+    if commission == 0 or cash_left(1.0) >= 0:
+        return 1.0
+
+    kinks = np.divide(held, target, out=np.ones_like(held), where=target > 0)
+    points = np.unique(np.concatenate(([0.0, 1.0], kinks[(kinks > 0) & (kinks < 1)])))
+    cash = np.array([cash_left(s) for s in points])
+    # cash_left is concave and not negative at 0 (cash never is), so it
+    # crosses zero once, between the last point that can afford it and the next
+    last = int(np.flatnonzero(cash >= 0)[-1])
+    low, high = points[last], points[last + 1]
+    return float(low + cash[last] * (high - low) / (cash[last] - cash[last + 1]))
+
+
+class PortfolioBackTest:
+    """Long-only backtest of many tickers sharing one cash balance.
+
+    Positions follow the same rules as BackTest for every asset at once:
+    a buy opens a position when flat, a sell closes it, and the exit bar
+    can't reopen it. Held assets get equal target weights, either of the
+    whole portfolio or of `max_positions` fixed slots (leaving unused slots
+    in cash, and skipping new entries when every slot is taken). The book
+    is rebalanced to those weights whenever the set of holdings changes,
+    and also every `rebalance_every` bars if given; in between, share
+    counts stay fixed and weights drift with prices.
+
+    Everything runs on (time x asset) arrays. The only Python loops are
+    over bars for the position state and over rebalance bars for the
+    share counts, and each step is a vector op across all assets.
+    """
+
+    def __init__(self, initial_capital: float = 100000, max_positions: Optional[int] = None,
+                 rebalance_every: Optional[int] = None, commission: float = 0.0):
+        if initial_capital <= 0:
+            raise ValueError("Initial capital must be positive")
+        if max_positions is not None and max_positions <= 0:
+            raise ValueError("max_positions must be positive")
+        if rebalance_every is not None and rebalance_every <= 0:
+            raise ValueError("rebalance_every must be positive")
+        if not 0 <= commission < 1:
+            raise ValueError("Commission must be a fraction between 0 and 1")
+
+        self.initial_capital = initial_capital
+        self.max_positions = max_positions
+        self.rebalance_every = rebalance_every
+        self.commission = commission
+
+    def run(self, market_data: Dict[str, MarketData], strategy) -> Dict:
+        """Signals for every ticker from one strategy, then a shared-capital simulation"""
+        if not market_data:
+            raise ValueError("Need at least one ticker to backtest")
+
+        prices, buys, sells = {}, {}, {}
+        for ticker, data in market_data.items():
+            strategy.validate_data(data)
+            signals = strategy.calculate_signals(data)
+            close = data.get_raw_data()['Close']
+            prices[ticker] = close
+            buys[ticker] = pd.Series(aligned_signal(signals['buy'], close.index), index=close.index)
+            sells[ticker] = pd.Series(aligned_signal(signals['sell'], close.index), index=close.index)
+
+        # Tickers with different trading calendars line up on the union of dates
+        prices = pd.DataFrame(prices).sort_index()
+        buy = pd.DataFrame(buys).reindex(prices.index).fillna(False).astype(bool)
+        sell = pd.DataFrame(sells).reindex(prices.index).fillna(False).astype(bool)
+        return self.simulate(prices, buy, sell)
+
+    def simulate(self, prices: pd.DataFrame, buy: pd.DataFrame, sell: pd.DataFrame) -> Dict:
+        """Run the portfolio over aligned (time x asset) prices and signals.
+
+        A NaN price means the asset can't trade on that bar (not listed yet,
+        or a holiday on its exchange); it keeps its last price for valuation.
+        """
+        if not (prices.shape == buy.shape == sell.shape):
+            raise ValueError("Prices and signals must have the same shape")
+
+        raw_prices = prices.to_numpy(dtype=np.float64)
+        tradable = ~np.isnan(raw_prices)
+        valuation = np.nan_to_num(prices.ffill().to_numpy(dtype=np.float64), nan=0.0)
+
+        positions = self._positions(buy.to_numpy(dtype=bool) & tradable,
+                                    sell.to_numpy(dtype=bool) & tradable)
+        weights = self._target_weights(positions)
+        rebalance = self._rebalance_bars(positions)
+
+        equity, holdings, cash, costs = self._simulate_capital(valuation, weights, rebalance)
+
+        holdings_frame = pd.DataFrame(holdings, index=prices.index, columns=prices.columns)
+        return {
+            'equity': pd.Series(equity, index=prices.index, name='equity'),
+            'cash': pd.Series(cash, index=prices.index, name='cash'),
+            'holdings': holdings_frame,
+            'positions': pd.DataFrame(positions, index=prices.index, columns=prices.columns),
+            'metrics': self._calculate_metrics(equity, cash, positions, rebalance, costs)
+        }
+
+    def _positions(self, buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+        n_bars, n_assets = buy.shape
+        positions = np.empty((n_bars, n_assets), dtype=bool)
+        held = np.zeros(n_assets, dtype=bool)
+
+        for t in range(n_bars):
+            # Entries are taken from the holdings before this bar's exits,
+            # so an asset sold on this bar can't be bought back on it
+            entering = buy[t] & ~held
+            held = held & ~sell[t]
+
+            if self.max_positions is not None:
+                free = self.max_positions - int(held.sum())
+                candidates = np.flatnonzero(entering)
+                if len(candidates) > free:
+                    # Column order decides which entries get the free slots
+                    entering[candidates[max(free, 0):]] = False
+
+            held = held | entering
+            positions[t] = held
+
+        return positions
+
+    def _target_weights(self, positions: np.ndarray) -> np.ndarray:
+        if self.max_positions is not None:
+            return positions / float(self.max_positions)
+        counts = positions.sum(axis=1, keepdims=True)
+        return positions / np.maximum(counts, 1)
+
+    def _rebalance_bars(self, positions: np.ndarray) -> np.ndarray:
+        rebalance = np.zeros(len(positions), dtype=bool)
+        if len(positions) == 0:
+            return rebalance
+
+        rebalance[0] = positions[0].any()
+        rebalance[1:] = (positions[1:] != positions[:-1]).any(axis=1)
+        if self.rebalance_every is not None:
+            periodic = np.arange(len(positions)) % self.rebalance_every == 0
+            rebalance |= periodic & positions.any(axis=1)
+        return rebalance
+
+    def _simulate_capital(self, valuation: np.ndarray, weights: np.ndarray,
+                          rebalance: np.ndarray):
+        n_bars, n_assets = valuation.shape
+        equity = np.full(n_bars, float(self.initial_capital))
+        cash = np.full(n_bars, float(self.initial_capital))
+        holdings = np.zeros((n_bars, n_assets))
+
+        shares = np.zeros(n_assets)
+        cash_balance = float(self.initial_capital)
+        costs = 0.0
+
+        rebalance_bars = np.flatnonzero(rebalance)
+        segment_ends = np.append(rebalance_bars[1:], n_bars)
+        for start, end in zip(rebalance_bars.tolist(), segment_ends.tolist()):
+            bar_prices = valuation[start]
+            value = cash_balance + shares @ bar_prices
+
+            target_value = np.where(bar_prices > 0, weights[start] * value, 0.0)
+            # Scaled down just enough for the commissions to come out of cash
+            target_value *= _affordable_fraction(value, target_value, shares * bar_prices,
+                                                 self.commission)
+            new_shares = np.divide(target_value, bar_prices,
+                                   out=np.zeros(n_assets), where=bar_prices > 0)
+            cost = np.abs(new_shares - shares) @ bar_prices * self.commission
+
+            cash_balance = value - new_shares @ bar_prices - cost
+            shares = new_shares
+            costs += cost
+
+            holdings[start:end] = shares
+            cash[start:end] = cash_balance
+            equity[start:end] = cash_balance + valuation[start:end] @ shares
+
+        return equity, holdings, cash, costs
+
+    def _calculate_metrics(self, equity: np.ndarray, cash: np.ndarray, positions: np.ndarray,
+                           rebalance: np.ndarray, costs: float) -> Dict:
+        if len(equity) == 0:
+            return {
+                'total_return': 0.0,
+                'final_capital': self.initial_capital,
+                **equity_metrics(np.empty(0)),
+                'exposure': 0.0,
+                'rebalances': 0,
+                'total_costs': 0.0,
+                'max_positions_held': 0
+            }
+
+        final_capital = float(equity[-1])
+
+        return {
+            'total_return': final_capital / self.initial_capital - 1,
+            'final_capital': final_capital,
+            # Starting from the initial capital, so costs on the first bar count
+            **equity_metrics(np.concatenate(([float(self.initial_capital)], equity))),
+            'exposure': float(np.mean(1 - cash / equity)),
+            'rebalances': int(rebalance.sum()),
+            'total_costs': float(costs),
+            'max_positions_held': int(positions.sum(axis=1).max())
+        }
@@ -0,0 +1,112 @@
+import io
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+import yfinance as yf
+
+
+class SourceUnavailable(Exception):
+    """A temporary failure (rate limited, server error) worth retrying.
+
+    `retry_after` is the delay in seconds the server asked for, if any.
+    """
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DataSource(ABC):
+    """Where MarketData downloads price history from.
+
+    history() returns an OHLCV frame on a DatetimeIndex, an empty frame if
+    there is nothing for the request. Raise ValueError for problems with
+    the request itself (unknown ticker, bad period) so they aren't retried;
+    anything else, SourceUnavailable included, counts as transient.
+    """
+
+    @abstractmethod
+    def history(self, ticker: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Bars for the trailing `period`, or every bar from `start` on"""
+        pass
+
+
+class YahooDataSource(DataSource):
+    """yfinance, as MarketData has always used it.
+
+    yfinance already keeps one session for all tickers, so connections are
+    reused; pass `session` to use a specific one instead (recent yfinance
+    versions need a curl_cffi session).
+    """
+
+    def __init__(self, session=None):
+        self.session = session
+
+    def history(self, ticker: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        if self.session is not None:
+            source = yf.Ticker(ticker, session=self.session)
+        else:
+            source = yf.Ticker(ticker)
+
+        if start is not None:
+            return source.history(start=start.date())
+        return source.history(period=period)
+
+
+class CsvHttpSource(DataSource):
+    """Price history served as CSV over HTTP, e.g. an internal data service.
+
+    Requests go to <base_url>/<TICKER>.csv with either a `period` or a
+    `start` (ISO date) query parameter. The response needs a date column
+    first, then the price columns; a 404 means no data. One requests
+    Session is kept, with a connection pool sized for `pool_size`
+    concurrent downloads, so bulk loads reuse connections instead of
+    opening one per ticker.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 10.0, pool_size: int = 10,
+                 session: Optional[requests.Session] = None):
+        if not base_url or not isinstance(base_url, str):
+            raise ValueError("Base URL must be a non-empty string")
+        if timeout <= 0:
+            raise ValueError("Timeout must be positive")
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def history(self, ticker: str, period: Optional[str] = None,
+                start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        params = {'start': start.date().isoformat()} if start is not None else {'period': period}
+        response = self.session.get(f"{self.base_url}/{ticker.upper()}.csv",
+                                    params=params, timeout=self.timeout)
+
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get('Retry-After')
+            raise SourceUnavailable(
+                f"{response.status_code} from {self.base_url} for {ticker}",
+                float(retry_after) if retry_after and retry_after.isdigit() else None)
+        if response.status_code == 404:
+            return pd.DataFrame()
+        if response.status_code != 200:
+            raise ValueError(f"{response.status_code} from {self.base_url} for {ticker}")
+
+        data = pd.read_csv(io.StringIO(response.text), index_col=0)
+        # Timestamps with UTC offsets (which change over DST) come back in UTC
+        data.index = pd.to_datetime(data.index, utc=_has_offsets(data.index))
+        return data
+
+
+def _has_offsets(index: pd.Index) -> bool:
+    # Dates like 2024-01-02 stay naive; timestamps with +hh:mm become tz-aware
+    return len(index) > 0 and any(marker in str(index[0])[10:] for marker in ['+', '-', 'Z'])
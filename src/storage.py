@@ -0,0 +1,167 @@
+import json
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+
+def period_offset(period: str) -> Optional[pd.DateOffset]:
+    """Translate a yfinance period string into a DateOffset (None means 'max')"""
+    period = period.lower()
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return pd.offsets.YearBegin()
+
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period '{period}'")
+
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == 'd':
+        # Daily periods count bars, so leave room for weekends and holidays
+        return pd.DateOffset(days=2 * amount + 4)
+    if unit == 'wk':
+        return pd.DateOffset(weeks=amount)
+    if unit == 'mo':
+        return pd.DateOffset(months=amount)
+    return pd.DateOffset(years=amount)
+
+
+def period_start(period: str, end: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """First timestamp a `period` window ending at `end` needs (None means 'max')"""
+    offset = period_offset(period)
+    if offset is None:
+        return None
+    if period.lower() == 'ytd':
+        return end.normalize().replace(month=1, day=1)
+    return end - offset
+
+
+def slice_period(data: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Cut the trailing `period` window out of a longer price history.
+
+    The window is anchored on the last stored bar rather than on today so
+    that offline runs against an old fixture store stay reproducible.
+    Slicing is positional, so the result is a view whenever possible.
+    """
+    if data.empty:
+        return data
+
+    period = period.lower()
+    match = _PERIOD_PATTERN.match(period)
+    if match and match.group(2) == 'd':
+        return data.iloc[-int(match.group(1)):]
+
+    start = period_start(period, data.index[-1])
+    if start is None:
+        return data
+    return data.iloc[data.index.searchsorted(start):]
+
+
+class PriceStore(ABC):
+    """Local storage for OHLCV history, keyed by ticker.
+
+    Alongside each frame a store keeps a small metadata dict. MarketData
+    uses it to record how far back the stored history is known to be
+    complete ('covers_from', None for a 'max' download) and when it was
+    last refreshed ('updated_at').
+    """
+
+    @abstractmethod
+    def load(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Return the stored history for ticker, or None if nothing is stored"""
+        pass
+
+    @abstractmethod
+    def save(self, ticker: str, data: pd.DataFrame, metadata: Dict):
+        """Replace the stored history and metadata for ticker"""
+        pass
+
+    @abstractmethod
+    def load_metadata(self, ticker: str) -> Dict:
+        """Return the metadata saved with ticker, or an empty dict"""
+        pass
+
+    def contains(self, ticker: str) -> bool:
+        return bool(self.load_metadata(ticker))
+
+
+class MemoryStore(PriceStore):
+    """In-process store, handy for tests and fixtures"""
+
+    def __init__(self):
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._metadata: Dict[str, Dict] = {}
+
+    def load(self, ticker: str) -> Optional[pd.DataFrame]:
+        return self._frames.get(ticker.upper())
+
+    def save(self, ticker: str, data: pd.DataFrame, metadata: Dict):
+        self._frames[ticker.upper()] = data
+        self._metadata[ticker.upper()] = dict(metadata)
+
+    def load_metadata(self, ticker: str) -> Dict:
+        return dict(self._metadata.get(ticker.upper(), {}))
+
+
+class ParquetStore(PriceStore):
+    """Directory of <TICKER>.parquet files with a <TICKER>.json sidecar.
+
+    Files are written to a temporary name and renamed into place, so
+    several processes can share one directory without readers ever seeing
+    a half-written file.
+    """
+
+    def __init__(self, directory: str):
+        if not directory or not isinstance(directory, str):
+            raise ValueError("Store directory must be a non-empty string")
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{ticker.upper()}.{extension}")
+
+    def load(self, ticker: str) -> Optional[pd.DataFrame]:
+        path = self._path(ticker, 'parquet')
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            raise ValueError(f"Error reading stored data for {ticker}: {e}")
+
+    def save(self, ticker: str, data: pd.DataFrame, metadata: Dict):
+        self._atomic_write(self._path(ticker, 'parquet'),
+                           lambda path: data.to_parquet(path))
+        self._atomic_write(self._path(ticker, 'json'),
+                           lambda path: _write_json(path, metadata))
+
+    def load_metadata(self, ticker: str) -> Dict:
+        path = self._path(ticker, 'json')
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _atomic_write(self, path: str, writer):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise ValueError(f"Error writing {path}: {e}")
+
+
+def _write_json(path: str, payload: Dict):
+    with open(path, 'w') as f:
+        json.dump(payload, f)
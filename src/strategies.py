@@ -3,7 +3,7 @@ from typing import List, Dict
 import pandas as pd
 import numpy as np
 from src.indicators import SMA, EMA, RSI, MACDLine, MACDSignal, MACDHistogram
-from src.main import MarketData
+from src.main import MarketData, aligned_signal
 
 
 class Strategy(ABC):
@@ -67,25 +67,16 @@ class MovingAverageCross(Strategy):
         self.validate_data(market_data)
 
         try:
-            lower_values = market_data.get_indicator_data(self.lower_ma)
-            upper_values = market_data.get_indicator_data(self.upper_ma)
+            lower_values = market_data.get_indicator_values(self.lower_ma)
+            upper_values = market_data.get_indicator_values(self.upper_ma)
         except Exception as e:
             raise ValueError(f"Error computing indicators: {e}")
 
-        # Remove NaN values from the series because those suck
-        aligned_lower, aligned_upper = lower_values.align(
-            upper_values, join='inner')
-
-        bullish_cross = (aligned_lower > aligned_upper) & (
-            aligned_lower.shift(1) <= aligned_upper.shift(1))
-
-        bearish_cross = (aligned_lower < aligned_upper) & (
-            aligned_lower.shift(1) >= aligned_upper.shift(1))
-
-        return {
-            'buy': bullish_cross.fillna(False),
-            'sell': bearish_cross.fillna(False)
-        }
+        # Both lines sit on the price index, so crosses are found by position;
+        # comparisons against the NaN warm-up are simply False
+        return _signals(market_data,
+                        buy=_crossed_above(lower_values, upper_values),
+                        sell=_crossed_below(lower_values, upper_values))
 
 
 class RSICross(Strategy):
@@ -117,22 +108,15 @@ class RSICross(Strategy):
     def calculate_signals(self, market_data) -> Dict[str, pd.Series]:
 
         try:
-            rsi_values = market_data.get_indicator_data(self.rsi_indicator)
+            rsi_values = market_data.get_indicator_values(self.rsi_indicator)
         except Exception as e:
             raise ValueError(f"Error computing RSI: {e}")
 
         # RSI crosses above lower bound - buy!
-        buy_signals = (rsi_values > self.lower_bound) & (
-            rsi_values.shift(1) <= self.lower_bound)
-
         # RSI crosses below upper bound - sell!
-        sell_signals = (rsi_values < self.upper_bound) & (
-            rsi_values.shift(1) >= self.upper_bound)
-
-        return {
-            'buy': buy_signals.fillna(False),
-            'sell': sell_signals.fillna(False)
-        }
+        return _signals(market_data,
+                        buy=_crossed_above(rsi_values, self.lower_bound),
+                        sell=_crossed_below(rsi_values, self.upper_bound))
 
 
 class RSIExtremes(Strategy):
@@ -163,18 +147,13 @@ class RSIExtremes(Strategy):
 
     def calculate_signals(self, market_data) -> Dict[str, pd.Series]:
         """Generate signals based on RSI extreme levels"""
-        rsi_values = market_data.get_indicator_data(self.rsi_indicator)
+        rsi_values = market_data.get_indicator_values(self.rsi_indicator)
 
         # Buy when RSI is oversold (below threshold)
-        buy_signals = rsi_values < self.oversold_threshold
-
         # Sell when RSI is overbought (above threshold)
-        sell_signals = rsi_values > self.overbought_threshold
-
-        return {
-            'buy': buy_signals.fillna(False),
-            'sell': sell_signals.fillna(False)
-        }
+        return _signals(market_data,
+                        buy=rsi_values < self.oversold_threshold,
+                        sell=rsi_values > self.overbought_threshold)
 
 
 class MACDCross(Strategy):
@@ -207,27 +186,16 @@ class MACDCross(Strategy):
     def calculate_signals(self, market_data) -> Dict[str, pd.Series]:
 
         try:
-            macd_line = market_data.get_indicator_data(self.macd_line)
-            signal_line = market_data.get_indicator_data(self.macd_signal)
+            macd_line = market_data.get_indicator_values(self.macd_line)
+            signal_line = market_data.get_indicator_values(self.macd_signal)
         except Exception as e:
             raise ValueError(f"Error computing MACD: {e}")
 
-        # Get rid of NaN and only keep values that are present in both series ;)
-        aligned_macd, aligned_signal = macd_line.align(
-            signal_line, join='inner')
-
         # Bullish: MACD line crosses above signal line - buy!
-        buy_signals = (aligned_macd > aligned_signal) & (
-            aligned_macd.shift(1) <= aligned_signal.shift(1))
-
         # Bearish: MACD line crosses below signal line - sell!
-        sell_signals = (aligned_macd < aligned_signal) & (
-            aligned_macd.shift(1) >= aligned_signal.shift(1))
-
-        return {
-            'buy': buy_signals.fillna(False),
-            'sell': sell_signals.fillna(False)
-        }
+        return _signals(market_data,
+                        buy=_crossed_above(macd_line, signal_line),
+                        sell=_crossed_below(macd_line, signal_line))
 
 
 class MACDHistogramStrategy(Strategy):
@@ -259,29 +227,39 @@ class MACDHistogramStrategy(Strategy):
 
     def calculate_signals(self, market_data) -> Dict[str, pd.Series]:
         """Generate signals based on MACD histogram zero crossings"""
-        histogram = market_data.get_indicator_data(self.macd_histogram)
+        histogram = market_data.get_indicator_values(self.macd_histogram)
 
         # Buy when histogram crosses above zero (momentum turning positive!)
-        buy_signals = (histogram > 0) & (histogram.shift(1) <= 0)
-
         # Sell when histogram crosses below zero (momentum turning negative!)
-        sell_signals = (histogram < 0) & (histogram.shift(1) >= 0)
-
-        return {
-            'buy': buy_signals.fillna(False),
-            'sell': sell_signals.fillna(False)
-        }
+        return _signals(market_data,
+                        buy=_crossed_above(histogram, 0),
+                        sell=_crossed_below(histogram, 0))
 
 
 class CustomStrategy(Strategy):
+    """Combines the buy/sell signals of several sub-strategies by vote.
 
-    def __init__(self, mode='all'):
+    'all' and 'any' need every / at least one sub-strategy to agree,
+    'majority' needs more than half, 'k_of_n' needs at least `k`, and
+    'weighted' needs the weights of the agreeing sub-strategies (see
+    add_strategy) to reach `threshold` of the total weight.
+    """
+
+    MODES = ['all', 'any', 'majority', 'weighted', 'k_of_n']
+
+    def __init__(self, mode='all', threshold: float = 0.5, k: int = None):
         self.strategies: List[Strategy] = []
-        if mode not in ['all', 'any', 'majority']:
-            print(mode)
+        self.weights: List[float] = []
+        if mode not in self.MODES:
             raise ValueError(
-                "Custom strategy mode must be either 'all', 'any', or 'majority'")
+                "Custom strategy mode must be either 'all', 'any', 'majority', 'weighted', or 'k_of_n'")
+        if mode == 'weighted' and not 0 < threshold <= 1:
+            raise ValueError("Weighted vote threshold must be between 0 and 1")
+        if mode == 'k_of_n' and (k is None or k <= 0):
+            raise ValueError("k_of_n mode needs a positive k")
         self.mode = mode
+        self.threshold = threshold
+        self.k = k
 
     @classmethod
     def generate_from_params(cls, params: dict):
@@ -289,10 +267,15 @@ class CustomStrategy(Strategy):
             raise ValueError(
                 "Parameters for initializing a custom strategy must include 'mode'")
 
-        return cls(params['mode'])
+        threshold = float(params['threshold']) if params.get('threshold') is not None else 0.5
+        k = int(params['k']) if params.get('k') is not None else None
+        return cls(params['mode'], threshold=threshold, k=k)
 
-    def add_strategy(self, strategy: Strategy):
+    def add_strategy(self, strategy: Strategy, weight: float = 1.0):
+        if weight <= 0:
+            raise ValueError("Strategy weight must be positive")
         self.strategies.append(strategy)
+        self.weights.append(float(weight))
 
     def validate_data(self, market_data):
 
@@ -311,25 +294,56 @@ class CustomStrategy(Strategy):
 
         if not self.strategies:
             raise ValueError("No strategies added yet!")
-
-        buy_df = pd.DataFrame()
-        sell_df = pd.DataFrame()
-        for num, s in enumerate(self.strategies):
-            new_col = s.calculate_signals(market_data)
-            new_label = f"Strategy_{num}"
-            buy_df[new_label] = new_col['buy']
-            sell_df[new_label] = new_col['sell']
-
-        if self.mode == 'all':
-            combined_buy = buy_df.all(axis=1)
-            combined_sell = sell_df.all(axis=1)
-        else:
-            combined_buy = buy_df.any(axis=1)
-            combined_sell = sell_df.any(axis=1)
+        if self.mode == 'k_of_n' and self.k > len(self.strategies):
+            raise ValueError(f"k_of_n needs at least k={self.k} strategies")
+
+        # One row per sub-strategy over the price index, filled in place
+        # rather than growing a DataFrame column by column
+        index = market_data.get_raw_data().index
+        buy_votes = np.zeros((len(self.strategies), len(index)), dtype=bool)
+        sell_votes = np.zeros((len(self.strategies), len(index)), dtype=bool)
+        for row, s in enumerate(self.strategies):
+            signals = s.calculate_signals(market_data)
+            buy_votes[row] = aligned_signal(signals['buy'], index)
+            sell_votes[row] = aligned_signal(signals['sell'], index)
 
         return {
-            'buy': combined_buy,
-            'sell': combined_sell
+            'buy': pd.Series(self._combine(buy_votes), index=index),
+            'sell': pd.Series(self._combine(sell_votes), index=index)
         }
 
-        # Loop through strategies and use bitwise and to generate buy and sell markers
+    def _combine(self, votes: np.ndarray) -> np.ndarray:
+        if self.mode == 'all':
+            return votes.all(axis=0)
+        if self.mode == 'any':
+            return votes.any(axis=0)
+        if self.mode == 'majority':
+            return 2 * votes.sum(axis=0) > len(votes)
+        if self.mode == 'k_of_n':
+            return votes.sum(axis=0) >= self.k
+
+        weights = np.asarray(self.weights)
+        # Small tolerance so e.g. 3 of 5 equal weights reaches a 0.6 threshold
+        return weights @ votes >= self.threshold * weights.sum() - 1e-12
+
+
+def _signals(market_data: MarketData, buy: np.ndarray, sell: np.ndarray) -> Dict[str, pd.Series]:
+    """Wrap positional signal arrays back into Series on the price index"""
+    index = market_data.get_raw_data().index
+    return {'buy': pd.Series(buy, index=index), 'sell': pd.Series(sell, index=index)}
+
+
+def _crossed_above(values: np.ndarray, level) -> np.ndarray:
+    """values goes above level: above it now and at or below it on the previous bar"""
+    level = np.broadcast_to(level, values.shape)
+    crossed = np.zeros(len(values), dtype=bool)
+    crossed[1:] = (values[1:] > level[1:]) & (values[:-1] <= level[:-1])
+    return crossed
+
+
+def _crossed_below(values: np.ndarray, level) -> np.ndarray:
+    """values goes below level: below it now and at or above it on the previous bar"""
+    level = np.broadcast_to(level, values.shape)
+    crossed = np.zeros(len(values), dtype=bool)
+    crossed[1:] = (values[1:] < level[1:]) & (values[:-1] >= level[:-1])
+    return crossed
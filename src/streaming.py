@@ -0,0 +1,258 @@
+import math
+import numbers
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import List
+import pandas as pd
+from src.indicators import (Indicator, SMA, EMA, RSI, MACDLine, MACDSignal,
+                            MACDHistogram, _ewm_alpha)
+
+
+class IndicatorStream(ABC):
+    """Incremental counterpart of an Indicator for live bar updates.
+
+    Feed bars one at a time with update(); each call returns the value the
+    batch compute() would give for that bar, bit for bit. A bar is either a
+    close price or anything indexable by 'Close' (a dict, a row Series).
+
+    Missing closes (NaN) are handled like pandas does, but exact agreement
+    is only promised for gap-free input: pandas' ewm re-weights the bar after
+    a gap differently when alpha is exactly 0.5 (EMA_3, RSI_2).
+    """
+
+    def __init__(self):
+        self.value = math.nan
+
+    def update(self, bar) -> float:
+        self.value = self._update(_close(bar))
+        return self.value
+
+    def update_many(self, bars) -> List[float]:
+        return [self.update(bar) for bar in bars]
+
+    def prime(self, raw_data: pd.DataFrame) -> 'IndicatorStream':
+        """Warm the state up on a price history, e.g. before going live"""
+        if 'Close' not in raw_data.columns:
+            raise ValueError("Close column required to prime a stream")
+        for close in raw_data['Close'].to_numpy(dtype=float):
+            self.update(close)
+        return self
+
+    @abstractmethod
+    def _update(self, close: float) -> float:
+        pass
+
+
+class StreamingSMA(IndicatorStream):
+    """Rolling mean over the last `period` closes, O(period) state.
+
+    Replays the compensated add/remove updates of pandas' rolling().mean()
+    so the output matches it exactly rather than to within rounding.
+    """
+
+    def __init__(self, period: int):
+        super().__init__()
+        if period <= 0:
+            raise ValueError("Period must be positive")
+        self.period = period
+        self._window = deque()
+        self._nobs = 0
+        self._sum = 0.0
+        self._negatives = 0
+        self._compensation_add = 0.0
+        self._compensation_remove = 0.0
+        self._same_value_run = 0
+        self._previous = math.nan
+
+    def _update(self, close: float) -> float:
+        # pandas rebuilds a one-bar window from scratch every time
+        if self.period == 1:
+            self._window.clear()
+            self._nobs = self._negatives = self._same_value_run = 0
+            self._sum = self._compensation_add = self._compensation_remove = 0.0
+            self._previous = math.nan
+
+        if len(self._window) == self.period:
+            self._remove(self._window.popleft())
+        self._window.append(close)
+        self._add(close)
+
+        if self._nobs < self.period or self._nobs == 0:
+            return math.nan
+        result = self._sum / self._nobs
+        if self._same_value_run >= self._nobs:
+            result = self._previous
+        elif self._negatives == 0 and result < 0:
+            result = 0.0
+        elif self._negatives == self._nobs and result > 0:
+            result = 0.0
+        return result
+
+    def _add(self, value: float):
+        if value != value:
+            return
+        self._nobs += 1
+        y = value - self._compensation_add
+        t = self._sum + y
+        self._compensation_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._negatives += 1
+        if value == self._previous:
+            self._same_value_run += 1
+        else:
+            self._same_value_run = 1
+        self._previous = value
+
+    def _remove(self, value: float):
+        if value != value:
+            return
+        self._nobs -= 1
+        y = -value - self._compensation_remove
+        t = self._sum + y
+        self._compensation_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._negatives -= 1
+
+
+class _EWMState:
+    """One adjust=False exponential mean, updated the way pandas' ewm does"""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.weighted = math.nan
+        self.old_weight = 1.0
+        self.nobs = 0
+        self.started = False
+
+    def update(self, value: float) -> float:
+        is_observation = value == value
+
+        if not self.started:
+            self.started = True
+            self.weighted = value
+            self.nobs = int(is_observation)
+        else:
+            self.nobs += int(is_observation)
+            if self.weighted == self.weighted:
+                self.old_weight *= 1.0 - self.alpha
+                if is_observation:
+                    if self.weighted != value:
+                        self.weighted = self.old_weight * self.weighted + self.alpha * value
+                        self.weighted /= self.old_weight + self.alpha
+                    self.old_weight = 1.0
+            elif is_observation:
+                self.weighted = value
+
+        return self.weighted if self.nobs >= 1 else math.nan
+
+
+class StreamingEMA(IndicatorStream):
+    """Exponential moving average, O(1) state"""
+
+    def __init__(self, period: int):
+        super().__init__()
+        if period <= 0:
+            raise ValueError("Period must be positive")
+        self.period = period
+        self._ewm = _EWMState(_ewm_alpha(span=period))
+
+    def _update(self, close: float) -> float:
+        return self._ewm.update(close)
+
+
+class StreamingRSI(IndicatorStream):
+    """Wilder-smoothed RSI, O(1) state"""
+
+    def __init__(self, period: int):
+        super().__init__()
+        if period <= 0:
+            raise ValueError("Period must be positive")
+        self.period = period
+        self._gains = _EWMState(_ewm_alpha(alpha=1 / period))
+        self._losses = _EWMState(_ewm_alpha(alpha=1 / period))
+        self._previous_close = math.nan
+        self._count = 0
+
+    def _update(self, close: float) -> float:
+        difference = close - self._previous_close
+        self._previous_close = close
+        self._count += 1
+
+        if difference != difference:
+            gain = loss = math.nan
+        else:
+            gain = difference if difference >= 0 else 0.0
+            loss = -(difference if difference <= 0 else 0.0)
+        avg_gain = self._gains.update(gain)
+        avg_loss = self._losses.update(loss)
+
+        # The first `period` values are blanked out, same as RSI.compute
+        if self._count <= self.period:
+            return math.nan
+        if avg_loss == 0 or avg_gain != avg_gain or avg_loss != avg_loss:
+            return math.nan
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+class StreamingMACDLine(IndicatorStream):
+    def __init__(self, short_period: int = 12, long_period: int = 26):
+        super().__init__()
+        self.indicator = MACDLine(short_period, long_period)
+        self._short = StreamingEMA(short_period)
+        self._long = StreamingEMA(long_period)
+
+    def _update(self, close: float) -> float:
+        return self._short.update(close) - self._long.update(close)
+
+
+class StreamingMACDSignal(IndicatorStream):
+    def __init__(self, short_period: int = 12, long_period: int = 26, signal_period: int = 9):
+        super().__init__()
+        self.indicator = MACDSignal(short_period, long_period, signal_period)
+        self.macd_line = StreamingMACDLine(short_period, long_period)
+        self._signal = _EWMState(_ewm_alpha(span=signal_period))
+
+    def _update(self, close: float) -> float:
+        return self._signal.update(self.macd_line.update(close))
+
+
+class StreamingMACDHistogram(IndicatorStream):
+    def __init__(self, short_period: int = 12, long_period: int = 26, signal_period: int = 9):
+        super().__init__()
+        self.indicator = MACDHistogram(short_period, long_period, signal_period)
+        self.macd_signal = StreamingMACDSignal(
+            short_period, long_period, signal_period)
+
+    def _update(self, close: float) -> float:
+        signal = self.macd_signal.update(close)
+        return self.macd_signal.macd_line.value - signal
+
+
+def create_stream(indicator: Indicator) -> IndicatorStream:
+    """Build the streaming version of a batch indicator"""
+    if isinstance(indicator, SMA):
+        return StreamingSMA(indicator.period)
+    if isinstance(indicator, EMA):
+        return StreamingEMA(indicator.period)
+    if isinstance(indicator, RSI):
+        return StreamingRSI(indicator.period)
+    if isinstance(indicator, MACDLine):
+        return StreamingMACDLine(indicator.short_period, indicator.long_period)
+    if isinstance(indicator, MACDSignal):
+        return StreamingMACDSignal(indicator.short_period, indicator.long_period,
+                                   indicator.signal_period)
+    if isinstance(indicator, MACDHistogram):
+        return StreamingMACDHistogram(indicator.short_period, indicator.long_period,
+                                      indicator.signal_period)
+    raise ValueError(f"No streaming implementation for {indicator}")
+
+
+def _close(bar) -> float:
+    if isinstance(bar, numbers.Real):
+        return float(bar)
+    try:
+        return float(bar['Close'])
+    except (KeyError, TypeError, IndexError):
+        raise ValueError("Bar must be a close price or have a 'Close' field")
@@ -0,0 +1,203 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.back_testing import BackTest, equity_metrics, position_bar_returns, trade_positions
+from src.main import MarketData, aligned_signal, pack_signals, unpack_signals
+from src.optimization import ParameterSweep, prime_indicators
+
+
+# Full-series arrays for pool workers, set once per process by _init_worker
+_worker_state: Dict = {}
+
+
+def _init_worker(prices: np.ndarray, buy: np.ndarray, sell: np.ndarray, packed: bool,
+                 initial_capital: float):
+    _worker_state.update(prices=prices, buy=buy, sell=sell, packed=packed,
+                         backtest=BackTest(initial_capital=initial_capital))
+
+
+def _signal_slice(signals: np.ndarray, start: int, end: int, packed: bool) -> np.ndarray:
+    return unpack_signals(signals, start, end) if packed else signals[..., start:end]
+
+
+def _evaluate_window(prices: np.ndarray, buy: np.ndarray, sell: np.ndarray, packed: bool,
+                     backtest: BackTest, window: Tuple[int, int, int], sort_by: str,
+                     ascending: bool) -> Dict:
+    """Pick the best combination in-sample and measure it out-of-sample.
+
+    Every slice here is a view of the full-series arrays, so no prices or
+    signals are copied per window or per combination. Packed signals are
+    unpacked for one window at a time.
+    """
+    start, split, end = window
+    in_sample_prices = prices[start:split]
+    in_sample_buy = _signal_slice(buy, start, split, packed)
+    in_sample_sell = _signal_slice(sell, start, split, packed)
+    scores = np.array([
+        backtest._array_metrics(in_sample_prices, *trade_positions(
+            in_sample_buy[combo], in_sample_sell[combo]))[sort_by]
+        for combo in range(len(buy))
+    ], dtype=float)
+
+    # First combination wins ties, matching ParameterSweep's stable sort
+    best = int(np.argmin(scores) if ascending else np.argmax(scores))
+
+    oos_prices = prices[split:end]
+    entries, exits = trade_positions(_signal_slice(buy[best], split, end, packed),
+                                     _signal_slice(sell[best], split, end, packed))
+    bar_returns, held = position_bar_returns(oos_prices, entries, exits)
+    return {
+        'best': best,
+        'in_sample_score': float(scores[best]),
+        'metrics': backtest._array_metrics(oos_prices, entries, exits),
+        'trade_returns': (oos_prices[exits] - oos_prices[entries]) / oos_prices[entries],
+        'bar_returns': bar_returns,
+        'held': held
+    }
+
+
+def _run_window(window: Tuple[int, int, int], sort_by: str, ascending: bool) -> Dict:
+    return _evaluate_window(_worker_state['prices'], _worker_state['buy'], _worker_state['sell'],
+                            _worker_state['packed'], _worker_state['backtest'], window,
+                            sort_by, ascending)
+
+
+class WalkForward:
+    """Walk-forward optimization of one strategy class over a single MarketData.
+
+    The history is split into consecutive windows of `in_sample` bars
+    followed by `out_of_sample` bars, moving forward `step` bars at a time
+    (default: the out-of-sample length, so test periods don't overlap).
+    With anchored=True every in-sample period starts at the first bar.
+    Parameters are chosen by `sort_by` on each in-sample period and then
+    traded on the out-of-sample period that follows it.
+
+    Signals for every grid combination are computed once on the full
+    series, so indicators have their full warm-up history. Windows then
+    only slice those arrays, and are spread over `max_workers` processes.
+    Each window starts flat, and positions still open at its end are
+    dropped, as in a standalone backtest. For compact MarketData the
+    (combinations x bars) signal matrices are kept bit-packed.
+    """
+
+    def __init__(self, strategy_cls, param_grid: Dict[str, List], in_sample: int,
+                 out_of_sample: int, step: Optional[int] = None, anchored: bool = False,
+                 initial_capital: float = 10000, sort_by: str = 'total_return',
+                 ascending: bool = False, max_workers: Optional[int] = None):
+        if in_sample <= 0 or out_of_sample <= 0:
+            raise ValueError("Window lengths must be positive")
+        if step is not None and step <= 0:
+            raise ValueError("Step must be positive")
+
+        self.sweep = ParameterSweep(strategy_cls, param_grid, initial_capital, sort_by, ascending)
+        if sort_by not in self.sweep.backtest._array_metrics(np.empty(0), np.empty(0, dtype=int),
+                                                             np.empty(0, dtype=int)):
+            raise ValueError(f"Cannot sort by unknown metric '{sort_by}'")
+
+        self.in_sample = in_sample
+        self.out_of_sample = out_of_sample
+        self.step = step or out_of_sample
+        self.anchored = anchored
+        self.initial_capital = initial_capital
+        self.sort_by = sort_by
+        self.ascending = ascending
+        self.max_workers = max_workers
+
+    def windows(self, n_bars: int) -> List[Tuple[int, int, int]]:
+        """(in-sample start, out-of-sample start, out-of-sample end) bar positions"""
+        windows = []
+        split = self.in_sample
+        while split < n_bars:
+            start = 0 if self.anchored else split - self.in_sample
+            windows.append((start, split, min(split + self.out_of_sample, n_bars)))
+            split += self.step
+        return windows
+
+    def _signal_matrices(self, market_data: MarketData, strategies: List,
+                         packed: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        index = market_data.get_raw_data().index
+        # Packed rows hold 8 bars per byte
+        width, dtype = (-(-len(index) // 8), np.uint8) if packed else (len(index), bool)
+        buy = np.empty((len(strategies), width), dtype=dtype)
+        sell = np.empty((len(strategies), width), dtype=dtype)
+
+        for row, (params, strategy) in enumerate(strategies):
+            try:
+                signals = strategy.calculate_signals(market_data)
+            except Exception as e:
+                raise ValueError(f"Error running {self.sweep.strategy_cls.__name__}({params}): {e}")
+            buy_row = aligned_signal(signals['buy'], index)
+            sell_row = aligned_signal(signals['sell'], index)
+            buy[row] = pack_signals(buy_row) if packed else buy_row
+            sell[row] = pack_signals(sell_row) if packed else sell_row
+
+        return buy, sell
+
+    def _map_windows(self, prices: np.ndarray, buy: np.ndarray, sell: np.ndarray, packed: bool,
+                     windows: List[Tuple[int, int, int]]) -> List[Dict]:
+        max_workers = min(self.max_workers or os.cpu_count() or 1, len(windows))
+        if max_workers == 1:
+            backtest = BackTest(initial_capital=self.initial_capital)
+            return [_evaluate_window(prices, buy, sell, packed, backtest, window,
+                                     self.sort_by, self.ascending) for window in windows]
+
+        # The full arrays go to each worker once; jobs are just window bounds
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(prices, buy, sell, packed,
+                                           self.initial_capital)) as executor:
+            return list(executor.map(_run_window, windows,
+                                     [self.sort_by] * len(windows),
+                                     [self.ascending] * len(windows)))
+
+    def run(self, market_data: MarketData) -> Dict:
+        """Per-window choices and results, plus metrics over all out-of-sample trades"""
+        strategies = self.sweep.build_strategies()
+        if not strategies:
+            raise ValueError("No valid parameter combinations in the grid")
+
+        prime_indicators(market_data, [strategy for _, strategy in strategies])
+        close = market_data.get_raw_data()['Close']
+        windows = self.windows(len(close))
+        if not windows:
+            raise ValueError("Not enough data for one in-sample and out-of-sample window")
+
+        prices = close.to_numpy(dtype=np.float64)
+        packed = market_data.compact
+        buy, sell = self._signal_matrices(market_data, strategies, packed)
+        results = self._map_windows(prices, buy, sell, packed, windows)
+
+        index = close.index
+        rows = []
+        for (start, split, end), result in zip(windows, results):
+            rows.append({
+                'in_sample_start': index[start],
+                'in_sample_end': index[split - 1],
+                'out_of_sample_start': index[split],
+                'out_of_sample_end': index[end - 1],
+                **strategies[result['best']][0],
+                f'in_sample_{self.sort_by}': result['in_sample_score'],
+                **{f'oos_{name}': value for name, value in result['metrics'].items()}
+            })
+
+        return {
+            'windows': pd.DataFrame(rows),
+            'out_of_sample': self._combined_metrics(results)
+        }
+
+    def _combined_metrics(self, results: List[Dict]) -> Dict:
+        """Metrics of the out-of-sample periods chained together.
+
+        With step < out_of_sample the periods overlap, and overlapping bars
+        are counted once per window.
+        """
+        backtest = BackTest(initial_capital=self.initial_capital)
+        metrics = backtest._returns_metrics(
+            np.concatenate([result['trade_returns'] for result in results]))
+
+        bar_returns = np.concatenate([result['bar_returns'] for result in results])
+        held = np.concatenate([result['held'] for result in results])
+        equity = self.initial_capital * np.cumprod(np.concatenate(([1.0], 1 + bar_returns)))
+        metrics.update(equity_metrics(equity), exposure=float(held.mean()) if len(held) else 0.0)
+        return metrics
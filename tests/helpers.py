@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+
+def make_prices(periods=300, seed=7, start='2020-01-01', tz=None, volatility=0.01,
+                cents=False):
+    """Synthetic daily OHLCV on business days.
+
+    The default is a continuous geometric random walk. With cents=True the
+    close moves in whole cents, often not at all, and has a few flat
+    stretches: like real quotes it is full of exact ties, which is where
+    floating point differences between indicator implementations change
+    crossovers.
+    """
+    rng = np.random.default_rng(seed)
+    if cents:
+        steps = rng.choice([-3, -2, -1, 0, 0, 0, 1, 2, 3], size=periods)
+        for start_bar in rng.integers(0, max(periods - 20, 1), size=periods // 200 + 1):
+            steps[start_bar:start_bar + 15] = 0
+        close = np.maximum(10000 + np.cumsum(steps), 100) / 100
+    else:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, volatility, periods)))
+
+    return pd.DataFrame({
+        'Open': close,
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1000, 5000, periods).astype(float)
+    }, index=pd.date_range(start=start, periods=periods, freq='B', tz=tz))
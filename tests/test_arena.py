@@ -0,0 +1,122 @@
+import gc
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+import pandas as pd
+from src.arena import ArenaStore, map_arena, write_arena
+from src.main import MarketData
+from tests.helpers import make_prices
+
+
+def is_mapped(values: np.ndarray) -> bool:
+    while values is not None:
+        if isinstance(values, mmap.mmap):
+            return True
+        values = values.obj if isinstance(values, memoryview) else values.base
+    return False
+
+
+def open_files_in(directory: str) -> int:
+    fd_directory = '/proc/self/fd'
+    count = 0
+    for fd in os.listdir(fd_directory):
+        try:
+            target = os.readlink(os.path.join(fd_directory, fd))
+        except OSError:
+            continue
+        count += target.startswith(os.path.realpath(directory))
+    return count
+
+
+class TestArena(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.data = make_prices(tz='America/New_York')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        path = os.path.join(self.directory, 'AAPL.arena')
+        write_arena(path, self.data.assign(Name='Apple'), {'updated_at': '2024-01-01'})
+
+        data, metadata = map_arena(path)
+
+        expected = self.data.astype(np.float64)
+        expected.index = expected.index.as_unit('ns')
+        pd.testing.assert_frame_equal(data, expected, check_freq=False)
+        self.assertEqual(metadata, {'updated_at': '2024-01-01'})
+
+    def test_frames_are_read_only_views_of_the_file(self):
+        store = ArenaStore(self.directory)
+        store.save('aapl', self.data, {})
+
+        data = store.load('AAPL')
+
+        for column in data.columns:
+            values = data[column].to_numpy()
+            self.assertTrue(is_mapped(values))
+            self.assertFalse(values.flags.writeable)
+        self.assertIs(store.load('AAPL'), data)
+
+    def test_replaced_file_is_remapped(self):
+        store = ArenaStore(self.directory)
+        store.save('AAPL', self.data, {'version': 1})
+        old = store.load('AAPL')
+
+        store.save('AAPL', self.data.iloc[:10], {'version': 2})
+
+        self.assertEqual(len(store.load('AAPL')), 10)
+        self.assertEqual(store.load_metadata('AAPL'), {'version': 2})
+        # Frames from the old mapping still read the old file
+        self.assertEqual(len(old), len(self.data))
+        self.assertEqual(old['Close'].iloc[-1], self.data['Close'].iloc[-1])
+
+    @unittest.skipUnless(os.path.isdir('/proc/self/fd'), "needs /proc")
+    def test_mappings_are_bounded(self):
+        store = ArenaStore(self.directory, max_mapped=3)
+        for number in range(10):
+            store.save(f"T{number}", self.data, {})
+
+        kept = store.load('T0')
+        for number in range(1, 10):
+            self.assertEqual(len(store.load(f"T{number}")), len(self.data))
+        gc.collect()
+
+        self.assertEqual(len(store._mapped), 3)
+        # The three cached mappings, plus T0's while its frame is in use
+        self.assertLessEqual(open_files_in(self.directory), 4)
+        self.assertEqual(kept['Close'].iloc[-1], self.data['Close'].iloc[-1])
+        with self.assertRaises(ValueError):
+            ArenaStore(self.directory, max_mapped=0)
+
+    def test_missing_and_invalid_files(self):
+        store = ArenaStore(self.directory)
+        self.assertIsNone(store.load('MSFT'))
+        self.assertEqual(store.load_metadata('MSFT'), {})
+
+        with open(os.path.join(self.directory, 'MSFT.arena'), 'wb') as f:
+            f.write(b'not an arena')
+        with self.assertRaises(ValueError):
+            store.load('MSFT')
+
+    @patch('yfinance.Ticker')
+    def test_market_data_reads_through_arena(self, mock_ticker):
+        mock_ticker.return_value = MagicMock(
+            history=MagicMock(return_value=make_prices(tz=None)))
+        store = ArenaStore(self.directory)
+
+        MarketData('AAPL', 'max', store=store)
+        market_data = MarketData('AAPL', 'max', store=store, offline=True)
+
+        self.assertEqual(mock_ticker.call_count, 1)
+        self.assertTrue(is_mapped(market_data.get_raw_data()['Close'].to_numpy()))
+        self.assertEqual(len(market_data.get_raw_data()), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
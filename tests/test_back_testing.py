@@ -0,0 +1,121 @@
+import unittest
+import pandas as pd
+import numpy as np
+from src.back_testing import BackTest
+from tests.helpers import make_prices
+
+
+def random_signals(prices, density, seed):
+    rng = np.random.default_rng(seed)
+    return {
+        'buy': pd.Series(rng.random(len(prices)) < density, index=prices.index),
+        'sell': pd.Series(rng.random(len(prices)) < density, index=prices.index)
+    }
+
+
+class TestTradeEngines(unittest.TestCase):
+    def setUp(self):
+        self.prices = make_prices(periods=1000, seed=11, start='2015-01-01',
+                                  tz='America/New_York')['Close']
+
+    def assert_engines_agree(self, signals, prices=None):
+        prices = self.prices if prices is None else prices
+        loop = BackTest(engine='loop')._generate_trades(signals, prices)
+        vectorized = BackTest(engine='vectorized')._generate_trades(signals, prices)
+        pd.testing.assert_frame_equal(vectorized, loop)
+        return vectorized
+
+    def test_engines_agree_on_random_signals(self):
+        for seed, density in enumerate([0.01, 0.05, 0.3, 0.9]):
+            self.assert_engines_agree(random_signals(self.prices, density, seed))
+
+    def test_buy_and_sell_on_same_bar(self):
+        signals = {
+            'buy': pd.Series(True, index=self.prices.index),
+            'sell': pd.Series(True, index=self.prices.index)
+        }
+
+        trades = self.assert_engines_agree(signals)
+
+        # Enter on one bar, exit on the next, re-enter on the one after
+        self.assertEqual(len(trades), len(self.prices) // 2)
+
+    def test_open_position_is_not_a_trade(self):
+        buy = pd.Series(False, index=self.prices.index)
+        buy.iloc[10] = True
+
+        trades = self.assert_engines_agree(
+            {'buy': buy, 'sell': pd.Series(False, index=self.prices.index)})
+
+        self.assertTrue(trades.empty)
+
+    def test_signals_on_a_shorter_index(self):
+        signals = random_signals(self.prices.iloc[100:], 0.05, 3)
+
+        self.assert_engines_agree(signals)
+
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            BackTest(engine='numba')
+
+
+class TestEquityCurve(unittest.TestCase):
+    def setUp(self):
+        self.prices = make_prices(periods=1000, seed=11, start='2015-01-01',
+                                  tz='America/New_York')['Close']
+        self.backtest = BackTest(initial_capital=10000)
+        self.trades = self.backtest._generate_trades(random_signals(self.prices, 0.05, 3), self.prices)
+
+    def test_curve_ends_at_final_capital(self):
+        equity = self.backtest.equity_curve(self.trades, self.prices)
+        metrics = self.backtest._calculate_metrics(self.trades, self.prices)
+
+        self.assertEqual(len(equity), len(self.prices))
+        self.assertEqual(equity.iloc[0], 10000)
+        self.assertAlmostEqual(equity.iloc[-1], metrics['final_capital'], places=6)
+
+    def test_curve_moves_only_while_in_a_trade(self):
+        equity = self.backtest.equity_curve(self.trades, self.prices).to_numpy()
+
+        held = np.zeros(len(self.prices), dtype=bool)
+        for entry, exit_ in zip(self.prices.index.get_indexer(self.trades['entry_date']),
+                                self.prices.index.get_indexer(self.trades['exit_date'])):
+            held[entry + 1:exit_ + 1] = True
+        np.testing.assert_array_equal(np.diff(equity)[~held[1:]], 0)
+        self.assertTrue((np.diff(equity)[held[1:]] != 0).all())
+
+    def test_drawdown_includes_moves_inside_trades(self):
+        index = pd.date_range('2024-01-01', periods=5, freq='B')
+        prices = pd.Series([100.0, 100.0, 50.0, 100.0, 110.0], index=index)
+        trades = pd.DataFrame({'entry_date': [index[0]], 'exit_date': [index[4]],
+                               'return': [0.1]})
+
+        metrics = self.backtest._calculate_metrics(trades, prices)
+
+        # The single trade made money, but halved along the way
+        self.assertAlmostEqual(metrics['max_drawdown'], -0.5)
+        self.assertAlmostEqual(metrics['exposure'], 1.0)
+        self.assertAlmostEqual(self.backtest._returns_metrics(np.array([0.1]))['max_drawdown'], 0.0)
+
+    def test_risk_metrics(self):
+        metrics = self.backtest._calculate_metrics(self.trades, self.prices)
+        returns = self.backtest.equity_curve(self.trades, self.prices).pct_change().dropna()
+
+        self.assertAlmostEqual(metrics['sharpe_ratio'], returns.mean() / returns.std() * np.sqrt(252))
+        downside = np.sqrt((returns.clip(upper=0) ** 2).mean())
+        self.assertAlmostEqual(metrics['sortino_ratio'], returns.mean() / downside * np.sqrt(252))
+        self.assertAlmostEqual(metrics['calmar_ratio'],
+                               metrics['annualized_return'] / -metrics['max_drawdown'])
+        self.assertTrue(0 < metrics['exposure'] < 1)
+
+    def test_no_trades(self):
+        metrics = self.backtest._calculate_metrics(pd.DataFrame([]), self.prices)
+
+        self.assertEqual(metrics['max_drawdown'], 0.0)
+        self.assertEqual(metrics['sharpe_ratio'], 0.0)
+        self.assertEqual(metrics['exposure'], 0.0)
+        self.assertEqual(metrics['final_capital'], 10000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from backend import run
+from backend.models import BacktestRequest, BatchBacktestRequest, StrategyConfig
+from tests.helpers import make_prices
+
+
+def make_request(ticker, lower_period=5, period='1y'):
+    return BacktestRequest(
+        ticker=ticker, period=period, initial_capital='10000', mode='any',
+        strategies=[StrategyConfig(type='moving_average_cross',
+                                   params={'lower_period': lower_period, 'upper_period': 20,
+                                           'ma_type': 'SMA'})])
+
+
+class TestBatchBacktest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.data = pd.DataFrame(
+            {'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))},
+            index=pd.date_range('2024-01-01', periods=300, freq='B'))
+        run.market_data_pool.clear()
+        run.result_cache.clear()
+
+    def tearDown(self):
+        run.market_data_pool.clear()
+        run.result_cache.clear()
+
+    @patch('yfinance.Ticker')
+    def test_each_dataset_is_loaded_once(self, mock_ticker):
+        mock_ticker.return_value.history.return_value = self.data
+        batch = BatchBacktestRequest(requests=[
+            make_request('AAA', 5), make_request('aaa', 8), make_request('BBB', 5)])
+
+        results = run.run_backtest_batch(batch)
+
+        self.assertEqual(mock_ticker.return_value.history.call_count, 2)
+        self.assertEqual([r['index'] for r in results], [0, 1, 2])
+        self.assertTrue(all(r['error'] is None for r in results))
+        self.assertEqual(results[0]['metrics'], results[2]['metrics'])
+        self.assertEqual(results[0]['metrics'], run.run_backtest(make_request('AAA', 5)))
+
+    @patch('yfinance.Ticker')
+    def test_failures_are_reported_per_item(self, mock_ticker):
+        def history(**kwargs):
+            if mock_ticker.call_args[0][0] == 'BAD':
+                return pd.DataFrame()
+            return self.data
+
+        mock_ticker.return_value.history.side_effect = history
+        batch = BatchBacktestRequest(requests=[
+            make_request('BAD'), make_request('AAA'), make_request('AAA', lower_period=30)])
+
+        results = run.run_backtest_batch(batch)
+
+        self.assertIsNotNone(results[0]['error'])
+        self.assertIsNone(results[0]['metrics'])
+        self.assertIsNone(results[1]['error'])
+        self.assertIn('lower', results[2]['error'].lower())
+
+    @patch('yfinance.Ticker')
+    def test_batch_priming_does_not_change_later_results(self, mock_ticker):
+        # Cent prices are full of ties, where an indicator that is off in
+        # the last bit flips crossovers
+        data = make_prices(periods=600, seed=4, cents=True)
+        mock_ticker.return_value.history.return_value = data
+        requests = [make_request('AAA', lower_period) for lower_period in range(2, 20)]
+
+        run.run_backtest_batch(BatchBacktestRequest(requests=requests))
+        run.result_cache.clear()
+
+        for request in requests:
+            # The pooled data now holds the batch-computed indicators
+            pooled = run.run_backtest(request)
+            run.result_cache.clear()
+            self.assertEqual(pooled, run.run_backtest_on_frame(request, data))
+            run.result_cache.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
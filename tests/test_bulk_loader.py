@@ -0,0 +1,154 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+from src.bulk_loader import BulkLoader, RateLimiter, ThrottledSource
+from src.sources import CsvHttpSource, DataSource, SourceUnavailable
+from src.storage import MemoryStore
+
+
+def make_csv(periods=300):
+    index = pd.date_range(pd.Timestamp.now().normalize() - pd.Timedelta(days=430),
+                          periods=periods, freq='B', name='Date')
+    close = np.linspace(100, 200, periods)
+    frame = pd.DataFrame({'Open': close - 1, 'High': close + 1, 'Low': close - 2,
+                          'Close': close, 'Volume': np.arange(periods) * 100}, index=index)
+    return frame.to_csv()
+
+
+class FakePriceServer:
+    """Serves /<TICKER>.csv, with a few tickers rate limited on first request"""
+
+    def __init__(self, tickers, throttled=()):
+        self.requests = []
+        self.clients = set()
+        self.throttled = set(throttled)
+        body = make_csv().encode()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                ticker = url.path.strip('/').split('.')[0]
+                server.requests.append((ticker, parse_qs(url.query)))
+                server.clients.add(self.client_address)
+
+                if ticker in server.throttled:
+                    server.throttled.discard(ticker)
+                    self._reply(429, b'slow down', {'Retry-After': '0'})
+                elif ticker in tickers:
+                    self._reply(200, body, {'Content-Type': 'text/csv'})
+                else:
+                    self._reply(404, b'not found')
+
+            def _reply(self, status, payload, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FlakySource(DataSource):
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def history(self, ticker, period=None, start=None):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return pd.DataFrame({'Close': [1.0]}, index=pd.date_range('2024-01-01', periods=1))
+
+
+class TestBulkLoader(unittest.TestCase):
+    def setUp(self):
+        self.server = FakePriceServer(['AAPL', 'MSFT', 'SPY', 'QQQ'], throttled=['MSFT'])
+
+    def tearDown(self):
+        self.server.close()
+
+    def test_populates_store_in_one_pass(self):
+        store = MemoryStore()
+        loader = BulkLoader(CsvHttpSource(self.server.url), store=store,
+                            max_workers=4, backoff=0)
+
+        result = loader.load(['aapl', 'MSFT', 'spy', 'QQQ', 'NOPE', 'AAPL'], '1y')
+
+        self.assertEqual(sorted(result['data']), ['AAPL', 'MSFT', 'QQQ', 'SPY'])
+        self.assertEqual(list(result['errors']), ['NOPE'])
+        for ticker in ['AAPL', 'MSFT', 'QQQ', 'SPY']:
+            self.assertEqual(len(store.load(ticker)), 300)
+            self.assertIn('updated_at', store.load_metadata(ticker))
+        # Every ticker once, plus the retry after MSFT's 429
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertEqual(self.server.requests[0][1], {'period': ['1y']})
+
+        # Fresh stored history means nothing is downloaded again
+        again = loader.load(['AAPL', 'SPY'], '1y', keep_data=False)
+        self.assertEqual(again, {'data': {}, 'errors': {}})
+        self.assertEqual(len(self.server.requests), 6)
+
+    def test_connections_are_reused(self):
+        loader = BulkLoader(CsvHttpSource(self.server.url), max_workers=1, backoff=0)
+
+        loader.load(['AAPL', 'SPY', 'QQQ'], '1y')
+
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(len(self.server.clients), 1)
+
+
+class TestThrottling(unittest.TestCase):
+    def test_rate_limiter_spaces_calls(self):
+        limiter = RateLimiter(rate=50, burst=1)
+
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - started, 5 / 50 * 0.9)
+
+    def test_transient_errors_are_retried(self):
+        source = FlakySource(2, SourceUnavailable("429", retry_after=0))
+
+        data = ThrottledSource(source, retries=2, backoff=0).history('AAPL', period='1y')
+
+        self.assertEqual(len(data), 1)
+        self.assertEqual(source.calls, 3)
+
+    def test_gives_up_after_retries(self):
+        source = FlakySource(5, ConnectionError("reset"))
+
+        with self.assertRaises(ConnectionError):
+            ThrottledSource(source, retries=2, backoff=0).history('AAPL', period='1y')
+        self.assertEqual(source.calls, 3)
+
+    def test_bad_requests_are_not_retried(self):
+        source = FlakySource(5, ValueError("Unsupported period"))
+
+        with self.assertRaises(ValueError):
+            ThrottledSource(source, retries=2, backoff=0).history('AAPL', period='1y')
+        self.assertEqual(source.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
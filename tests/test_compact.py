@@ -0,0 +1,72 @@
+import unittest
+import pandas as pd
+import numpy as np
+from src.back_testing import BackTest
+from src.main import MarketData, pack_signals, unpack_signals
+from src.strategies import MACDCross, MovingAverageCross
+from src.walk_forward import WalkForward
+from tests.helpers import make_prices
+
+
+class TestCompactMode(unittest.TestCase):
+    def setUp(self):
+        self.data = make_prices(periods=600, seed=5)
+        self.full = MarketData('TEST', '5y', raw_data=self.data)
+        self.compact = MarketData('TEST', '5y', raw_data=self.data, compact=True)
+
+    def test_prices_and_indicators_are_float32_on_one_index(self):
+        raw = self.compact.get_raw_data()
+        self.assertTrue((raw.dtypes == np.float32).all())
+        self.assertEqual(self.compact.arrays()['Close'].dtype, np.float32)
+
+        macd = MACDCross()
+        for indicator in macd.get_required_indicators():
+            values = self.compact.get_indicator_data(indicator)
+            self.assertEqual(values.dtype, np.float32)
+            self.assertIs(values.index, raw.index)
+
+    def test_results_stay_close_to_full_precision(self):
+        for strategy in [MovingAverageCross(10, 50), MACDCross()]:
+            full = BackTest().run_backtest(self.full, strategy)['metrics']
+            compact = BackTest().run_backtest(self.compact, strategy)['metrics']
+
+            self.assertEqual(full['total_trades'], compact['total_trades'])
+            self.assertAlmostEqual(full['total_return'], compact['total_return'], places=5)
+
+    def test_memory_report(self):
+        for market_data in [self.full, self.compact]:
+            BackTest().run_backtest(market_data, MACDCross())
+
+        full = self.full.memory_report()
+        compact = self.compact.memory_report()
+
+        self.assertEqual(full['saved_bytes'], 0)
+        self.assertEqual(compact['float64_bytes'], full['total_bytes'])
+        self.assertEqual(compact['indicator_bytes'] * 2, full['indicator_bytes'])
+        self.assertEqual(compact['saved_bytes'], full['total_bytes'] - compact['total_bytes'])
+        self.assertGreater(compact['saved_ratio'], 0)
+
+    def test_packed_signals_round_trip(self):
+        signals = np.random.default_rng(1).random((3, 101)) > 0.5
+        packed = pack_signals(signals)
+
+        self.assertEqual(packed.shape, (3, 13))
+        for start, end in [(0, 101), (3, 17), (8, 16), (99, 101), (5, 5)]:
+            np.testing.assert_array_equal(unpack_signals(packed, start, end), signals[:, start:end])
+
+    def test_walk_forward_with_packed_signals(self):
+        walk_forward = WalkForward(MovingAverageCross, {'lower_period': [5, 10],
+                                                        'upper_period': [20, 40]},
+                                   in_sample=200, out_of_sample=100, max_workers=1)
+
+        full = walk_forward.run(self.full)
+        compact = walk_forward.run(self.compact)
+
+        pd.testing.assert_frame_equal(full['windows'][['lower_period', 'upper_period']],
+                                      compact['windows'][['lower_period', 'upper_period']])
+        self.assertAlmostEqual(full['out_of_sample']['total_return'],
+                               compact['out_of_sample']['total_return'], places=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
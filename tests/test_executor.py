@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+import unittest
+from backend.executor import BacktestExecutor, ExecutorBusy
+
+
+def slow_load(value):
+    time.sleep(0.2)
+    return value * 2
+
+
+def add_one(value, loaded):
+    return loaded + 1
+
+
+class TestBacktestExecutor(unittest.TestCase):
+    def test_runs_load_then_compute(self):
+        executor = BacktestExecutor(io_workers=2, compute_workers=2)
+
+        result = asyncio.run(executor.run(slow_load, add_one, 5))
+
+        self.assertEqual(result, 11)
+        executor.shutdown()
+
+    def test_event_loop_stays_responsive(self):
+        executor = BacktestExecutor(io_workers=2, compute_workers=2)
+
+        async def scenario():
+            backtest = asyncio.create_task(executor.run(slow_load, add_one, 1))
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            responsive_after = time.perf_counter() - started
+            await backtest
+            return responsive_after
+
+        self.assertLess(asyncio.run(scenario()), 0.1)
+        executor.shutdown()
+
+    def test_rejects_when_queue_is_full(self):
+        executor = BacktestExecutor(io_workers=1, compute_workers=1, max_queued=1)
+
+        async def scenario():
+            tasks = [asyncio.create_task(executor.run(slow_load, add_one, i))
+                     for i in range(2)]
+            await asyncio.sleep(0)
+            with self.assertRaises(ExecutorBusy):
+                await executor.run(slow_load, add_one, 99)
+            return await asyncio.gather(*tasks)
+
+        self.assertEqual(asyncio.run(scenario()), [1, 3])
+        self.assertEqual(executor.in_flight, 0)
+        executor.shutdown()
+
+    def test_concurrency_is_bounded(self):
+        executor = BacktestExecutor(io_workers=2, compute_workers=1, max_queued=10)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def tracked_load(value):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return value
+
+        async def scenario():
+            await asyncio.gather(*(executor.run(tracked_load, add_one, i) for i in range(6)))
+
+        asyncio.run(scenario())
+        self.assertEqual(peak[0], 2)
+        executor.shutdown()
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            BacktestExecutor(compute_mode='gpu')
+        with self.assertRaises(ValueError):
+            BacktestExecutor(io_workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import pandas as pd
+import numpy as np
+from src.cache import IndicatorCache
+
+
+def series(length=100):
+    return pd.Series(np.arange(length, dtype=float))
+
+
+class TestIndicatorCache(unittest.TestCase):
+    def setUp(self):
+        # 100 float64 values = 800 bytes per entry
+        self.entry_size = 800
+
+    def test_hit_and_miss_counters(self):
+        cache = IndicatorCache()
+
+        self.assertIsNone(cache.get("SMA_3"))
+        cache.put("SMA_3", series())
+        self.assertIsNotNone(cache.get("SMA_3"))
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['bytes_held'], self.entry_size)
+        self.assertIn("SMA_3", cache)
+
+    def test_lru_eviction(self):
+        cache = IndicatorCache(max_bytes=2 * self.entry_size, policy='lru')
+
+        cache.put("A", series())
+        cache.put("B", series())
+        cache.get("A")
+        cache.put("C", series())
+
+        self.assertIn("A", cache)
+        self.assertNotIn("B", cache)
+        self.assertIn("C", cache)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache.bytes_held, 2 * self.entry_size)
+
+    def test_lfu_eviction(self):
+        cache = IndicatorCache(max_bytes=2 * self.entry_size, policy='lfu')
+
+        cache.put("A", series())
+        cache.put("B", series())
+        cache.get("A")
+        cache.get("A")
+        cache.get("B")
+        cache.get("B")
+        cache.get("B")
+        cache.put("C", series())
+
+        self.assertNotIn("A", cache)
+        self.assertIn("B", cache)
+        self.assertIn("C", cache)
+
+    def test_entry_larger_than_budget_is_not_cached(self):
+        cache = IndicatorCache(max_bytes=self.entry_size // 2)
+
+        cache.put("A", series())
+
+        self.assertNotIn("A", cache)
+        self.assertEqual(cache.bytes_held, 0)
+
+    def test_replacing_entry_updates_bytes(self):
+        cache = IndicatorCache()
+
+        cache.put("A", series())
+        cache.put("A", series(50))
+
+        self.assertEqual(cache.bytes_held, self.entry_size // 2)
+        cache.clear()
+        self.assertEqual(cache.bytes_held, 0)
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            IndicatorCache(max_bytes=0)
+
+        with self.assertRaises(ValueError):
+            IndicatorCache(policy='fifo')
+
+
+if __name__ == '__main__':
+    unittest.main()
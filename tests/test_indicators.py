@@ -0,0 +1,183 @@
+import unittest
+import pandas as pd
+import numpy as np
+from unittest.mock import patch, MagicMock
+from src.indicators import SMA, EMA, RSI, MACDLine, MACDSignal, MACDHistogram
+from src.main import MarketData
+from src.strategies import CustomStrategy, MACDCross, MACDHistogramStrategy
+from src.streaming import create_stream, StreamingSMA, StreamingRSI
+from tests.helpers import make_prices
+
+
+class TestIndicatorDependencies(unittest.TestCase):
+    def setUp(self):
+        self.sample_data = make_prices()
+
+    def market_data(self, mock_ticker):
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = self.sample_data
+        mock_ticker.return_value = mock_ticker_instance
+        return MarketData("AAPL", "2y")
+
+    def test_composite_results_match_direct_formulas(self):
+        close = self.sample_data['Close']
+        line = (close.ewm(span=12, adjust=False).mean()
+                - close.ewm(span=26, adjust=False).mean())
+        signal = line.ewm(span=9, adjust=False).mean()
+
+        pd.testing.assert_series_equal(
+            MACDLine().compute(self.sample_data), line)
+        pd.testing.assert_series_equal(
+            MACDSignal().compute(self.sample_data), signal)
+        pd.testing.assert_series_equal(
+            MACDHistogram().compute(self.sample_data), line - signal)
+
+    def test_dependencies_are_declared(self):
+        self.assertEqual(MACDLine(12, 26).get_dependencies(), [EMA(12), EMA(26)])
+        self.assertEqual(MACDHistogram().get_dependencies(),
+                         [MACDLine(), MACDSignal()])
+
+    def test_standalone_histogram_computes_each_ema_once(self):
+        with patch.object(EMA, 'compute', autospec=True, side_effect=EMA.compute) as ema_compute:
+            MACDHistogram().compute(self.sample_data)
+
+        computed = sorted(str(call.args[0]) for call in ema_compute.call_args_list)
+        self.assertEqual(computed, ['EMA_12', 'EMA_26'])
+
+    @patch('yfinance.Ticker')
+    def test_shared_nodes_computed_once_per_dataset(self, mock_ticker):
+        market_data = self.market_data(mock_ticker)
+        custom_strategy = CustomStrategy(mode='any')
+        custom_strategy.add_strategy(MACDCross())
+        custom_strategy.add_strategy(MACDHistogramStrategy())
+
+        with patch.object(EMA, 'compute', autospec=True, side_effect=EMA.compute) as ema_compute:
+            custom_strategy.validate_data(market_data)
+            custom_strategy.calculate_signals(market_data)
+
+        self.assertEqual(ema_compute.call_count, 2)
+        for key in ['EMA_12', 'EMA_26', 'MACD_Line_12_26', 'MACD_Signal_12_26_9',
+                    'MACD_Histogram_12_26_9']:
+            self.assertIn(key, market_data._indicator_cache)
+
+    def test_validation_runs_before_dependencies(self):
+        with self.assertRaises(ValueError) as context:
+            MACDSignal().compute(self.sample_data.iloc[:30])
+
+        self.assertIn("MACD Signal", str(context.exception))
+
+
+class TestIndicatorBatch(unittest.TestCase):
+    def setUp(self):
+        self.sample_data = make_prices()
+        # Every period, since the last-bit differences only show up for some
+        self.periods = list(range(2, 201))
+
+    def test_sma_batch_matches_single_period_exactly(self):
+        batch = SMA.compute_batch(self.sample_data, self.periods)
+
+        self.assertEqual(list(batch.columns), [f"SMA_{p}" for p in self.periods])
+        for period in self.periods:
+            np.testing.assert_array_equal(
+                batch[f"SMA_{period}"].to_numpy(),
+                SMA(period).compute(self.sample_data).to_numpy())
+
+    def test_batches_match_exactly_on_cent_prices(self):
+        # Ties are where a last-bit difference flips a crossover
+        sample_data = make_prices(periods=1000, seed=2, cents=True)
+        for indicator_cls in [SMA, EMA, RSI]:
+            batch = indicator_cls.compute_batch(sample_data, self.periods)
+            for period in self.periods:
+                indicator = indicator_cls(period)
+                np.testing.assert_array_equal(batch[str(indicator)].to_numpy(),
+                                              indicator.compute(sample_data).to_numpy())
+
+    def test_ema_batch_matches_single_period_exactly(self):
+        batch = EMA.compute_batch(self.sample_data, self.periods)
+
+        for period in self.periods:
+            np.testing.assert_array_equal(
+                batch[f"EMA_{period}"].to_numpy(),
+                EMA(period).compute(self.sample_data).to_numpy())
+
+    def test_rsi_batch_matches_single_period_exactly(self):
+        batch = RSI.compute_batch(self.sample_data, self.periods)
+
+        for period in self.periods:
+            np.testing.assert_array_equal(
+                batch[f"RSI_{period}"].to_numpy(),
+                RSI(period).compute(self.sample_data).to_numpy())
+
+    def test_batch_validation(self):
+        with self.assertRaises(ValueError):
+            SMA.compute_batch(self.sample_data, [])
+        with self.assertRaises(ValueError):
+            EMA.compute_batch(self.sample_data, [0, 5])
+        with self.assertRaises(ValueError) as context:
+            RSI.compute_batch(self.sample_data, [len(self.sample_data)])
+        self.assertIn("Not enough data points", str(context.exception))
+
+    @patch('yfinance.Ticker')
+    def test_market_data_batch_seeds_cache(self, mock_ticker):
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = self.sample_data
+        mock_ticker.return_value = mock_ticker_instance
+        market_data = MarketData("AAPL", "2y")
+
+        batch = market_data.get_indicator_batch(EMA, self.periods)
+
+        self.assertEqual(batch.shape, (len(self.sample_data), len(self.periods)))
+        with patch.object(EMA, 'compute') as ema_compute:
+            market_data.get_indicator_data(EMA(14))
+        ema_compute.assert_not_called()
+
+
+class TestIndicatorStreams(unittest.TestCase):
+    def setUp(self):
+        self.sample_data = make_prices(periods=600)
+        # A flat stretch exercises pandas' same-value handling in rolling means
+        self.sample_data.iloc[200:230, self.sample_data.columns.get_loc('Close')] = \
+            self.sample_data['Close'].iloc[200]
+        self.indicators = [SMA(1), SMA(3), SMA(50), EMA(3), EMA(12), RSI(2), RSI(14),
+                           MACDLine(), MACDSignal(), MACDHistogram(5, 35, 5)]
+
+    def test_streams_match_batch_bit_for_bit(self):
+        closes = self.sample_data['Close'].to_numpy()
+        for indicator in self.indicators:
+            streamed = create_stream(indicator).update_many(closes)
+            np.testing.assert_array_equal(
+                np.array(streamed), indicator.compute(self.sample_data).to_numpy(),
+                err_msg=str(indicator))
+
+    def test_streams_match_over_all_periods(self):
+        closes = self.sample_data['Close'].to_numpy()
+        for period in range(1, 201):
+            for indicator in [SMA(period), EMA(period), RSI(period)]:
+                streamed = create_stream(indicator).update_many(closes)
+                np.testing.assert_array_equal(
+                    np.array(streamed), indicator.compute(self.sample_data).to_numpy(),
+                    err_msg=str(indicator))
+
+    def test_prime_then_update(self):
+        history, live = self.sample_data.iloc[:500], self.sample_data.iloc[500:]
+        stream = create_stream(RSI(14)).prime(history)
+
+        values = [stream.update(row) for _, row in live.iterrows()]
+
+        np.testing.assert_array_equal(
+            values, RSI(14).compute(self.sample_data).to_numpy()[500:])
+        self.assertEqual(stream.value, values[-1])
+
+    def test_sma_state_is_bounded_by_period(self):
+        stream = StreamingSMA(20)
+        stream.update_many(self.sample_data['Close'])
+
+        self.assertEqual(len(stream._window), 20)
+
+    def test_invalid_bar(self):
+        with self.assertRaises(ValueError):
+            StreamingRSI(14).update({'Open': 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
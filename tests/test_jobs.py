@@ -0,0 +1,85 @@
+import threading
+import time
+import unittest
+from backend.jobs import JobManager, COMPLETED, FAILED, CANCELLED, QUEUED, JobCancelled
+
+
+def wait_for(job, states=(COMPLETED, FAILED, CANCELLED), timeout=5.0):
+    deadline = time.time() + timeout
+    while job.status not in states and time.time() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        self.manager = JobManager(workers=1)
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    def test_completed_job_keeps_result(self):
+        def job_fn(context, value):
+            context.report(0.5)
+            return value * 2
+
+        job = self.manager.submit(job_fn, 21)
+
+        self.assertEqual(wait_for(job), COMPLETED)
+        self.assertEqual(job.result, 42)
+        self.assertEqual(job.progress, 1.0)
+        self.assertIs(self.manager.get(job.id), job)
+
+    def test_failed_job_records_error(self):
+        def job_fn(context):
+            raise ValueError("No data found for ticker XYZ")
+
+        job = self.manager.submit(job_fn)
+
+        self.assertEqual(wait_for(job), FAILED)
+        self.assertIn("XYZ", job.error)
+
+    def test_cancel_queued_job(self):
+        release = threading.Event()
+        blocker = self.manager.submit(lambda context: release.wait(5))
+        queued = self.manager.submit(lambda context: 'should not run')
+
+        self.manager.cancel(queued.id)
+        release.set()
+
+        self.assertEqual(queued.status, CANCELLED)
+        self.assertEqual(wait_for(blocker), COMPLETED)
+        self.assertIsNone(queued.result)
+
+    def test_cancel_running_job(self):
+        started = threading.Event()
+
+        def job_fn(context):
+            started.set()
+            while True:
+                context.check_cancelled()
+                time.sleep(0.01)
+
+        job = self.manager.submit(job_fn)
+        started.wait(5)
+        self.manager.cancel(job.id)
+
+        self.assertEqual(wait_for(job), CANCELLED)
+
+    def test_old_finished_jobs_are_dropped(self):
+        manager = JobManager(workers=1, max_finished=2)
+        jobs = [manager.submit(lambda context, i=i: i) for i in range(4)]
+        for job in jobs:
+            wait_for(job)
+
+        self.assertIsNone(manager.get(jobs[0].id))
+        self.assertIsNotNone(manager.get(jobs[-1].id))
+        manager.shutdown()
+
+    def test_unknown_job(self):
+        self.assertIsNone(self.manager.get('missing'))
+        self.assertIsNone(self.manager.cancel('missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+import tempfile
+import shutil
+import pandas as pd
+import numpy as np
+from unittest.mock import patch, MagicMock
+from src.main import MarketData
+from src.storage import MemoryStore, ParquetStore, slice_period
+
+
+def make_prices(start, periods):
+    index = pd.date_range(start=start, periods=periods, freq='B')
+    close = np.linspace(100, 200, periods)
+    return pd.DataFrame({
+        'Open': close - 1,
+        'High': close + 1,
+        'Low': close - 2,
+        'Close': close,
+        'Volume': np.arange(periods, dtype=float) * 100
+    }, index=index)
+
+
+class TestMarketDataStore(unittest.TestCase):
+    def setUp(self):
+        self.sample_data = make_prices(
+            pd.Timestamp.now().normalize() - pd.Timedelta(days=400), 280)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def mock_source(self, mock_ticker, data):
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = data
+        mock_ticker.return_value = mock_ticker_instance
+        return mock_ticker_instance
+
+    @patch('yfinance.Ticker')
+    def test_fetch_writes_through_to_store(self, mock_ticker):
+        self.mock_source(mock_ticker, self.sample_data)
+        store = ParquetStore(self.directory)
+
+        MarketData("aapl", "1y", store=store)
+
+        self.assertTrue(store.contains("AAPL"))
+        pd.testing.assert_frame_equal(
+            store.load("AAPL"), self.sample_data, check_freq=False)
+
+    @patch('yfinance.Ticker')
+    def test_second_load_reads_from_store(self, mock_ticker):
+        source = self.mock_source(mock_ticker, self.sample_data)
+        store = MemoryStore()
+
+        MarketData("AAPL", "1y", store=store)
+        market_data = MarketData("AAPL", "6mo", store=store)
+
+        self.assertEqual(source.history.call_count, 1)
+        self.assertLess(len(market_data.get_raw_data()), len(self.sample_data))
+        self.assertEqual(market_data.get_raw_data().index[-1],
+                         self.sample_data.index[-1])
+
+    @patch('yfinance.Ticker')
+    def test_longer_period_than_stored_refetches(self, mock_ticker):
+        source = self.mock_source(mock_ticker, self.sample_data)
+        store = MemoryStore()
+
+        MarketData("AAPL", "6mo", store=store)
+        MarketData("AAPL", "5y", store=store)
+
+        self.assertEqual(source.history.call_count, 2)
+
+    @patch('yfinance.Ticker')
+    def test_stale_store_fetches_only_the_tail(self, mock_ticker):
+        stored = self.sample_data.iloc[:-3]
+        store = MemoryStore()
+        store.save("AAPL", stored, {
+            'covers_from': (stored.index[0] - pd.DateOffset(years=2)).isoformat(),
+            'updated_at': (pd.Timestamp.now() - pd.Timedelta(days=3)).isoformat()
+        })
+        # The source re-sends the last stored bar with a corrected close
+        tail = self.sample_data.iloc[-4:].copy()
+        tail.loc[tail.index[0], 'Close'] = 1.0
+        source = self.mock_source(mock_ticker, tail)
+
+        market_data = MarketData("AAPL", "1y", store=store)
+
+        _, kwargs = source.history.call_args
+        self.assertNotIn('period', kwargs)
+        self.assertEqual(kwargs['start'], stored.index[-1].date())
+
+        refreshed = store.load("AAPL")
+        self.assertEqual(len(refreshed), len(self.sample_data))
+        self.assertEqual(refreshed['Close'].iloc[-4], 1.0)
+        self.assertEqual(market_data.get_raw_data().index[-1],
+                         self.sample_data.index[-1])
+        self.assertEqual(store.load_metadata("AAPL")['covers_from'],
+                         (stored.index[0] - pd.DateOffset(years=2)).isoformat())
+
+    @patch('yfinance.Ticker')
+    def test_stale_store_is_used_when_the_tail_fetch_fails(self, mock_ticker):
+        stored = self.sample_data.iloc[:-3]
+        metadata = {
+            'covers_from': (stored.index[0] - pd.DateOffset(years=2)).isoformat(),
+            'updated_at': (pd.Timestamp.now() - pd.Timedelta(days=3)).isoformat()
+        }
+        store = MemoryStore()
+        store.save("AAPL", stored, metadata)
+        source = self.mock_source(mock_ticker, None)
+        source.history.side_effect = ConnectionError("rate limited")
+
+        market_data = MarketData("AAPL", "1y", store=store)
+
+        self.assertEqual(source.history.call_count, 1)
+        pd.testing.assert_frame_equal(market_data.get_raw_data(),
+                                      slice_period(stored, "1y"), check_freq=False)
+        self.assertEqual(store.load_metadata("AAPL"), metadata)
+
+    @patch('yfinance.Ticker')
+    def test_offline_mode_never_touches_network(self, mock_ticker):
+        store = MemoryStore()
+        store.save("AAPL", self.sample_data, {'covers_from': None,
+                                              'updated_at': '2000-01-01'})
+
+        market_data = MarketData("AAPL", "max", store=store, offline=True)
+
+        mock_ticker.assert_not_called()
+        self.assertEqual(len(market_data.get_raw_data()), len(self.sample_data))
+
+    def test_offline_mode_without_stored_data(self):
+        with self.assertRaises(ValueError) as context:
+            MarketData("AAPL", "1y", store=MemoryStore(), offline=True)
+
+        self.assertIn("offline", str(context.exception))
+
+    def test_offline_mode_requires_store(self):
+        with self.assertRaises(ValueError):
+            MarketData("AAPL", "1y", offline=True)
+
+    def test_slice_period(self):
+        self.assertEqual(len(slice_period(self.sample_data, "5d")), 5)
+        self.assertEqual(len(slice_period(self.sample_data, "max")),
+                         len(self.sample_data))
+
+        window = slice_period(self.sample_data, "3mo")
+        self.assertGreaterEqual(
+            window.index[0], self.sample_data.index[-1] - pd.DateOffset(months=3))
+        self.assertEqual(window.index[-1], self.sample_data.index[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
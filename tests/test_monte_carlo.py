@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.back_testing import BackTest
+from src.main import MarketData
+from src.monte_carlo import MonteCarlo, path_metrics, position_returns
+from src.strategies import MovingAverageCross
+from tests.helpers import make_prices
+
+
+def make_backtest(periods=800, seed=4):
+    data = make_prices(periods, seed, start='2018-01-01', volatility=0.012)[['Close']]
+    market_data = MarketData('SPY', 'max', raw_data=data)
+    results = BackTest().run_backtest(market_data, MovingAverageCross(lower_period=5, upper_period=20))
+    return market_data.get_raw_data()['Close'], results
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.prices, self.results = make_backtest()
+        self.trades = self.results['trades']
+
+    def test_path_metrics_match_per_trade_metrics(self):
+        returns = self.trades['return'].to_numpy()
+
+        metrics = path_metrics(returns[None, :])
+
+        expected = BackTest()._returns_metrics(returns)
+        self.assertAlmostEqual(metrics['total_return'][0], expected['total_return'])
+        self.assertAlmostEqual(metrics['trade_max_drawdown'][0], expected['max_drawdown'])
+        self.assertAlmostEqual(metrics['trade_sharpe_ratio'][0], expected['sharpe_ratio'])
+
+    def test_shuffle_keeps_total_return(self):
+        result = MonteCarlo(simulations=500, method='shuffle', seed=1).run(self.trades)
+
+        np.testing.assert_allclose(result['simulations']['total_return'],
+                                   self.results['metrics']['total_return'])
+        self.assertGreater(result['simulations']['trade_max_drawdown'].std(), 0)
+        self.assertTrue((result['simulations']['trade_max_drawdown'] <= 0).all())
+        self.assertEqual(set(result['observed']),
+                         {'total_return', 'trade_max_drawdown', 'trade_sharpe_ratio'})
+
+    def test_bootstrap_is_reproducible_and_chunked(self):
+        returns = self.trades['return'].to_numpy()
+
+        first = MonteCarlo(simulations=3000, seed=7).run(returns)
+        second = MonteCarlo(simulations=3000, seed=7).run(returns)
+
+        pd.testing.assert_frame_equal(first['simulations'], second['simulations'])
+        self.assertEqual(len(first['simulations']), 3000)
+        self.assertEqual(list(first['summary'].index), ['p5', 'p25', 'p50', 'p75', 'p95', 'mean'])
+        self.assertGreater(first['simulations']['total_return'].std(), 0)
+
+    def test_position_returns_compound_to_trade_returns(self):
+        bar_returns = position_returns(self.prices, self.trades)
+
+        self.assertAlmostEqual(np.prod(1 + bar_returns),
+                               np.prod(1 + self.trades['return'].to_numpy()))
+        self.assertEqual(len(bar_returns),
+                         (self.prices.index.get_indexer(self.trades['exit_date'])
+                          - self.prices.index.get_indexer(self.trades['entry_date'])).sum())
+
+    def test_block_bootstrap(self):
+        result = MonteCarlo(simulations=200, method='block', block_size=10, seed=3).run(
+            self.trades, self.prices)
+
+        self.assertEqual(len(result['simulations']), 200)
+        self.assertAlmostEqual(result['observed']['total_return'],
+                               self.results['metrics']['total_return'])
+        self.assertIn('held_bar_sharpe_ratio', result['simulations'].columns)
+        self.assertNotIn('sharpe_ratio', result['observed'])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            MonteCarlo(method='jackknife')
+        with self.assertRaises(ValueError):
+            MonteCarlo(method='block').run(self.trades)
+        with self.assertRaises(ValueError):
+            MonteCarlo().run(pd.DataFrame([]))
+        with self.assertRaises(ValueError):
+            MonteCarlo(method='block').run(pd.DataFrame([]), self.prices)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import pandas as pd
+import numpy as np
+from unittest.mock import patch, MagicMock
+from src.back_testing import BackTest
+from src.indicators import SMA
+from src.main import MarketData
+from src.optimization import ParameterSweep
+from src.strategies import MovingAverageCross, RSIExtremes
+from tests.helpers import make_prices
+
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        self.sample_data = make_prices(periods=800, seed=5, start='2018-01-01', volatility=0.015)
+
+    def market_data(self, mock_ticker):
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.return_value = self.sample_data
+        mock_ticker.return_value = mock_ticker_instance
+        return MarketData("SPY", "5y")
+
+    @patch('yfinance.Ticker')
+    def test_results_match_individual_backtests(self, mock_ticker):
+        market_data = self.market_data(mock_ticker)
+        sweep = ParameterSweep(MovingAverageCross, {
+            'lower_period': [5, 10, 20],
+            'upper_period': [10, 50],
+            'ma_type': ['SMA', 'EMA']
+        })
+
+        results = sweep.run(market_data)
+
+        # lower_period >= upper_period combinations are skipped
+        self.assertEqual(len(results), 8)
+        self.assertTrue(results['total_return'].is_monotonic_decreasing)
+        for _, row in results.iterrows():
+            strategy = MovingAverageCross(
+                row['lower_period'], row['upper_period'], row['ma_type'])
+            expected = BackTest().run_backtest(market_data, strategy)['metrics']
+            self.assertAlmostEqual(row['total_return'], expected['total_return'])
+            self.assertEqual(row['total_trades'], expected['total_trades'])
+
+    def test_results_match_fresh_backtests_on_cent_prices(self):
+        # Cent prices have ties, where indicators that differ in the last
+        # bit cross on different bars. Each expected result comes from its
+        # own MarketData, so nothing from the sweep's primed cache is reused.
+        data = make_prices(periods=800, seed=8, cents=True)
+        sweep = ParameterSweep(MovingAverageCross, {
+            'lower_period': list(range(2, 12)),
+            'upper_period': [20, 50, 100],
+            'ma_type': ['SMA', 'EMA']
+        })
+
+        results = sweep.run(MarketData('SPY', '5y', raw_data=data))
+
+        self.assertEqual(len(results), 60)
+        for _, row in results.iterrows():
+            strategy = MovingAverageCross(
+                row['lower_period'], row['upper_period'], row['ma_type'])
+            expected = BackTest().run_backtest(
+                MarketData('SPY', '5y', raw_data=data), strategy)['metrics']
+            for metric, value in expected.items():
+                if metric != 'trades':
+                    self.assertEqual(row[metric], value, (metric, strategy))
+
+    @patch('yfinance.Ticker')
+    def test_indicators_are_batch_computed(self, mock_ticker):
+        market_data = self.market_data(mock_ticker)
+        sweep = ParameterSweep(MovingAverageCross, {
+            'lower_period': list(range(5, 30)),
+            'upper_period': list(range(30, 200, 10)),
+            'ma_type': ['SMA']
+        })
+
+        with patch.object(SMA, 'compute') as sma_compute:
+            results = sweep.run(market_data)
+
+        sma_compute.assert_not_called()
+        self.assertNotIn('trades', results.columns)
+
+    @patch('yfinance.Ticker')
+    def test_sort_by_other_metric(self, mock_ticker):
+        market_data = self.market_data(mock_ticker)
+        sweep = ParameterSweep(RSIExtremes, {
+            'rsi_period': [7, 14],
+            'oversold_threshold': [20, 30],
+            'overbought_threshold': [70, 80]
+        }, sort_by='max_drawdown')
+
+        results = sweep.run(market_data)
+
+        self.assertEqual(len(results), 8)
+        self.assertTrue(results['max_drawdown'].is_monotonic_decreasing)
+
+    def test_invalid_grid(self):
+        with self.assertRaises(ValueError):
+            ParameterSweep(MovingAverageCross, {})
+        with self.assertRaises(ValueError):
+            ParameterSweep(MovingAverageCross, {'lower_period': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
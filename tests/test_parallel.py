@@ -0,0 +1,66 @@
+import unittest
+from multiprocessing import shared_memory
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+from src.back_testing import BackTest
+from src.main import MarketData
+from src.parallel import backtest_frames
+from src.strategies import CustomStrategy, MovingAverageCross, RSIExtremes
+from tests.helpers import make_prices
+
+
+class TestParallelBacktest(unittest.TestCase):
+    def setUp(self):
+        self.frames = {f"T{seed}": make_prices(400 + 10 * seed, seed, start='2016-01-01',
+                                               volatility=0.015, tz='America/New_York')
+                       for seed in range(6)}
+        self.strategy = CustomStrategy(mode='any')
+        self.strategy.add_strategy(MovingAverageCross(5, 20, 'EMA'))
+        self.strategy.add_strategy(RSIExtremes(14, 30, 70))
+
+    def test_matches_serial_backtests(self):
+        summary = backtest_frames(self.frames, self.strategy, max_workers=2)
+
+        self.assertEqual(sorted(summary.index), sorted(self.frames))
+        self.assertTrue(summary['error'].isna().all())
+        for ticker, data in self.frames.items():
+            market_data = MarketData(ticker, 'max', raw_data=data)
+            expected = BackTest().run_backtest(market_data, self.strategy)['metrics']
+            self.assertAlmostEqual(summary.loc[ticker, 'total_return'], expected['total_return'])
+            self.assertEqual(summary.loc[ticker, 'total_trades'], expected['total_trades'])
+
+    def test_failures_are_reported_per_ticker(self):
+        frames = {'OK': self.frames['T0'], 'SHORT': make_prices(5, 99)}
+
+        summary = backtest_frames(frames, self.strategy, max_workers=2)
+
+        self.assertTrue(pd.isna(summary.loc['OK', 'error']))
+        self.assertIn("Not enough data points", summary.loc['SHORT', 'error'])
+
+    def test_empty_universe(self):
+        with self.assertRaises(ValueError):
+            backtest_frames({}, self.strategy)
+
+    def test_unshareable_frame_leaves_no_block(self):
+        created = []
+        create_block = shared_memory.SharedMemory
+
+        def track(*args, **kwargs):
+            block = create_block(*args, **kwargs)
+            created.append(block.name)
+            return block
+
+        frames = {'OK': self.frames['T0'], 'BAD': self.frames['T1'].assign(Name='x')}
+        with patch('src.parallel.shared_memory.SharedMemory', side_effect=track):
+            with self.assertRaises(ValueError):
+                backtest_frames(frames, self.strategy, max_workers=2)
+
+        # OK's block was created and released; BAD never got one
+        self.assertEqual(len(created), 1)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=created[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
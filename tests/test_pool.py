@@ -0,0 +1,95 @@
+import unittest
+import threading
+import time
+import pandas as pd
+import numpy as np
+from unittest.mock import patch, MagicMock
+from src.pool import MarketDataPool
+
+
+class TestMarketDataPool(unittest.TestCase):
+    def setUp(self):
+        self.sample_data = pd.DataFrame({
+            'Close': np.arange(1, 101, dtype=float)
+        }, index=pd.date_range(start='2024-01-01', periods=100))
+
+    def mock_source(self, mock_ticker, delay=0.0):
+        def history(**kwargs):
+            time.sleep(delay)
+            return self.sample_data
+
+        mock_ticker_instance = MagicMock()
+        mock_ticker_instance.history.side_effect = history
+        mock_ticker.return_value = mock_ticker_instance
+        return mock_ticker_instance
+
+    @patch('yfinance.Ticker')
+    def test_same_key_is_shared(self, mock_ticker):
+        source = self.mock_source(mock_ticker)
+        pool = MarketDataPool()
+
+        first = pool.get("spy", "1y")
+        second = pool.get("SPY", "1y")
+
+        self.assertIs(first, second)
+        self.assertEqual(source.history.call_count, 1)
+        self.assertEqual(pool.stats()['hits'], 1)
+
+    @patch('yfinance.Ticker')
+    def test_concurrent_misses_are_coalesced(self, mock_ticker):
+        source = self.mock_source(mock_ticker, delay=0.2)
+        pool = MarketDataPool()
+        results = []
+
+        threads = [threading.Thread(target=lambda: results.append(pool.get("SPY", "1y")))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(source.history.call_count, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    @patch('yfinance.Ticker')
+    def test_expired_entries_are_reloaded(self, mock_ticker):
+        source = self.mock_source(mock_ticker)
+        pool = MarketDataPool(ttl=0.05)
+
+        first = pool.get("SPY", "1y")
+        time.sleep(0.1)
+        second = pool.get("SPY", "1y")
+
+        self.assertIsNot(first, second)
+        self.assertEqual(source.history.call_count, 2)
+
+    @patch('yfinance.Ticker')
+    def test_least_recently_used_entry_is_evicted(self, mock_ticker):
+        self.mock_source(mock_ticker)
+        entry_size = MarketDataPool().get("X", "1y").memory_usage()
+        pool = MarketDataPool(max_bytes=2 * entry_size + entry_size // 2)
+
+        pool.get("AAA", "1y")
+        pool.get("BBB", "1y")
+        pool.get("AAA", "1y")
+        pool.get("CCC", "1y")
+
+        self.assertIn(("AAA", "1y"), pool)
+        self.assertNotIn(("BBB", "1y"), pool)
+        self.assertIn(("CCC", "1y"), pool)
+        self.assertEqual(pool.stats()['evictions'], 1)
+
+    @patch('yfinance.Ticker')
+    def test_failed_load_is_not_cached(self, mock_ticker):
+        mock_ticker.side_effect = RuntimeError("network down")
+        pool = MarketDataPool()
+
+        with self.assertRaises(ValueError):
+            pool.get("SPY", "1y")
+
+        self.assertEqual(len(pool), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.back_testing import BackTest
+from src.main import MarketData
+from src.portfolio import PortfolioBackTest
+from src.strategies import MovingAverageCross
+
+
+def make_universe(periods=300, assets=4, seed=11):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2020-01-01', periods=periods, freq='B')
+    columns = [f'T{i}' for i in range(assets)]
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (periods, assets)), axis=0)),
+                          index=index, columns=columns)
+    buy = pd.DataFrame(rng.random((periods, assets)) < 0.05, index=index, columns=columns)
+    sell = pd.DataFrame(rng.random((periods, assets)) < 0.05, index=index, columns=columns)
+    return prices, buy, sell
+
+
+class TestPortfolioBackTest(unittest.TestCase):
+    def test_single_asset_matches_backtest(self):
+        prices, buy, sell = make_universe(assets=1)
+        sell.iloc[-1] = True  # BackTest ignores a position still open at the end
+
+        result = PortfolioBackTest(initial_capital=10000).simulate(prices, buy, sell)
+
+        backtest = BackTest(initial_capital=10000)
+        trades = backtest._generate_trades({'buy': buy['T0'], 'sell': sell['T0']}, prices['T0'])
+        metrics = backtest._calculate_metrics(trades, prices['T0'])
+        self.assertAlmostEqual(result['metrics']['final_capital'], metrics['final_capital'])
+        self.assertEqual(result['metrics']['rebalances'], 2 * len(trades))
+
+    def test_equal_weights_and_shared_cash(self):
+        index = pd.date_range('2020-01-01', periods=4, freq='B')
+        prices = pd.DataFrame({'A': [10.0, 10.0, 20.0, 20.0], 'B': [5.0, 5.0, 5.0, 10.0]}, index=index)
+        buy = pd.DataFrame({'A': [True, False, False, False], 'B': [False, True, False, False]}, index=index)
+        sell = pd.DataFrame(False, index=index, columns=['A', 'B'])
+
+        result = PortfolioBackTest(initial_capital=1000).simulate(prices, buy, sell)
+
+        # All in A, then split 50/50 when B is bought
+        np.testing.assert_allclose(result['holdings'].to_numpy(),
+                                   [[100, 0], [50, 100], [50, 100], [50, 100]])
+        np.testing.assert_allclose(result['equity'].to_numpy(), [1000, 1000, 1500, 2000])
+        np.testing.assert_allclose(result['cash'].to_numpy(), 0, atol=1e-9)
+
+    def test_max_positions_leaves_unused_slots_in_cash(self):
+        prices, buy, sell = make_universe(assets=6)
+
+        result = PortfolioBackTest(max_positions=2).simulate(prices, buy, sell)
+
+        self.assertLessEqual(result['positions'].sum(axis=1).max(), 2)
+        self.assertEqual(result['metrics']['max_positions_held'], 2)
+        # Weights drift between rebalances, so check the bars holdings were set on
+        rebalanced = result['holdings'].diff().abs().sum(axis=1).to_numpy() > 0
+        invested = (result['holdings'].to_numpy() * prices.to_numpy())[rebalanced]
+        slot_value = result['equity'].to_numpy()[rebalanced, None] / 2
+        self.assertTrue(np.all(invested <= slot_value + 1e-6))
+
+    def test_commission_and_periodic_rebalancing(self):
+        prices, buy, sell = make_universe()
+
+        plain = PortfolioBackTest().simulate(prices, buy, sell)['metrics']
+        periodic = PortfolioBackTest(rebalance_every=5, commission=0.001).simulate(
+            prices, buy, sell)['metrics']
+
+        self.assertGreater(periodic['rebalances'], plain['rebalances'])
+        self.assertGreater(periodic['total_costs'], 0)
+        self.assertEqual(plain['total_costs'], 0)
+
+    def test_commission_on_full_rotation_is_paid_from_cash(self):
+        # Every rebalance sells one asset and buys the other, turning over
+        # twice the book
+        index = pd.date_range('2020-01-01', periods=6, freq='B')
+        prices = pd.DataFrame({'A': [10.0, 10, 12, 12, 9, 9], 'B': [5.0, 5, 5, 6, 6, 7]}, index=index)
+        buy = pd.DataFrame({'A': [True, False, False, True, False, False],
+                            'B': [False, True, False, False, True, False]}, index=index)
+        sell = pd.DataFrame({'A': [False, True, False, False, True, False],
+                             'B': [False, False, False, True, False, False]}, index=index)
+
+        result = PortfolioBackTest(initial_capital=1000, commission=0.01).simulate(prices, buy, sell)
+
+        # Fully invested apart from rounding, not holding back extra cash
+        # and not overdrawn
+        np.testing.assert_allclose(result['cash'].to_numpy(), 0, atol=1e-9)
+        self.assertAlmostEqual(result['holdings'].iloc[0, 0], 1000 / 10 / 1.01)
+
+        prices, buy, sell = make_universe(assets=6)
+        result = PortfolioBackTest(commission=0.05).simulate(prices, buy, sell)
+        self.assertGreater(result['metrics']['total_costs'], 0)
+        self.assertTrue(np.all(result['cash'].to_numpy() > -1e-9))
+
+    def test_missing_prices_are_not_traded(self):
+        prices, buy, sell = make_universe()
+        prices.iloc[:50, 0] = np.nan
+        buy.iloc[:50, 0] = True
+
+        result = PortfolioBackTest().simulate(prices, buy, sell)
+
+        self.assertFalse(result['positions'].iloc[:50, 0].any())
+        self.assertFalse(np.isnan(result['equity']).any())
+
+    def test_run_on_market_data(self):
+        prices, _, _ = make_universe(assets=3)
+        market_data = {ticker: MarketData(ticker, '1y', raw_data=prices[[ticker]].rename(
+            columns={ticker: 'Close'})) for ticker in prices.columns}
+
+        result = PortfolioBackTest().run(
+            market_data, MovingAverageCross(lower_period=5, upper_period=20))
+
+        self.assertEqual(list(result['holdings'].columns), list(prices.columns))
+        self.assertGreater(result['metrics']['rebalances'], 0)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            PortfolioBackTest(max_positions=0)
+        with self.assertRaises(ValueError):
+            PortfolioBackTest(commission=1.5)
+        with self.assertRaises(ValueError):
+            PortfolioBackTest().run({}, MovingAverageCross(lower_period=5, upper_period=20))
+
+
+if __name__ == '__main__':
+    unittest.main()
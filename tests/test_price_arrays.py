@@ -0,0 +1,78 @@
+import unittest
+import pandas as pd
+import numpy as np
+from src.main import MarketData, aligned_signal, aligned_values
+from src.indicators import RSI, SMA
+from src.strategies import MovingAverageCross
+from tests.helpers import make_prices
+
+
+class TestPriceArrays(unittest.TestCase):
+    def setUp(self):
+        self.market_data = MarketData('TEST', '1y', raw_data=make_prices(periods=120, seed=3))
+
+    def test_layout(self):
+        arrays = self.market_data.arrays()
+
+        self.assertIs(arrays, self.market_data.arrays())
+        self.assertIs(arrays.index, self.market_data.get_raw_data().index)
+        self.assertEqual(arrays.timestamps.dtype, np.int64)
+        self.assertEqual(len(arrays), 120)
+        for column in ['Open', 'High', 'Low', 'Close', 'Volume']:
+            self.assertEqual(arrays[column].dtype, np.float64)
+            self.assertTrue(arrays[column].flags.c_contiguous)
+            self.assertFalse(arrays[column].flags.writeable)
+        np.testing.assert_array_equal(arrays['Close'], self.market_data.get_raw_data()['Close'])
+
+    def test_raw_data_is_a_view_of_the_arrays(self):
+        for market_data in [self.market_data,
+                            MarketData('TEST', '1y', raw_data=make_prices(periods=120, seed=3),
+                                       compact=True)]:
+            raw = market_data.get_raw_data()
+            arrays = market_data.arrays()
+            for column in raw.columns:
+                self.assertTrue(np.shares_memory(raw[column].to_numpy(), arrays[column]))
+            self.assertEqual(arrays.owned_bytes, market_data.memory_usage()
+                             - raw.memory_usage(deep=True).sum())
+
+    def test_non_numeric_columns_stay_in_place(self):
+        data = make_prices(periods=120, seed=3)
+        data.insert(2, 'Exchange', 'NYSE')
+
+        market_data = MarketData('TEST', '1y', raw_data=data)
+
+        pd.testing.assert_frame_equal(market_data.get_raw_data(), data)
+        self.assertNotIn('Exchange', market_data.arrays().columns)
+
+    def test_indicator_values_match_series(self):
+        for indicator in [SMA(10), RSI(14)]:
+            values = self.market_data.get_indicator_values(indicator)
+            series = self.market_data.get_indicator_data(indicator)
+            np.testing.assert_array_equal(values, series.to_numpy())
+
+    def test_foreign_series_are_aligned(self):
+        index = self.market_data.get_raw_data().index
+        partial = pd.Series([1.0, 2.0], index=index[[2, 5]])
+        signal = pd.Series([True], index=index[[3]])
+
+        values = aligned_values(partial, index)
+        self.assertEqual(values[2], 1.0)
+        self.assertEqual(np.isnan(values).sum(), len(index) - 2)
+        np.testing.assert_array_equal(np.flatnonzero(aligned_signal(signal, index)), [3])
+
+    def test_signals_match_pandas_alignment(self):
+        signals = MovingAverageCross(5, 20, 'SMA').calculate_signals(self.market_data)
+
+        # The label-aligned version the strategies used before
+        lower = self.market_data.get_indicator_data(SMA(5))
+        upper = self.market_data.get_indicator_data(SMA(20))
+        lower, upper = lower.align(upper, join='inner')
+        expected = (lower > upper) & (lower.shift(1) <= upper.shift(1))
+
+        self.assertIs(signals['buy'].index, self.market_data.get_raw_data().index)
+        self.assertEqual(signals['buy'].dtype, bool)
+        np.testing.assert_array_equal(signals['buy'].to_numpy(), expected.to_numpy())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+import numpy as np
+from backend import run
+from backend.models import BacktestRequest, StrategyConfig
+from backend.result_cache import ResultCache, request_key
+from src.main import MarketData
+from tests.helpers import make_prices
+
+
+def make_request(**overrides):
+    fields = {
+        'ticker': 'aapl',
+        'period': '1y',
+        'initial_capital': '10000',
+        'mode': 'any',
+        'strategies': [
+            StrategyConfig(type='moving_average_cross',
+                           params={'lower_period': 5, 'upper_period': 20, 'ma_type': 'SMA'}),
+            StrategyConfig(type='rsi_extremes',
+                           params={'rsi_period': 14, 'oversold_threshold': 30,
+                                   'overbought_threshold': 70})
+        ]
+    }
+    fields.update(overrides)
+    return BacktestRequest(**fields)
+
+
+class TestRequestKey(unittest.TestCase):
+    def test_equivalent_requests_share_a_key(self):
+        reordered = make_request(
+            ticker=' AAPL ',
+            initial_capital='10000.0',
+            strategies=[
+                StrategyConfig(type='rsi_extremes',
+                               params={'overbought_threshold': '70', 'rsi_period': '14',
+                                       'oversold_threshold': 30}),
+                StrategyConfig(type='moving_average_cross',
+                               params={'lower_period': '5', 'upper_period': 20, 'ma_type': 'sma'})
+            ])
+
+        self.assertEqual(request_key(make_request(), 'v1'), request_key(reordered, 'v1'))
+
+    def test_different_inputs_change_the_key(self):
+        base = request_key(make_request(), 'v1')
+
+        self.assertNotEqual(base, request_key(make_request(), 'v2'))
+        self.assertNotEqual(base, request_key(make_request(mode='all'), 'v1'))
+        self.assertNotEqual(base, request_key(make_request(period='2y'), 'v1'))
+        self.assertNotEqual(request_key(make_request(mode='k_of_n', k=1), 'v1'),
+                            request_key(make_request(mode='k_of_n', k=2), 'v1'))
+
+    def test_data_version_tracks_new_bars(self):
+        data = pd.DataFrame({'Close': np.arange(1.0, 11.0)},
+                            index=pd.date_range('2024-01-01', periods=10))
+
+        version = MarketData('AAPL', '1y', raw_data=data).data_version()
+
+        self.assertEqual(version, MarketData('AAPL', '1y', raw_data=data.copy()).data_version())
+        self.assertNotEqual(version, MarketData('AAPL', '1y', raw_data=data.iloc[:-1]).data_version())
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_disk_tier_survives_a_new_instance(self):
+        ResultCache(directory=self.directory).put('key', {'total_return': 0.1})
+
+        cache = ResultCache(directory=self.directory)
+
+        self.assertEqual(cache.get('key'), {'total_return': 0.1})
+        self.assertEqual(cache.stats()['disk_hits'], 1)
+        cache.get('key')
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_disk_tier_is_bounded(self):
+        cache = ResultCache(max_entries=1, directory=self.directory, max_disk_entries=3)
+        for age, key in enumerate(['a', 'b', 'c']):
+            cache.put(key, key)
+            # Distinct mtimes, oldest first, whatever the clock resolution
+            os.utime(os.path.join(self.directory, f'{key}.pkl'), ns=(age * 10**9, age * 10**9))
+
+        # Reading 'a' from disk makes it the most recently used file
+        self.assertEqual(ResultCache(directory=self.directory).get('a'), 'a')
+        cache.put('d', 'd')
+
+        self.assertEqual(sorted(os.listdir(self.directory)), ['a.pkl', 'c.pkl', 'd.pkl'])
+        self.assertEqual(cache.stats()['disk_evictions'], 1)
+
+    def test_disk_tier_byte_cap(self):
+        cache = ResultCache(directory=self.directory, max_disk_bytes=1500)
+        for key in ['a', 'b', 'c']:
+            cache.put(key, b'x' * 600)
+
+        files = os.listdir(self.directory)
+        self.assertEqual(len(files), 2)
+        self.assertLessEqual(sum(os.path.getsize(os.path.join(self.directory, name))
+                                 for name in files), 1500)
+
+
+class TestBackendCaching(unittest.TestCase):
+    def setUp(self):
+        self.data = make_prices(periods=400, seed=6)
+        self.request = make_request()
+        run.result_cache.clear()
+
+    def tearDown(self):
+        run.result_cache.clear()
+
+    def test_streamed_and_encoded_results_are_cached(self):
+        expected = run.run_backtest_on_frame(self.request, self.data)
+        self.assertGreater(len(expected['trades']), 0)
+
+        for response_format in [None, 'columnar', 'arrow']:
+            run.result_cache.clear()
+            if response_format is None:
+                metrics, trades = run.run_backtest_for_stream_on_frame(self.request, self.data)
+                self.assertIsInstance(trades, pd.DataFrame)
+            else:
+                run.run_backtest_encoded_on_frame(self.request, self.data, response_format)
+
+            self.assertEqual(run.result_cache.stats()['entries'], 1)
+            # The JSON endpoint now hits the entry the streamed one left
+            hits = run.result_cache.stats()['hits']
+            self.assertEqual(run.run_backtest_on_frame(self.request, self.data), expected)
+            self.assertEqual(run.result_cache.stats()['hits'], hits + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import unittest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from backend.serialization import (negotiate_format, encode_columnar, encode_arrow,
+                                   _iso_strings)
+
+
+def make_trades(count):
+    entry_dates = pd.date_range('2024-03-01', periods=count, freq='7D', tz='America/New_York')
+    return pd.DataFrame({
+        'entry_date': entry_dates,
+        'exit_date': entry_dates + pd.Timedelta(days=3),
+        'return': np.linspace(-0.01, 0.01, count),
+        'duration': np.full(count, 3, dtype=np.int64)
+    })
+
+
+class TestNegotiateFormat(unittest.TestCase):
+    def test_defaults_to_json(self):
+        self.assertEqual(negotiate_format(None), 'json')
+        self.assertEqual(negotiate_format('*/*'), 'json')
+        self.assertEqual(negotiate_format('text/html'), 'json')
+
+    def test_picks_the_preferred_supported_type(self):
+        self.assertEqual(negotiate_format('application/vnd.apache.arrow.stream'), 'arrow')
+        self.assertEqual(
+            negotiate_format('application/json;q=0.5, application/vnd.backtest.columnar+json'),
+            'columnar')
+
+
+class TestEncoders(unittest.TestCase):
+    def setUp(self):
+        self.trades = make_trades(10)
+        self.metrics = {'total_return': np.float64(0.02), 'total_trades': 10, 'trades': []}
+
+    def test_iso_strings_match_isoformat(self):
+        # Crosses the March DST change, so the offset differs within the column
+        column = self.trades['entry_date'].copy()
+        column.iloc[4] = pd.NaT
+
+        self.assertEqual(_iso_strings(column),
+                         [None if pd.isna(value) else value.isoformat() for value in column])
+
+    def test_columnar_layout(self):
+        payload = json.loads(encode_columnar(self.metrics, self.trades))
+
+        self.assertEqual(payload['metrics'], {'total_return': 0.02, 'total_trades': 10})
+        self.assertEqual(payload['trades']['return'], self.trades['return'].tolist())
+        self.assertEqual(payload['trades']['entry_date'][0], '2024-03-01T00:00:00-05:00')
+        self.assertEqual(payload['trades']['entry_date'][-1], '2024-05-03T00:00:00-04:00')
+
+    def test_columnar_from_cached_records(self):
+        records = self.trades.to_dict(orient='records')
+
+        self.assertEqual(encode_columnar(self.metrics, records),
+                         encode_columnar(self.metrics, self.trades))
+
+    def test_arrow_round_trip(self):
+        table = pa.ipc.open_stream(encode_arrow(self.metrics, self.trades)).read_all()
+
+        pd.testing.assert_frame_equal(table.to_pandas(), self.trades)
+        self.assertEqual(json.loads(table.schema.metadata[b'metrics'])['total_trades'], 10)
+
+    def test_no_trades(self):
+        payload = json.loads(encode_columnar(self.metrics, pd.DataFrame([])))
+
+        self.assertEqual(payload['trades'], {})
+        self.assertEqual(pa.ipc.open_stream(encode_arrow(self.metrics, [])).read_all().num_rows, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
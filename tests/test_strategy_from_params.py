@@ -6,6 +6,23 @@ from src.strategies import (
     MACDCross, MACDHistogramStrategy, CustomStrategy
 )
 from src.indicators import SMA, EMA, RSI, MACDLine, MACDSignal, MACDHistogram
+from src.main import MarketData
+from src.strategies import Strategy
+
+
+class FixedSignals(Strategy):
+    """Sub-strategy that returns preset buy signals (and no sells)"""
+
+    def __init__(self, buy):
+        self.buy = buy
+
+    def get_required_indicators(self):
+        return []
+
+    def calculate_signals(self, market_data):
+        index = market_data.get_raw_data().index[:len(self.buy)]
+        return {'buy': pd.Series(self.buy, index=index),
+                'sell': pd.Series(False, index=index)}
 
 
 class TestStrategyFromParams(unittest.TestCase):
@@ -344,5 +361,58 @@ class TestStrategyFromParams(unittest.TestCase):
         self.assertEqual(len(indicators), 2)
 
 
+class TestCustomStrategyCombination(unittest.TestCase):
+    VOTES = [
+        [1, 1, 1, 0, 0, 1],
+        [1, 1, 0, 0, 1, 0],
+        [1, 0, 0, 0, 1, 1],
+        [1, 1, 0, 1, 0, 0]
+    ]
+
+    def setUp(self):
+        self.market_data = MarketData('SPY', '1y', raw_data=pd.DataFrame(
+            {'Close': np.arange(1.0, 7.0)}, index=pd.date_range('2024-01-01', periods=6)))
+
+    def combined(self, mode, weights=None, **kwargs):
+        strategy = CustomStrategy(mode=mode, **kwargs)
+        for votes, weight in zip(self.VOTES, weights or [1.0] * len(self.VOTES)):
+            strategy.add_strategy(FixedSignals(np.array(votes, dtype=bool)), weight)
+        return strategy.calculate_signals(self.market_data)['buy'].tolist()
+
+    def test_vote_modes(self):
+        self.assertEqual(self.combined('all'), [True, False, False, False, False, False])
+        self.assertEqual(self.combined('any'), [True, True, True, True, True, True])
+        # Two of four is not a majority
+        self.assertEqual(self.combined('majority'), [True, True, False, False, False, False])
+        self.assertEqual(self.combined('k_of_n', k=2), [True, True, False, False, True, True])
+
+    def test_weighted_vote(self):
+        weights = [3.0, 1.0, 1.0, 1.0]
+
+        self.assertEqual(self.combined('weighted', weights, threshold=0.5),
+                         [True, True, True, False, False, True])
+        self.assertEqual(self.combined('weighted', weights, threshold=1.0),
+                         self.combined('all'))
+
+    def test_shorter_signals_align_to_price_index(self):
+        strategy = CustomStrategy(mode='any')
+        strategy.add_strategy(FixedSignals(np.array([False, True], dtype=bool)))
+
+        signals = strategy.calculate_signals(self.market_data)
+
+        self.assertEqual(signals['buy'].tolist(), [False, True, False, False, False, False])
+        self.assertTrue(signals['buy'].index.equals(self.market_data.get_raw_data().index))
+
+    def test_invalid_vote_settings(self):
+        with self.assertRaises(ValueError):
+            CustomStrategy(mode='k_of_n')
+        with self.assertRaises(ValueError):
+            CustomStrategy(mode='weighted', threshold=0)
+        with self.assertRaises(ValueError):
+            CustomStrategy(mode='any').add_strategy(FixedSignals([True]), weight=0)
+        with self.assertRaises(ValueError):
+            self.combined('k_of_n', k=5)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+import json
+import unittest
+import numpy as np
+import pandas as pd
+from backend.stream import stream_events, trade_chunks
+
+
+def make_trades(count):
+    entry_dates = pd.date_range('2024-01-01', periods=count, freq='D', tz='America/New_York')
+    return pd.DataFrame({
+        'entry_date': entry_dates,
+        'exit_date': entry_dates + pd.Timedelta(days=1),
+        'return': np.linspace(-0.01, 0.01, count),
+        'duration': np.ones(count, dtype=np.int64)
+    })
+
+
+class TestStreamEvents(unittest.TestCase):
+    def setUp(self):
+        self.trades = make_trades(7)
+        self.metrics = {'total_return': np.float64(0.05), 'total_trades': 7, 'trades': []}
+
+    def test_ndjson_sends_metrics_then_trade_chunks(self):
+        lines = [json.loads(line) for line in
+                 ''.join(stream_events(self.metrics, self.trades, 'ndjson', chunk_size=3)).splitlines()]
+
+        self.assertEqual([line['event'] for line in lines],
+                         ['metrics', 'trades', 'trades', 'trades', 'end'])
+        self.assertEqual(lines[0]['data'], {'total_return': 0.05, 'total_trades': 7})
+        streamed = [trade for line in lines[1:-1] for trade in line['data']]
+        self.assertEqual(len(streamed), 7)
+        self.assertEqual(streamed[0]['entry_date'], '2024-01-01T00:00:00-05:00')
+        self.assertEqual(streamed[0]['duration'], 1)
+
+    def test_sse_framing(self):
+        events = list(stream_events(self.metrics, self.trades, 'sse', chunk_size=10))
+
+        self.assertTrue(events[0].startswith('event: metrics\ndata: '))
+        self.assertTrue(all(event.endswith('\n\n') for event in events))
+        self.assertEqual(events[-1], 'event: end\ndata: {}\n\n')
+
+    def test_cached_records_stream_the_same(self):
+        records = self.trades.to_dict(orient='records')
+
+        self.assertEqual(list(stream_events(self.metrics, records, chunk_size=2)),
+                         list(stream_events(self.metrics, self.trades, chunk_size=2)))
+
+    def test_no_trades(self):
+        events = list(stream_events(self.metrics, pd.DataFrame([])))
+
+        self.assertEqual(len(events), 2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            list(stream_events(self.metrics, self.trades, 'xml'))
+        with self.assertRaises(ValueError):
+            list(trade_chunks(self.trades, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.back_testing import BackTest
+from src.main import MarketData
+from src.optimization import ParameterSweep
+from src.strategies import MovingAverageCross
+from src.walk_forward import WalkForward
+from tests.helpers import make_prices
+
+
+GRID = {
+    'lower_period': [5, 10, 20],
+    'upper_period': [30, 60],
+    'ma_type': ['SMA', 'EMA']
+}
+
+
+def make_market_data(periods=900, seed=9):
+    data = make_prices(periods, seed, start='2018-01-01', volatility=0.015)[['Close']]
+    return MarketData('SPY', 'max', raw_data=data)
+
+
+class TestWalkForward(unittest.TestCase):
+    def test_rolling_and_anchored_windows(self):
+        rolling = WalkForward(MovingAverageCross, GRID, in_sample=100, out_of_sample=40)
+        anchored = WalkForward(MovingAverageCross, GRID, in_sample=100, out_of_sample=40,
+                               anchored=True)
+
+        self.assertEqual(rolling.windows(200), [(0, 100, 140), (40, 140, 180), (80, 180, 200)])
+        self.assertEqual(anchored.windows(200), [(0, 100, 140), (0, 140, 180), (0, 180, 200)])
+        self.assertEqual(rolling.windows(100), [])
+
+    def test_windows_match_sweeps_on_full_series_signals(self):
+        market_data = make_market_data()
+        walk_forward = WalkForward(MovingAverageCross, GRID, in_sample=300, out_of_sample=150,
+                                   max_workers=1)
+
+        result = walk_forward.run(market_data)
+
+        close = market_data.get_raw_data()['Close']
+        backtest = BackTest()
+        for row, (start, split, end) in zip(result['windows'].itertuples(),
+                                            walk_forward.windows(len(close))):
+            # Best in-sample parameters, by the sweep's ranking on the same slice
+            scores = []
+            for params, strategy in ParameterSweep(MovingAverageCross, GRID).build_strategies():
+                signals = strategy.calculate_signals(market_data)
+                window = slice(start, split)
+                trades = backtest._generate_trades(
+                    {'buy': signals['buy'].iloc[window], 'sell': signals['sell'].iloc[window]},
+                    close.iloc[window])
+                scores.append((backtest._calculate_metrics(trades, None)['total_return'], params))
+            best_score = max(score for score, _ in scores)
+            best_params = next(params for score, params in scores if score == best_score)
+
+            self.assertEqual((row.lower_period, row.upper_period, row.ma_type),
+                             tuple(best_params.values()))
+            self.assertAlmostEqual(row.in_sample_total_return, best_score)
+            self.assertEqual(row.out_of_sample_start, close.index[split])
+
+        self.assertEqual(result['out_of_sample']['total_trades'],
+                         result['windows']['oos_total_trades'].sum())
+
+    def test_parallel_matches_serial(self):
+        serial = WalkForward(MovingAverageCross, GRID, in_sample=300, out_of_sample=150,
+                             max_workers=1).run(make_market_data())
+        parallel = WalkForward(MovingAverageCross, GRID, in_sample=300, out_of_sample=150,
+                               max_workers=2).run(make_market_data())
+
+        pd.testing.assert_frame_equal(serial['windows'], parallel['windows'])
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            WalkForward(MovingAverageCross, GRID, in_sample=0, out_of_sample=10)
+        with self.assertRaises(ValueError):
+            WalkForward(MovingAverageCross, GRID, in_sample=10, out_of_sample=10, sort_by='alpha')
+        with self.assertRaises(ValueError):
+            WalkForward(MovingAverageCross, GRID, in_sample=1000, out_of_sample=10).run(
+                make_market_data())
+
+
+if __name__ == '__main__':
+    unittest.main()